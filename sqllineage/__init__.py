@@ -73,5 +73,11 @@ STATIC_FOLDER = "build"
 DATA_FOLDER = os.environ.get(
     "SQLLINEAGE_DIRECTORY", os.path.join(os.path.dirname(__file__), "data")
 )
+# class names of the handlers to turn off, e.g. SwapPartitionHandler for SQL dialect other than Vertica
+DISABLED_HANDLERS = [
+    name.strip()
+    for name in os.environ.get("SQLLINEAGE_DISABLED_HANDLERS", "").split(",")
+    if name.strip()
+]
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 5000
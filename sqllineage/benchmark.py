@@ -0,0 +1,429 @@
+import argparse
+import inspect
+import json
+import logging
+import os
+import platform
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import sqlparse
+from sqlparse.engine import grouping
+from sqlparse.sql import Statement
+
+from sqllineage import NAME, VERSION, runner
+from sqllineage.cache import LineageCache
+from sqllineage.core import LineageAnalyzer
+from sqllineage.core.graph import CompactDiGraph
+from sqllineage.core.holders import SQLLineageHolder, StatementLineageHolder
+from sqllineage.core.models import Column, Table
+from sqllineage.runner import LineageRunner
+from sqllineage.utils import sqlparse as sqlparse_utils
+from sqllineage.utils.constant import EdgeType, LineageLevel
+from sqllineage.utils.sqlparse import parse_statements, split_statements
+
+logger = logging.getLogger(__name__)
+
+TPCDS_FOLDER = os.path.join(os.path.dirname(__file__), "data", "tpcds")
+SCALING_SIZES = [1000, 2000, 4000, 8000]
+
+# phases of LineageRunner._eval, as (phase name, owner of the callable, attribute name of the callable).
+# The same phase can be listed more than once when the callable is imported into different modules.
+PHASES: List[Tuple[str, Any, str]] = [
+    ("split_statements", sqlparse_utils, "split_statements"),
+    ("split_statements", runner, "split_statements"),
+    ("strip_comments", sqlparse_utils, "strip_comments"),
+    ("sqlparse grouping", grouping, "group"),
+    ("LineageAnalyzer.analyze", LineageAnalyzer, "analyze"),
+    ("SQLLineageHolder.add_statement", SQLLineageHolder, "add_statement"),
+    ("SQLLineageHolder finalize", SQLLineageHolder, "_finalize"),
+    ("get_column_lineage", SQLLineageHolder, "get_column_lineage"),
+]
+
+
+class PhaseTimer:
+    """
+    Accumulate exclusive time spent in each phase. Phases can be nested, e.g. LineageAnalyzer.analyze may parse
+    scalar subquery, in which case time spent in inner phase is not counted for the outer one. For generator function
+    like split_statements, time spent in producing each item is counted.
+    """
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {name: 0.0 for name, _, _ in PHASES}
+        self._stack: List[List[float]] = []
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                iterator = iter(func(*args, **kwargs))
+                while True:
+                    try:
+                        item = self._timed(name, next, iterator)
+                    except StopIteration:
+                        return
+                    yield item
+
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self._timed(name, func, *args, **kwargs)
+
+        return wrapper
+
+    def _timed(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        # each frame records [start time, time spent in nested phases]
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self.timings[name] += elapsed - frame[1]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    @contextmanager
+    def instrument(self) -> Iterator["PhaseTimer"]:
+        """
+        temporarily patch each phase callable with a timing wrapper.
+        """
+        originals = []
+        for name, owner, attr in PHASES:
+            raw = inspect.getattr_static(owner, attr)
+            originals.append((owner, attr, raw, attr in vars(owner)))
+            if isinstance(raw, staticmethod):
+                patched: Any = staticmethod(self.wrap(name, raw.__func__))
+            else:
+                patched = self.wrap(name, raw)
+            setattr(owner, attr, patched)
+        try:
+            yield self
+        finally:
+            for owner, attr, raw, own in reversed(originals):
+                if own:
+                    setattr(owner, attr, raw)
+                else:
+                    # inherited attribute, remove the patched one to expose the parent class's again
+                    delattr(owner, attr)
+
+
+def load_corpus(directory: str = TPCDS_FOLDER) -> List[Tuple[str, str]]:
+    """
+    load every .sql file under directory, sorted by file name.
+
+    :param directory: the directory holding SQL files, default to the TPC-DS queries shipped with sqllineage
+    :return: a list of (file name, file content) tuple
+    """
+    corpus = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".sql"):
+            with open(os.path.join(directory, filename)) as f:
+                corpus.append((filename, f.read()))
+    return corpus
+
+
+def count_statements(sql: str) -> int:
+    return sum(
+        1 for stmt in split_statements(sql.strip()) if stmt.token_first(skip_cm=True)
+    )
+
+
+def run_once(
+    corpus: List[Tuple[str, str]],
+    level: str = LineageLevel.COLUMN,
+    cache: Optional[LineageCache] = None,
+) -> Dict[str, Any]:
+    """
+    run LineageRunner over the whole corpus once, and collect wall time, throughput and per-phase timing.
+    """
+    timer = PhaseTimer()
+    statements = sum(count_statements(sql) for _, sql in corpus)
+    skipped = 0
+    with timer.instrument():
+        start = time.perf_counter()
+        for _, sql in corpus:
+            lr = LineageRunner(sql, cache=cache)
+            if level == LineageLevel.COLUMN:
+                lr.get_column_lineage()
+            else:
+                str(lr)
+            skipped += lr.skipped_statements
+        wall_time = time.perf_counter() - start
+    phases = dict(timer.timings)
+    phases["other"] = max(wall_time - sum(timer.timings.values()), 0.0)
+    return {
+        "wall_time": wall_time,
+        "files": len(corpus),
+        "statements": statements,
+        "skipped_statements": skipped,
+        "files_per_second": len(corpus) / wall_time if wall_time else 0.0,
+        "statements_per_second": statements / wall_time if wall_time else 0.0,
+        "phases": phases,
+    }
+
+
+def run_benchmark(
+    directory: str = TPCDS_FOLDER,
+    rounds: int = 3,
+    level: str = LineageLevel.COLUMN,
+    cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    The first run over the corpus is reported as cold run. The following runs in the same process are warm runs,
+    reported as the average of all rounds.
+
+    :param directory: the directory holding SQL files
+    :param rounds: the number of warm runs
+    :param level: lineage level, column level lineage includes get_column_lineage phase
+    :param cache: use a statement level cache shared by all runs, so that warm runs are served from cache
+    """
+    corpus = load_corpus(directory)
+    lineage_cache = LineageCache(maxsize=None) if cache else None
+    cold = run_once(corpus, level, lineage_cache)
+    warm_runs = [run_once(corpus, level, lineage_cache) for _ in range(rounds)]
+    result: Dict[str, Any] = {
+        "name": NAME,
+        "version": VERSION,
+        "sqlparse_version": sqlparse.__version__,
+        "python_version": platform.python_version(),
+        "corpus": os.path.abspath(directory),
+        "level": level,
+        "cache": cache,
+        "cold": cold,
+    }
+    if warm_runs:
+        warm = {
+            k: sum(run[k] for run in warm_runs) / len(warm_runs)
+            for k in ("wall_time", "files_per_second", "statements_per_second")
+        }
+        warm["rounds"] = len(warm_runs)
+        warm["phases"] = {
+            phase: sum(run["phases"][phase] for run in warm_runs) / len(warm_runs)
+            for phase in cold["phases"]
+        }
+        result["warm"] = warm
+    return result
+
+
+def synthesize_statements(n: int) -> List[StatementLineageHolder]:
+    """
+    build lineage result for a chain of n statements like INSERT INTO tab{i+1} SELECT col1, col2 FROM tab{i}, without
+    going through parsing and analysis.
+    """
+    holders = []
+    for i in range(n):
+        holder = StatementLineageHolder()
+        src_table, tgt_table = Table(f"tab{i}"), Table(f"tab{i + 1}")
+        holder.add_read(src_table)
+        holder.add_write(tgt_table)
+        for name in ("col1", "col2"):
+            src_col, tgt_col = Column(name), Column(name)
+            src_col.parent = src_table
+            tgt_col.parent = tgt_table
+            holder.add_column_lineage(src_col, tgt_col)
+        holders.append(holder)
+    return holders
+
+
+def synthesize_renames(n: int) -> List[StatementLineageHolder]:
+    """
+    build lineage result for a chain of n statements from :func:`synthesize_statements`, followed by n statements
+    like ALTER TABLE tab{i+1} RENAME TO tab{i+1}_old renaming each target table.
+    """
+    holders = synthesize_statements(n)
+    for i in range(n):
+        holder = StatementLineageHolder()
+        holder.add_rename(Table(f"tab{i + 1}"), Table(f"tab{i + 1}_old"))
+        holders.append(holder)
+    return holders
+
+
+def synthesize_wide_select(n: int) -> Statement:
+    """
+    parse a statement like INSERT INTO tab2 SELECT col0, col1, ..., col{n-1} FROM tab1 selecting n columns
+    """
+    columns = ", ".join(f"col{i}" for i in range(n))
+    return next(parse_statements(f"INSERT INTO tab2 SELECT {columns} FROM tab1"))
+
+
+def _time_combine(holders: List[StatementLineageHolder]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    SQLLineageHolder.of(*holders).graph
+    wall_time = time.perf_counter() - start
+    return {
+        "statements": len(holders),
+        "wall_time": wall_time,
+        "microseconds_per_statement": wall_time / len(holders) * 1e6
+        if holders
+        else 0.0,
+    }
+
+
+def _time_analyze(statement: Statement, columns: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    LineageAnalyzer().analyze(statement)
+    wall_time = time.perf_counter() - start
+    return {
+        "columns": columns,
+        "wall_time": wall_time,
+        "microseconds_per_column": wall_time / columns * 1e6 if columns else 0.0,
+    }
+
+
+def _time_add_edges(edges: int) -> Dict[str, Any]:
+    graph, table = CompactDiGraph(), Table("tab1")
+    start = time.perf_counter()
+    for i in range(edges):
+        graph.add_edge(table, f"col{i}", type=EdgeType.HAS_COLUMN)
+    wall_time = time.perf_counter() - start
+    return {
+        "edges": edges,
+        "wall_time": wall_time,
+        "microseconds_per_edge": wall_time / edges * 1e6 if edges else 0.0,
+    }
+
+
+def run_scaling(sizes: List[int]) -> Dict[str, Any]:
+    """
+    measure time to combine statement level lineage result into SQLLineageHolder, with growing statement count, for
+    both INSERT and RENAME statements, time to analyze a statement with growing column count, and time to add edges
+    to one node of CompactDiGraph with growing degree. Time per statement, column or edge should stay flat as the
+    count grows.
+
+    :param sizes: a list of statement count, also used as column count and edge count
+    """
+    return {
+        "name": NAME,
+        "version": VERSION,
+        "python_version": platform.python_version(),
+        "scaling": [_time_combine(synthesize_statements(n)) for n in sizes],
+        "rename_scaling": [_time_combine(synthesize_renames(n // 2)) for n in sizes],
+        "column_scaling": [_time_analyze(synthesize_wide_select(n), n) for n in sizes],
+        "degree_scaling": [_time_add_edges(n) for n in sizes],
+    }
+
+
+def format_scaling_report(result: Dict[str, Any]) -> str:
+    """
+    render the scaling benchmark result in human-readable table
+    """
+    lines = [
+        f"{result['name']} {result['version']} (Python {result['python_version']})"
+    ]
+    for title, key, unit in [
+        ("Combining statements into SQLLineageHolder:", "scaling", "statement"),
+        (
+            "Combining statements with half of them renaming tables:",
+            "rename_scaling",
+            "statement",
+        ),
+        ("Analyzing a statement selecting many columns:", "column_scaling", "column"),
+        ("Adding edges to one node of compact graph:", "degree_scaling", "edge"),
+    ]:
+        lines.append(title)
+        lines.append(f"    {unit + 's':>12}{'wall time':>14}{'per ' + unit:>16}")
+        for run in result[key]:
+            lines.append(
+                f"    {run[unit + 's']:>12}{run['wall_time']:>13.3f}s"
+                f"{run['microseconds_per_' + unit]:>14.1f}us"
+            )
+    return "\n".join(lines)
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """
+    render the benchmark result in human-readable table
+    """
+    lines = [
+        f"{result['name']} {result['version']} (sqlparse {result['sqlparse_version']}, "
+        f"Python {result['python_version']})",
+        f"Corpus: {result['corpus']} ({result['cold']['files']} files, "
+        f"{result['cold']['statements']} statements, "
+        f"{result['cold']['skipped_statements']} skipped before parsing)"
+        + (", with statement cache" if result["cache"] else ""),
+    ]
+    for run in ("cold", "warm"):
+        if run not in result:
+            continue
+        summary = result[run]
+        title = run.capitalize() + (
+            f" (average of {summary['rounds']} rounds)" if run == "warm" else ""
+        )
+        lines.append(f"{title}:")
+        lines.append(f"    wall time: {summary['wall_time']:.3f}s")
+        lines.append(
+            f"    throughput: {summary['files_per_second']:.2f} files/s, "
+            f"{summary['statements_per_second']:.2f} statements/s"
+        )
+        for phase, seconds in summary["phases"].items():
+            ratio = seconds / summary["wall_time"] * 100 if summary["wall_time"] else 0
+            lines.append(f"    {phase:<32}{seconds:>9.3f}s {ratio:>6.1f}%")
+    return "\n".join(lines)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-d",
+        "--directory",
+        help="directory of SQL files to benchmark against, default to the built-in TPC-DS queries",
+        default=TPCDS_FOLDER,
+        metavar="<directory>",
+    )
+    parser.add_argument(
+        "-r",
+        "--rounds",
+        help="number of warm runs after the cold run, default 3",
+        type=int,
+        default=3,
+        metavar="<rounds>",
+    )
+    parser.add_argument(
+        "-l",
+        "--level",
+        help="lineage level, column or table, default at column level",
+        choices=[LineageLevel.TABLE, LineageLevel.COLUMN],
+        default=LineageLevel.COLUMN,
+    )
+    parser.add_argument(
+        "--cache",
+        help="enable statement level lineage cache shared by all runs",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-s",
+        "--scaling",
+        help="instead of the corpus, measure how combining lineage result scales with statement count, "
+        f"using synthetic statements. Default statement counts: {' '.join(str(n) for n in SCALING_SIZES)}",
+        type=int,
+        nargs="*",
+        metavar="<statements>",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="write benchmark result in JSON format to this file",
+        metavar="<filename>",
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    The benchmark entry point for `sqllineage bench` command.
+
+    :param args: the parsed command line arguments
+    """
+    if args.scaling is not None:
+        result = run_scaling(args.scaling or SCALING_SIZES)
+        print(format_scaling_report(result))
+    else:
+        result = run_benchmark(args.directory, args.rounds, args.level, args.cache)
+        print(format_report(result))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,354 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple, cast
+
+import sqlparse
+from sqlparse import tokens as T
+from sqlparse.sql import Statement
+
+from sqllineage import DISABLED_HANDLERS, VERSION
+from sqllineage.core.holders import StatementLineageHolder
+from sqllineage.io import WIRE_FORMAT_VERSION, dumps, loads
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_DISK_CACHE_SIZE = 1024 * 1024 * 1024
+DISK_CACHE_FILENAME = "lineage.db"
+# seconds within which access time of a disk cache entry is not updated again
+ACCESS_TIME_RESOLUTION = 3600
+# the number of entries added to disk cache between checks on total size
+EVICTION_INTERVAL = 256
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+def _is_negligible(token) -> bool:
+    return token.is_whitespace or token.ttype in T.Comment
+
+
+def normalize_statement(stmt: Statement) -> str:
+    """
+    normalize a statement, split by lexer but not grouped yet, into cache key text by removing leading and trailing
+    whitespaces and comments. Comments within the statement are kept so that the same key always means the same
+    lineage result.
+    """
+    tokens = stmt.tokens
+    start, end = 0, len(tokens)
+    while start < end and _is_negligible(tokens[start]):
+        start += 1
+    while end > start and _is_negligible(tokens[end - 1]):
+        end -= 1
+    return "".join(token.value for token in tokens[start:end])
+
+
+class LineageCache:
+    def __init__(self, maxsize: Optional[int] = DEFAULT_CACHE_SIZE):
+        """
+        A thread-safe LRU cache of :class:`sqllineage.core.holders.StatementLineageHolder`, keyed on normalized
+        statement text and sqllineage version.
+
+        Cached holders are shared across :class:`sqllineage.runner.LineageRunner`, they should be treated as read-only.
+
+        :param maxsize: the maximum number of statements to cache, least recently used ones are evicted beyond that.
+            None means the cache can grow without bound.
+        """
+        self._data: "OrderedDict[Tuple[str, str], StatementLineageHolder]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, sql: str) -> bool:
+        return self.key(sql) in self._data
+
+    @staticmethod
+    def key(sql: str) -> Tuple[str, str]:
+        return VERSION, sql
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: Optional[int]) -> None:
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, sql: str) -> Optional[StatementLineageHolder]:
+        """
+        get the cached holder for normalized statement text, None if not cached.
+        """
+        key = self.key(sql)
+        with self._lock:
+            holder = self._data.get(key)
+            if holder is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return holder
+
+    def put(self, sql: str, holder: StatementLineageHolder) -> None:
+        """
+        cache the holder for normalized statement text.
+        """
+        key = self.key(sql)
+        with self._lock:
+            self._data[key] = holder
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_script(self, sql: str) -> Optional[List[StatementLineageHolder]]:
+        """
+        get the cached holders for all the statements in a SQL script, None if not cached. Script level lookup saves
+        splitting the script into statements, it's only supported by :class:`DiskLineageCache`.
+        """
+        return None
+
+    def put_script(self, sql: str, statements: List[str]) -> None:
+        """
+        remember the statements, in normalized text, that a SQL script is made up of. The holders for them are
+        expected to be cached with :meth:`put`.
+        """
+        pass
+
+    def clear(self) -> None:
+        """
+        remove all the cached holders and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self._maxsize, len(self._data)
+        )
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+
+class DiskLineageCache(LineageCache):
+    def __init__(self, path: str, maxsize: Optional[int] = DEFAULT_DISK_CACHE_SIZE):
+        """
+        A persistent cache of :class:`sqllineage.core.holders.StatementLineageHolder` backed by SQLite, so that
+        lineage result survives across runs, e.g. CI runs over a SQL repository where only a few files change.
+
+        Entries are keyed on a SHA-256 digest of normalized statement text, together with sqllineage, sqlparse and
+        wire format versions and the disabled handlers, so that upgrading any of them never returns stale result.
+        Holders are stored in compact wire format, see :func:`sqllineage.io.dumps`. The same database file can be
+        shared by multiple threads and processes.
+
+        :param path: the SQLite database file, or a directory in which lineage.db is used
+        :param maxsize: the maximum size in bytes of cached data, least recently used entries are evicted beyond
+            that. None means the cache can grow without bound.
+        """
+        super().__init__(maxsize)
+        if os.path.isdir(path):
+            path = os.path.join(path, DISK_CACHE_FILENAME)
+        self.path = path
+        self._namespace = "\0".join(
+            [
+                VERSION,
+                sqlparse.__version__,
+                str(WIRE_FORMAT_VERSION),
+                ",".join(sorted(DISABLED_HANDLERS)),
+            ]
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._puts = 0
+        with self._lock:
+            self._connect()
+
+    def __getstate__(self) -> Tuple[str, Optional[int]]:
+        # connection and lock can't be pickled, each process opens the database file on its own
+        return self.path, self._maxsize
+
+    def __setstate__(self, state: Tuple[str, Optional[int]]) -> None:
+        self.__init__(*state)  # type: ignore
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = (
+                self._connect().execute("SELECT COUNT(*) FROM lineage").fetchone()
+            )
+            return int(count)
+
+    def __contains__(self, sql: str) -> bool:
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT 1 FROM lineage WHERE key = ?", (self._digest(sql),))
+                .fetchone()
+                is not None
+            )
+
+    def get(self, sql: str) -> Optional[StatementLineageHolder]:
+        with self._lock:
+            holder = self._get(self._digest(sql))
+            if holder is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return holder
+
+    def put(self, sql: str, holder: StatementLineageHolder) -> None:
+        self._put(self._digest(sql), zlib.compress(dumps(holder), 1))
+
+    def get_script(self, sql: str) -> Optional[List[StatementLineageHolder]]:
+        with self._lock:
+            value = self._select(self._digest(sql, script=True))
+            if value is None:
+                return None
+            holders = []
+            for i in range(0, len(value), _DIGEST_SIZE):
+                holder = self._get(value[i:][:_DIGEST_SIZE])
+                if holder is None:
+                    # some statement is evicted
+                    return None
+                holders.append(holder)
+            self.hits += len(holders)
+            return holders
+
+    def put_script(self, sql: str, statements: List[str]) -> None:
+        self._put(
+            self._digest(sql, script=True),
+            b"".join(self._digest(stmt) for stmt in statements),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM lineage")
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self._maxsize, len(self)
+        )
+
+    def close(self) -> None:
+        """
+        evict entries beyond size limit and close the database connection.
+        """
+        with self._lock:
+            if self._conn is not None:
+                if self._puts > 0:
+                    self._evict()
+                self._conn.close()
+                self._conn = None
+
+    def _digest(self, sql: str, script: bool = False) -> bytes:
+        kind = "script" if script else "statement"
+        return hashlib.sha256(
+            "\0".join([self._namespace, kind, sql]).encode("utf-8")
+        ).digest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            # connection inherited from parent process is not safe to use in forked child process
+            self._pid = os.getpid()
+            self._conn = sqlite3.connect(
+                self.path, timeout=60, isolation_level=None, check_same_thread=False
+            )
+            # write-ahead log allows readers and writer from different processes to work concurrently
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lineage (key BLOB PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS lineage_accessed ON lineage (accessed)"
+            )
+        return self._conn
+
+    def _select(self, key: bytes) -> Optional[bytes]:
+        row = (
+            self._connect()
+            .execute("SELECT value, accessed FROM lineage WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        value, accessed = row
+        now = time.time()
+        if now - accessed > ACCESS_TIME_RESOLUTION:
+            # access time is only updated once in a while, so that reading from a warm cache hardly writes
+            self._connect().execute(
+                "UPDATE lineage SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return cast(bytes, value)
+
+    def _get(self, key: bytes) -> Optional[StatementLineageHolder]:
+        value = self._select(key)
+        if value is None:
+            return None
+        return cast(StatementLineageHolder, loads(zlib.decompress(value)))
+
+    def _put(self, key: bytes, value: bytes) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO lineage (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, len(key) + len(value), time.time()),
+            )
+            self._puts += 1
+            if self._puts % EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+        conn = self._connect()
+        with conn:
+            # in a transaction, so that concurrent writers don't evict the same entries twice
+            conn.execute("BEGIN IMMEDIATE")
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM lineage"
+            ).fetchone()
+            if total <= self._maxsize:
+                return
+            keys = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM lineage ORDER BY accessed"
+            ):
+                if total <= self._maxsize:
+                    break
+                keys.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM lineage WHERE key = ?", keys)
+            self.evictions += len(keys)
+
+
+_default_cache = LineageCache()
+
+
+def get_default_cache() -> LineageCache:
+    """
+    the process-wide cache shared by all the runners created with cache=True
+    """
+    return _default_cache
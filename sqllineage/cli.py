@@ -1,16 +1,24 @@
 import argparse
 import logging
 import logging.config
+import os
+import sys
+import time
+from typing import List
 
-
-from sqllineage import DEFAULT_HOST, DEFAULT_LOGGING, DEFAULT_PORT
+from sqllineage import DEFAULT_HOST, DEFAULT_LOGGING, DEFAULT_PORT, benchmark
+from sqllineage.cache import DiskLineageCache
+from sqllineage.core.budget import StatementBudget
 from sqllineage.drawing import draw_lineage_graph
 from sqllineage.runner import LineageRunner
-from sqllineage.utils.constant import LineageLevel
-from sqllineage.utils.helpers import extract_sql_from_args
+from sqllineage.utils.constant import LineageEngine, LineageLevel
+from sqllineage.utils.helpers import expand_file_paths, extract_sql_from_args
 
 logger = logging.getLogger(__name__)
 
+# seconds between two checks on files for changes in watch mode
+WATCH_INTERVAL = 1.0
+
 
 def main(args=None) -> None:
     """
@@ -26,7 +34,32 @@ def main(args=None) -> None:
     parser.add_argument(
         "-e", metavar="<quoted-query-string>", help="SQL from command line"
     )
-    parser.add_argument("-f", metavar="<filename>", help="SQL from files")
+    parser.add_argument(
+        "-f",
+        metavar="<filename>",
+        nargs="+",
+        help="SQL from files, glob patterns or directories (all the .sql files inside), - to read from stdin",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of worker processes to analyze multiple files, or statements of one file, in parallel, default 1",
+        type=int,
+        default=1,
+        metavar="<jobs>",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="directory to persist statement level lineage result of SQL from -e or -f, so that unchanged statements "
+        "are not analyzed again in later runs",
+        metavar="<directory>",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        help="keep watching the files for changes, re-analyze only the changed files and print lineage again",
+        action="store_true",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -40,6 +73,34 @@ def main(args=None) -> None:
         choices=[LineageLevel.TABLE, LineageLevel.COLUMN],
         default=LineageLevel.TABLE,
     )
+    parser.add_argument(
+        "--engine",
+        help="lineage engine, fast engine skips parsing whenever possible and supports table level lineage only, "
+        "default to default engine",
+        choices=[LineageEngine.DEFAULT, LineageEngine.FAST],
+        default=LineageEngine.DEFAULT,
+    )
+    parser.add_argument(
+        "--timeout",
+        help="seconds allowed for analyzing each statement, beyond which only table lineage is analyzed for it, or "
+        "it's skipped. It's checked only after parsing, use --max-tokens or --max-depth to bound parsing time",
+        type=float,
+        metavar="<seconds>",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        help="maximum number of tokens in each statement, checked before parsing, beyond which only table lineage is "
+        "analyzed for it, or it's skipped",
+        type=int,
+        metavar="<count>",
+    )
+    parser.add_argument(
+        "--max-depth",
+        help="maximum nesting depth of parenthesis in each statement, checked before parsing, beyond which only "
+        "table lineage is analyzed for it, or it's skipped",
+        type=int,
+        metavar="<depth>",
+    )
     parser.add_argument(
         "-g",
         "--graph-visualization",
@@ -62,33 +123,120 @@ def main(args=None) -> None:
         default=DEFAULT_PORT,
         metavar="<port_number>{0..65536}",
     )
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="benchmark lineage analysis against a corpus of SQL files",
+        description="Benchmark lineage analysis with per-phase timing breakdown.",
+    )
+    benchmark.add_arguments(bench_parser)
     args = parser.parse_args(args)
+    if args.command == "bench":
+        return benchmark.main(args)
     if args.e and args.f:
         logging.warning(
             "Both -e and -f options are specified. -e option will be ignored"
         )
+    if args.watch and (not args.f or args.f == ["-"] or args.graph_visualization):
+        logger.error("Watch mode only works with files from -f option")
+        sys.exit(1)
+    if args.engine == LineageEngine.FAST and (
+        args.level == LineageLevel.COLUMN or args.cache_dir
+    ):
+        logger.error("Fast engine works with neither column lineage nor cache")
+        sys.exit(1)
     if args.f or args.e:
-        sql = extract_sql_from_args(args)
-        runner = LineageRunner(
-            sql,
-            verbose=args.verbose,
-            draw_options={
-                "host": args.host,
-                "port": args.port,
-                "f": args.f if args.f else None,
-            },
+        draw_options = {"host": args.host, "port": args.port}
+        cache = None
+        budget = (
+            StatementBudget(args.timeout, args.max_tokens, args.max_depth)
+            if args.timeout or args.max_tokens or args.max_depth
+            else None
         )
-        if args.graph_visualization:
-            runner.draw()
-        elif args.level == LineageLevel.COLUMN:
-            runner.print_column_lineage()
+        if args.cache_dir:
+            os.makedirs(args.cache_dir, exist_ok=True)
+            cache = DiskLineageCache(args.cache_dir)
+        if args.f == ["-"]:
+            if args.graph_visualization:
+                # visualization shows the whole script in browser, so stdin is read at once
+                runner = LineageRunner(
+                    sys.stdin.read(),
+                    verbose=args.verbose,
+                    draw_options=draw_options,
+                    cache=cache,
+                    engine=args.engine,
+                    budget=budget,
+                )
+            else:
+                runner = LineageRunner.from_stream(
+                    sys.stdin,
+                    verbose=args.verbose,
+                    cache=cache,
+                    engine=args.engine,
+                    budget=budget,
+                )
         else:
-            runner.print_table_lineage()
+            files = expand_file_paths(args.f) if args.f else []
+            if len(files) > 1 or args.watch:
+                runner = LineageRunner.from_files(
+                    files,
+                    jobs=args.jobs,
+                    verbose=args.verbose,
+                    draw_options=draw_options,
+                    cache=cache,
+                    engine=args.engine,
+                    budget=budget,
+                )
+            else:
+                args.f = files[0] if files else None
+                draw_options["f"] = args.f
+                runner = LineageRunner(
+                    extract_sql_from_args(args),
+                    verbose=args.verbose,
+                    draw_options=draw_options,
+                    cache=cache,
+                    workers=args.jobs,
+                    engine=args.engine,
+                    budget=budget,
+                )
+        try:
+            if args.graph_visualization:
+                runner.draw()
+            else:
+                _print_lineage(runner, args.level)
+                if args.watch:
+                    _watch(runner, args.f, args.level)
+        finally:
+            if cache is not None:
+                cache.close()
     elif args.graph_visualization:
         return draw_lineage_graph(**{"host": args.host, "port": args.port})
     else:
         parser.print_help()
 
 
+def _print_lineage(runner: LineageRunner, level: str) -> None:
+    if level == LineageLevel.COLUMN:
+        runner.print_column_lineage()
+    else:
+        runner.print_table_lineage()
+
+
+def _watch(runner: LineageRunner, patterns: List[str], level: str) -> None:
+    """
+    poll the files for changes until interrupted. Glob patterns and directories are expanded again each time to pick
+    up files added or removed, and it keeps going when files are missing or fail to analyze in between edits.
+    """
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            changed = runner.refresh(expand_file_paths(patterns, strict=False))
+            if changed:
+                print("Changed files: " + ", ".join(changed))
+                _print_lineage(runner, level)
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
     main()
@@ -1,24 +1,26 @@
+import time
 from functools import reduce
 from operator import add
-from typing import List, NamedTuple, Optional, Set, Union
+from typing import Iterable, List, NamedTuple, Optional, Set, Union
 
 from sqlparse.sql import (
     Function,
     Identifier,
     IdentifierList,
+    Parenthesis,
     Statement,
     TokenList,
     Where,
 )
 
-from sqllineage.core.handlers.base import (
-    CurrentTokenBaseHandler,
-    NextTokenBaseHandler,
-)
+from sqllineage import DISABLED_HANDLERS
+from sqllineage.core.handlers.base import get_handler_dispatcher
 from sqllineage.core.holders import StatementLineageHolder, SubQueryLineageHolder
-from sqllineage.core.models import SubQuery, Table
+from sqllineage.core.models import Column, SubQuery, Table
+from sqllineage.exceptions import BudgetExceeded
 from sqllineage.utils.sqlparse import (
     get_subquery_parentheses,
+    is_lineage_free,
     is_subquery,
     is_token_negligible,
 )
@@ -32,20 +34,30 @@ class AnalyzerContext(NamedTuple):
 class LineageAnalyzer:
     """SQL Statement Level Lineage Analyzer."""
 
-    def analyze(self, stmt: Statement) -> StatementLineageHolder:
+    def __init__(self, disabled_handlers: Optional[Iterable[str]] = None):
+        """
+        :param disabled_handlers: class names of the handlers to turn off, e.g. SwapPartitionHandler for SQL dialect
+            other than Vertica. Default to comma separated names in environment variable SQLLINEAGE_DISABLED_HANDLERS
+        """
+        self._dispatcher = get_handler_dispatcher(
+            frozenset(
+                DISABLED_HANDLERS if disabled_handlers is None else disabled_handlers
+            )
+        )
+        self._deadline: Optional[float] = None
+
+    def analyze(
+        self, stmt: Statement, deadline: Optional[float] = None
+    ) -> StatementLineageHolder:
         """
         to analyze the Statement and store the result into :class:`sqllineage.holders.StatementLineageHolder`.
 
         :param stmt: a SQL statement parsed by `sqlparse`
+        :param deadline: the time, by time.monotonic(), analysis should be done by. BudgetExceeded is raised once
+            it's passed, see :class:`sqllineage.core.budget.StatementBudget`
         """
-        if (
-            stmt.get_type() == "DELETE"
-            or stmt.token_first(skip_cm=True).normalized == "TRUNCATE"
-            or stmt.token_first(skip_cm=True).normalized.upper() == "REFRESH"
-            or stmt.token_first(skip_cm=True).normalized == "CACHE"
-            or stmt.token_first(skip_cm=True).normalized.upper() == "UNCACHE"
-            or stmt.token_first(skip_cm=True).normalized == "SHOW"
-        ):
+        self._deadline = deadline
+        if stmt.get_type() == "DELETE" or is_lineage_free(stmt):
             holder = StatementLineageHolder()
         elif stmt.get_type() == "DROP":
             holder = self._extract_from_ddl_drop(stmt)
@@ -56,8 +68,39 @@ class LineageAnalyzer:
             holder = StatementLineageHolder.of(
                 self._extract_from_dml(stmt, AnalyzerContext())
             )
+            self._release_parse_tree(holder)
         return holder
 
+    def analyze_subquery(
+        self, token: Parenthesis, deadline: Optional[float] = None
+    ) -> StatementLineageHolder:
+        """
+        to analyze a subquery already grouped as part of a statement, e.g. a scalar subquery in CASE clause, in place
+        instead of serializing and parsing it again.
+
+        :param token: the parenthesis of the subquery
+        :param deadline: the time, by time.monotonic(), analysis should be done by, usually that of the statement
+            the subquery belongs to
+        """
+        self._deadline = deadline
+        return StatementLineageHolder.of(
+            self._extract_from_dml(token, AnalyzerContext(SubQuery.of(token, None)))
+        )
+
+    @staticmethod
+    def _release_parse_tree(holder: StatementLineageHolder) -> None:
+        """
+        SubQuery keeps its parenthesis token for analysis, which in turn keeps the whole parse tree of the statement
+        alive. Drop the reference once analysis is done so that the parse tree can be garbage collected.
+        """
+        for node in holder.graph.nodes:
+            if isinstance(node, SubQuery):
+                node.token = None
+            elif isinstance(node, Column):
+                for parent in node.parent_candidates:
+                    if isinstance(parent, SubQuery):
+                        parent.token = None
+
     @classmethod
     def _extract_from_ddl_drop(cls, stmt: Statement) -> StatementLineageHolder:
         holder = StatementLineageHolder()
@@ -77,10 +120,21 @@ class LineageAnalyzer:
             holder.add_read(tables[1])
         return holder
 
-    @classmethod
     def _extract_from_dml(
-        cls, token: TokenList, context: AnalyzerContext
+        self, token: TokenList, context: AnalyzerContext
     ) -> SubQueryLineageHolder:
+        holder = SubQueryLineageHolder()
+        self._extract_from_query(token, context, holder)
+        return holder
+
+    def _extract_from_query(
+        self, token: TokenList, context: AnalyzerContext, sink: SubQueryLineageHolder
+    ) -> Set[SubQuery]:
+        """
+        extract lineage of the query, and then its subqueries recursively, all written into sink holder in place.
+
+        :return: CTEs visible to the query, together with those defined in its subqueries
+        """
         holder = SubQueryLineageHolder()
         if context.prev_cte is not None:
             # CTE can be referenced by subsequent CTEs
@@ -89,29 +143,29 @@ class LineageAnalyzer:
         if context.subquery is not None:
             # If within subquery, then manually add subquery as target table
             holder.add_write(context.subquery)
-        current_handlers = [
-            handler_cls() for handler_cls in CurrentTokenBaseHandler.__subclasses__()
-        ]
-        next_handlers = [
-            handler_cls() for handler_cls in NextTokenBaseHandler.__subclasses__()
-        ]
+        dispatcher = self._dispatcher
+        deadline = self._deadline
+        current_handlers, next_handlers = dispatcher.create_handlers(deadline)
 
         subqueries = []
         for sub_token in token.tokens:
             if is_token_negligible(sub_token):
                 continue
 
-            for sq in cls.parse_subquery(sub_token):
+            if deadline is not None and time.monotonic() > deadline:
+                raise BudgetExceeded("Analysis timed out")
+
+            for sq in self.parse_subquery(sub_token):
                 # Collecting subquery on the way, hold on parsing until last
                 # so that each handler don't have to worry about what's inside subquery
                 subqueries.append(sq)
 
-            for current_handler in current_handlers:
-                current_handler.handle(sub_token, holder)
+            for i in dispatcher.route_current(sub_token):
+                current_handlers[i].handle(sub_token, holder)
 
             if sub_token.is_keyword:
-                for next_handler in next_handlers:
-                    next_handler.indicate(sub_token)
+                for i in dispatcher.route_keyword(sub_token):
+                    next_handlers[i].indicate(sub_token)
                 continue
 
             for next_handler in next_handlers:
@@ -121,10 +175,13 @@ class LineageAnalyzer:
             # call end of query hook here as loop is over
             for next_handler in next_handlers:
                 next_handler.end_of_query_cleanup(holder)
+        # Merge into the statement level holder before going into subqueries, in place without copying the graph
+        sink |= holder
         # By recursively extracting each subquery of the parent and merge, we're doing Depth-first search
+        ctes = holder.cte
         for sq in subqueries:
-            holder |= cls._extract_from_dml(sq.token, AnalyzerContext(sq, holder.cte))
-        return holder
+            ctes |= self._extract_from_query(sq.token, AnalyzerContext(sq, ctes), sink)
+        return ctes
 
     @classmethod
     def parse_subquery(cls, token: TokenList) -> List[SubQuery]:
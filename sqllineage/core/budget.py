@@ -0,0 +1,60 @@
+import time
+from typing import NamedTuple, Optional
+
+from sqlparse import tokens as T
+from sqlparse.sql import Statement
+
+
+class DegradedStatement(NamedTuple):
+    position: int
+    reason: str
+    skipped: bool
+
+
+class StatementBudget(NamedTuple):
+    """
+    Per-statement budget of lineage analysis, so that a few pathological statements, e.g. with an IN list of tens of
+    thousands of elements or deeply nested generated subqueries, don't hold up the whole job. A statement beyond budget
+    is degraded to table level lineage only, or skipped when even that is not possible.
+
+    :param timeout: seconds allowed for grouping and analyzing a statement. Grouping by sqlparse can't be interrupted,
+        so that it's checked once grouping is done and then for each token during analysis. It doesn't bound grouping,
+        where pathological statements spend most of their time, use it together with max_tokens and max_depth.
+    :param max_tokens: the maximum number of tokens split by lexer, whitespaces and comments excluded
+    :param max_depth: the maximum nesting depth of parenthesis, for subqueries as well as function calls
+    """
+
+    timeout: Optional[float] = None
+    max_tokens: Optional[int] = None
+    max_depth: Optional[int] = None
+
+    def deadline(self) -> Optional[float]:
+        """
+        the time, by time.monotonic(), analysis of a statement starting now should be done by.
+        """
+        return None if self.timeout is None else time.monotonic() + self.timeout
+
+    def check(self, stmt: Statement) -> Optional[str]:
+        """
+        check the size of a statement split by lexer before it's grouped.
+
+        :return: the reason why the statement is beyond budget, None if it's within
+        """
+        if self.max_tokens is None and self.max_depth is None:
+            return None
+        count = depth = max_depth = 0
+        for token in stmt.tokens:
+            if token.is_whitespace or token.ttype in T.Comment:
+                continue
+            count += 1
+            if token.ttype is T.Punctuation:
+                if token.value == "(":
+                    depth += 1
+                    max_depth = max(max_depth, depth)
+                elif token.value == ")":
+                    depth -= 1
+        if self.max_tokens is not None and count > self.max_tokens:
+            return f"{count} tokens exceeding max_tokens {self.max_tokens}"
+        if self.max_depth is not None and max_depth > self.max_depth:
+            return f"nesting depth {max_depth} exceeding max_depth {self.max_depth}"
+        return None
@@ -0,0 +1,383 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlparse import tokens as T
+from sqlparse.engine import grouping
+from sqlparse.sql import Parenthesis, Statement, Token
+
+from sqllineage.core.analyzer import LineageAnalyzer
+from sqllineage.core.handlers.source import SourceHandler
+from sqllineage.core.handlers.target import TargetHandler
+from sqllineage.core.holders import StatementLineageHolder
+from sqllineage.core.models import Path, Schema, SubQuery, Table
+from sqllineage.utils.helpers import escape_identifier_name
+from sqllineage.utils.sqlparse import is_lineage_free, strip_comments
+
+# first keyword of statements that the state machine understands
+STATEMENT_KEYWORDS = frozenset({"SELECT", "INSERT", "WITH", "FROM", "CREATE"})
+# keywords that could come in between target table keyword and target table, e.g. CREATE TABLE IF NOT EXISTS tab1
+TARGET_MODIFIER_KEYWORDS = frozenset(
+    {"TABLE", "IF", "NOT", "EXISTS", "LOCAL", "DIRECTORY"}
+)
+# keywords starting a clause, subqueries are only expected in some of them
+CLAUSE_KEYWORDS = frozenset(
+    {"SELECT", "FROM", "WHERE", "GROUP BY", "HAVING", "ORDER BY", "LIMIT", "ON"}
+)
+# right before a subquery in WHERE clause, e.g. WHERE col1 IN (SELECT ...) AND EXISTS (SELECT ...)
+WHERE_SUBQUERY_PRECEDING_KEYWORDS = frozenset({"WHERE", "AND", "OR", "NOT", "EXISTS"})
+# sqlparse groups everything after WHERE into the WHERE clause till one of its closing keywords, which doesn't include
+# INTERSECT or MINUS, so that the queries after them are not analyzed as such by LineageAnalyzer
+UNSUPPORTED_KEYWORDS = frozenset({"INTERSECT", "MINUS"})
+NAME_TYPES = (T.Name, T.String.Symbol)
+
+
+class UnsupportedSyntax(Exception):
+    """
+    Raised when the state machine runs into syntax it doesn't model, the statement is then analyzed by
+    :class:`sqllineage.core.analyzer.LineageAnalyzer` instead.
+    """
+
+
+class FastLineageAnalyzer:
+    """Table Level Lineage Analyzer working on lexer tokens only."""
+
+    def __init__(self, disabled_handlers: Optional[Iterable[str]] = None):
+        """
+        :param disabled_handlers: passed on to :class:`sqllineage.core.analyzer.LineageAnalyzer`, which analyzes the
+            statements the state machine doesn't understand
+        """
+        self._analyzer = LineageAnalyzer(disabled_handlers)
+
+    def analyze(
+        self, stmt: Statement, deadline: Optional[float] = None
+    ) -> StatementLineageHolder:
+        """
+        to analyze table level lineage of the Statement, without column lineage, and store the result into
+        :class:`sqllineage.holders.StatementLineageHolder`.
+
+        A state machine runs over the lexer tokens, recognizing source tables after FROM and JOIN, target table after
+        INTO, OVERWRITE, TABLE and VIEW, and CTE after WITH, with parenthesis depth tracked for subqueries. Statements
+        other than SELECT, INSERT and CREATE, or with syntax out of its scope, are grouped and analyzed by
+        :class:`sqllineage.core.analyzer.LineageAnalyzer` as usual, so that the result is always the same.
+
+        :param stmt: a SQL statement split by lexer, whose tokens are not grouped yet
+        :param deadline: passed on to :class:`sqllineage.core.analyzer.LineageAnalyzer`
+        """
+        stmt = strip_comments(stmt)
+        holder = self.scan(stmt)
+        if holder is None:
+            holder = self._analyzer.analyze(grouping.group(stmt), deadline)
+        return holder
+
+    @staticmethod
+    def scan(stmt: Statement) -> Optional[StatementLineageHolder]:
+        """
+        to analyze table level lineage of the Statement with the state machine only, which takes time linear to the
+        number of tokens.
+
+        :param stmt: a SQL statement split by lexer, with comments stripped
+        :return: None if the statement is out of the scope of the state machine
+        """
+        if is_lineage_free(stmt):
+            return StatementLineageHolder()
+        try:
+            return _TableLineageScanner(stmt).scan()
+        except UnsupportedSyntax:
+            return None
+
+
+class _TableLineageScanner:
+    def __init__(self, stmt: Statement):
+        self.holder = StatementLineageHolder()
+        self.stmt_tokens: List[Token] = stmt.tokens
+        # whitespaces are skipped, with position of each token in statement kept to cut out CTE text
+        self.positions = [i for i, t in enumerate(stmt.tokens) if not t.is_whitespace]
+        self.tokens = [stmt.tokens[i] for i in self.positions]
+        # index of enclosing opening parenthesis for each token, -1 at statement level, and matching parenthesis
+        self.enclosing: List[int] = []
+        self.closing: Dict[int, int] = {}
+        stack: List[int] = []
+        for i, token in enumerate(self.tokens):
+            if _is_punctuation(token, ")"):
+                if not stack:
+                    raise UnsupportedSyntax
+                self.closing[stack.pop()] = i
+            self.enclosing.append(stack[-1] if stack else -1)
+            if _is_punctuation(token, "("):
+                stack.append(i)
+        if stack:
+            raise UnsupportedSyntax
+        # the current clause keyword and depth of CASE expression, of each query keyed by its opening parenthesis
+        self.clauses: Dict[int, str] = {}
+        self.cases: Dict[int, int] = {}
+        self.ctes: Set[str] = set()
+        self.write: Union[Path, Table, None] = None
+
+    def scan(self) -> StatementLineageHolder:
+        first = self.tokens[0]
+        if not (first.is_keyword and _keyword(first).split()[0] in STATEMENT_KEYWORDS):
+            raise UnsupportedSyntax
+        self.clauses[-1] = ""
+        self._scan(0, len(self.tokens))
+        return self.holder
+
+    def _scan(self, start: int, stop: int) -> None:
+        i = start
+        while i < stop:
+            token = self.tokens[i]
+            if token.is_keyword:
+                keyword = _keyword(token)
+                level = self.enclosing[i]
+                if keyword in SourceHandler.SOURCE_TABLE_TOKENS:
+                    if level not in self.clauses:
+                        # FROM in function call, e.g. EXTRACT(YEAR FROM col1)
+                        if keyword != "FROM":
+                            raise UnsupportedSyntax
+                    else:
+                        self.clauses[level] = "FROM"
+                        i = self._read_tables(i + 1)
+                        continue
+                elif keyword in TargetHandler.TARGET_TABLE_TOKENS:
+                    i = self._write_table(i)
+                    continue
+                elif keyword == "WITH":
+                    i = self._ctes(i + 1)
+                    continue
+                elif keyword == "CASE":
+                    self.cases[level] = self.cases.get(level, 0) + 1
+                elif keyword == "END":
+                    self.cases[level] = self.cases.get(level, 0) - 1
+                elif keyword in CLAUSE_KEYWORDS:
+                    self.clauses[level] = keyword
+                elif keyword in UNSUPPORTED_KEYWORDS or (
+                    token.ttype in T.DML and keyword != "INSERT"
+                ):
+                    # DELETE, UPDATE, MERGE, etc.
+                    raise UnsupportedSyntax
+            elif _is_punctuation(token, "(") and self._is_query(i):
+                self._check_subquery(i)
+                self.clauses[i] = ""
+            elif (
+                token.ttype in T.Name
+                and token.value.lower() == "swap_partitions_between_tables"
+            ):
+                raise UnsupportedSyntax
+            i += 1
+
+    def _check_subquery(self, i: int) -> None:
+        """
+        LineageAnalyzer finds subqueries by how they're grouped by sqlparse, make sure the one opening at i is in a
+        position where it's always found, so that the result never differs.
+        """
+        level = self.enclosing[i]
+        clause = self.clauses.get(level)
+        if clause is None or self.cases.get(level, 0) > 0:
+            # in function call, parenthesized expression, or CASE expression
+            raise UnsupportedSyntax
+        prev = self.tokens[i - 1]
+        end = self.closing[i]
+        following = self.tokens[end + 1] if end + 1 < len(self.tokens) else None
+        if clause == "WHERE":
+            # compared as a whole, not part of an arithmetic operation
+            if not (
+                prev.ttype in T.Operator.Comparison
+                or (
+                    prev.is_keyword
+                    and _keyword(prev) in WHERE_SUBQUERY_PRECEDING_KEYWORDS
+                )
+            ):
+                raise UnsupportedSyntax
+            if not (
+                following is None
+                or following.is_keyword
+                or _is_punctuation(following, ")")
+                or (
+                    following.ttype in T.Operator.Comparison
+                    and prev.ttype not in T.Operator.Comparison
+                )
+            ):
+                raise UnsupportedSyntax
+        elif clause == "SELECT":
+            # scalar subquery with alias, as a column of its own
+            if not (_is_punctuation(prev, ",") or prev.match(T.DML, "SELECT")):
+                raise UnsupportedSyntax
+            if not (
+                following is not None
+                and (following.match(T.Keyword, "AS") or following.ttype in NAME_TYPES)
+            ):
+                raise UnsupportedSyntax
+        else:
+            raise UnsupportedSyntax
+
+    def _read_tables(self, i: int) -> int:
+        """
+        read source tables from a comma separated list starting at i, return the index right after the list
+        """
+        while i < len(self.tokens):
+            i = self._read_table(i)
+            if i < len(self.tokens) and _is_punctuation(self.tokens[i], ","):
+                i += 1
+            else:
+                break
+        return i
+
+    def _read_table(self, i: int) -> int:
+        token = self.tokens[i]
+        if _is_punctuation(token, "("):
+            if not (
+                i + 1 < len(self.tokens) and self.tokens[i + 1].match(T.DML, "SELECT")
+            ):
+                # SELECT * FROM (tab1), or parenthesized subqueries with UNION
+                raise UnsupportedSyntax
+            end = self.closing[i]
+            self.clauses[i] = ""
+            self._scan(i + 1, end)
+            return self._read_alias(end + 1)[0]
+        elif token.ttype is T.String.Single:
+            self.holder.add_read(Path(token.value))
+            return i + 1
+        elif token.ttype in NAME_TYPES:
+            names, i = self._read_name(i)
+            i, alias = self._read_alias(i)
+            if i < len(self.tokens) and _is_punctuation(self.tokens[i], "("):
+                # table valued function
+                raise UnsupportedSyntax
+            if (
+                len(names) == 2
+                and names[0].value in ("parquet", "csv", "json")
+                and names[1].value.startswith("`")
+            ):
+                self.holder.add_read(Path(names[1].value))
+            elif (
+                len(names) == 1 and escape_identifier_name(names[0].value) in self.ctes
+            ):
+                # reference to CTE is not a table
+                pass
+            else:
+                self.holder.add_read(_table(names, alias))
+            return i
+        else:
+            raise UnsupportedSyntax
+
+    def _write_table(self, i: int) -> int:
+        if self.enclosing[i] != -1 or _keyword(self.tokens[i]) in ("UPDATE", "COPY"):
+            raise UnsupportedSyntax
+        i += 1
+        while i < len(self.tokens) and self.tokens[i].is_keyword:
+            if _keyword(self.tokens[i]) not in TARGET_MODIFIER_KEYWORDS:
+                raise UnsupportedSyntax
+            i += 1
+        if i == len(self.tokens):
+            return i
+        token = self.tokens[i]
+        target: Union[Path, Table]
+        if token.ttype is T.String.Single:
+            target = Path(token.value)
+            i += 1
+        elif token.ttype is T.Number.Integer:
+            # Spark bucket table DDL: CLUSTERED BY (col1) INTO 4 BUCKETS
+            return i + 1
+        elif token.ttype in NAME_TYPES:
+            names, i = self._read_name(i)
+            target = _table(names, None)
+            if i < len(self.tokens) and self.tokens[i].ttype in NAME_TYPES:
+                # target table with alias
+                raise UnsupportedSyntax
+            if (
+                i < len(self.tokens)
+                and self.tokens[i].ttype in T.Operator.Comparison
+                and self.tokens[i].value.upper() == "LIKE"
+            ):
+                # CREATE TABLE tab1 LIKE tab2
+                if not (
+                    i + 1 < len(self.tokens) and self.tokens[i + 1].ttype in NAME_TYPES
+                ):
+                    raise UnsupportedSyntax
+                names, i = self._read_name(i + 1)
+                self.holder.add_read(_table(names, None))
+        else:
+            raise UnsupportedSyntax
+        if self.write is not None and self.write != target:
+            # multiple target tables are not supported by LineageAnalyzer either
+            raise UnsupportedSyntax
+        self.write = target
+        self.holder.add_write(target)
+        return i
+
+    def _ctes(self, i: int) -> int:
+        if i < len(self.tokens) and _is_punctuation(self.tokens[i], "("):
+            # CREATE TABLE tab1 (col1 VARCHAR) WITH (bucket_count = 256) is not CTE
+            return i
+        while True:
+            if not (
+                i + 3 < len(self.tokens)
+                and self.tokens[i].ttype in NAME_TYPES
+                and self.tokens[i + 1].match(T.Keyword, "AS")
+                and _is_punctuation(self.tokens[i + 2], "(")
+                and self.tokens[i + 3].match(T.DML, "SELECT")
+            ):
+                raise UnsupportedSyntax
+            name, start = escape_identifier_name(self.tokens[i].value), i + 2
+            end = self.closing[start]
+            # CTE is identified by its text, cut out of the statement the same way as grouped by sqlparse
+            first, last = self.positions[start], self.positions[end] + 1
+            cte = SubQuery.of(Parenthesis(self.stmt_tokens[first:last]), name)
+            # the parse tree is not needed afterwards, as LineageAnalyzer releases it after analysis
+            cte.token = None
+            self.holder.add_cte(cte)
+            self.ctes.add(name)
+            self.clauses[start] = ""
+            self._scan(start + 1, end)
+            i = end + 1
+            if i < len(self.tokens) and _is_punctuation(self.tokens[i], ","):
+                i += 1
+            else:
+                return i
+
+    def _is_query(self, i: int) -> bool:
+        # parenthesis with SELECT right inside, or nested parentheses closely followed by SELECT
+        while i < len(self.tokens) and _is_punctuation(self.tokens[i], "("):
+            i += 1
+        return i < len(self.tokens) and self.tokens[i].match(T.DML, "SELECT")
+
+    def _read_name(self, i: int) -> Tuple[List[Token], int]:
+        names = [self.tokens[i]]
+        i += 1
+        while (
+            i + 1 < len(self.tokens)
+            and _is_punctuation(self.tokens[i], ".")
+            and self.tokens[i + 1].ttype in NAME_TYPES
+        ):
+            names.append(self.tokens[i + 1])
+            i += 2
+        return names, i
+
+    def _read_alias(self, i: int) -> Tuple[int, Optional[str]]:
+        alias = None
+        if i < len(self.tokens) and self.tokens[i].match(T.Keyword, "AS"):
+            i += 1
+            if i == len(self.tokens) or self.tokens[i].ttype not in NAME_TYPES:
+                raise UnsupportedSyntax
+        if i < len(self.tokens) and self.tokens[i].ttype in NAME_TYPES:
+            alias = escape_identifier_name(self.tokens[i].value)
+            i += 1
+        return i, alias
+
+
+def _keyword(token: Token) -> str:
+    return " ".join(token.normalized.split())
+
+
+def _is_punctuation(token: Token, value: str) -> bool:
+    return token.ttype is T.Punctuation and token.value == value
+
+
+def _table(names: List[Token], alias: Optional[str]) -> Table:
+    schema = (
+        Schema(".".join(escape_identifier_name(t.value) for t in names[:-1]))
+        if len(names) > 1
+        else Schema()
+    )
+    kwargs = {"alias": alias} if alias else {}
+    return Table.intern(
+        Table(escape_identifier_name(names[-1].value), schema, **kwargs)
+    )
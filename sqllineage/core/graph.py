@@ -0,0 +1,467 @@
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from networkx import DiGraph, NetworkXError
+
+from sqllineage.exceptions import SQLLineageException
+from sqllineage.utils.constant import EdgeType, GraphBackend, NodeTag
+
+# bit position of each node tag in tag bitmask
+NODE_TAGS = (
+    NodeTag.READ,
+    NodeTag.WRITE,
+    NodeTag.CTE,
+    NodeTag.DROP,
+    NodeTag.SOURCE_ONLY,
+    NodeTag.TARGET_ONLY,
+    NodeTag.SELFLOOP,
+)
+_TAG_BITS = {tag: 1 << i for i, tag in enumerate(NODE_TAGS)}
+# adjacency entry packs node id with edge type value in the lowest bits, 0 for edge without type
+_TYPE_BITS = 3
+_TYPE_MASK = (1 << _TYPE_BITS) - 1
+_TYPE_VALUES = (0,) + tuple(t.value for t in EdgeType)
+# adjacency of at least this size is indexed by neighbor id, smaller ones are scanned
+_INDEX_MIN_DEGREE = 32
+
+
+class CompactDiGraph:
+    def __init__(self) -> None:
+        """
+        A directed graph holding lineage in compact form, as a drop-in replacement of networkx.DiGraph for
+        :class:`sqllineage.core.holders.SQLLineageHolder`.
+
+        Nodes are interned into integer ids. Adjacency of each node is an array of unsigned integers, each packing
+        the id of neighbor node with edge type, and node tags are kept as a bitmask per node. Compared with
+        networkx.DiGraph, which keeps a dict for adjacency of each node and another for attributes of each node and
+        edge, it takes a fraction of memory for millions of column edges. Nodes of high degree, e.g. a table with
+        thousands of columns, additionally get a dict from neighbor id to edge type, so that edge lookup takes
+        constant time.
+
+        It supports the part of networkx.DiGraph API that lineage holders use. Node attributes are limited to
+        :class:`sqllineage.utils.constant.NodeTag` with value True, and edge attribute to type of
+        :class:`sqllineage.utils.constant.EdgeType`. :meth:`subgraph` and :meth:`to_networkx` export to
+        networkx.DiGraph for graph algorithms and visualization.
+        """
+        self._ids: Dict[Any, int] = {}
+        # removed node leaves a None in its slot, node id is never reused
+        self._nodes: List[Any] = []
+        self._tags = bytearray()
+        self._succ: List[Optional["array[int]"]] = []
+        self._pred: List[Optional["array[int]"]] = []
+        # neighbor id to edge type value of high degree node, built on first lookup and kept up to date afterwards
+        self._succ_index: Dict[int, Dict[int, int]] = {}
+        self._pred_index: Dict[int, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (node for _, node in self._items())
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._ids
+
+    @property
+    def nodes(self) -> "_NodeView":
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> "_EdgeView":
+        return _EdgeView(self)
+
+    @property
+    def degree(self) -> "_DegreeView":
+        return _DegreeView(self, True, True)
+
+    @property
+    def in_degree(self) -> "_DegreeView":
+        return _DegreeView(self, True, False)
+
+    @property
+    def out_degree(self) -> "_DegreeView":
+        return _DegreeView(self, False, True)
+
+    def number_of_nodes(self) -> int:
+        return len(self._ids)
+
+    def number_of_edges(self) -> int:
+        return sum(len(adj) for adj in self._succ if adj is not None)
+
+    def has_node(self, node: Any) -> bool:
+        return node in self._ids
+
+    def has_edge(self, src: Any, tgt: Any) -> bool:
+        i, j = self._ids.get(src), self._ids.get(tgt)
+        return i is not None and j is not None and self._succ_entry(i, j) >= 0
+
+    def add_node(self, node: Any, **attr: Any) -> None:
+        i = self._ids.get(node)
+        if i is None:
+            if node is None:
+                raise ValueError("None cannot be a node")
+            i = self._ids[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._tags.append(0)
+            self._succ.append(None)
+            self._pred.append(None)
+        for tag, value in attr.items():
+            _set_tag(self._tags, i, tag, value)
+
+    def add_nodes_from(self, nodes: Iterable[Any], **attr: Any) -> None:
+        for node in nodes:
+            self.add_node(node, **attr)
+
+    def add_edge(self, src: Any, tgt: Any, **attr: Any) -> None:
+        self.add_node(src)
+        self.add_node(tgt)
+        i, j = self._ids[src], self._ids[tgt]
+        edge_type = attr.pop("type", None)
+        if attr:
+            raise SQLLineageException(
+                "Unsupported edge attributes: %s" % ", ".join(attr)
+            )
+        self._add_edge(i, j, 0 if edge_type is None else EdgeType(edge_type).value)
+
+    def _add_edge(self, i: int, j: int, value: int) -> None:
+        succ, pred = self._succ[i], self._pred[j]
+        entry = self._succ_entry(i, j)
+        if entry >= 0:
+            if value:
+                # same as networkx, attributes of existing edge are updated
+                succ[succ.index(entry)] = j << _TYPE_BITS | value  # type: ignore
+                pred[pred.index(i << _TYPE_BITS | entry & _TYPE_MASK)] = (  # type: ignore
+                    i << _TYPE_BITS | value
+                )
+                _index(self._succ_index, i, j, value)
+                _index(self._pred_index, j, i, value)
+            return
+        if succ is None:
+            succ = self._succ[i] = array("I")
+        succ.append(j << _TYPE_BITS | value)
+        _index(self._succ_index, i, j, value)
+        if pred is None:
+            pred = self._pred[j] = array("I")
+        pred.append(i << _TYPE_BITS | value)
+        _index(self._pred_index, j, i, value)
+
+    def _succ_entry(self, i: int, j: int) -> int:
+        return _find(self._succ[i], self._succ_index, i, j)
+
+    def remove_edge(self, src: Any, tgt: Any) -> None:
+        i, j = self._ids.get(src), self._ids.get(tgt)
+        entry = -1 if i is None or j is None else self._succ_entry(i, j)
+        if entry < 0:
+            raise NetworkXError(f"The edge {src}-{tgt} not in graph.")
+        self._succ[i].remove(entry)  # type: ignore
+        self._pred[j].remove(i << _TYPE_BITS | entry & _TYPE_MASK)  # type: ignore
+        _index(self._succ_index, i, j, None)  # type: ignore
+        _index(self._pred_index, j, i, None)  # type: ignore
+
+    def remove_node(self, node: Any) -> None:
+        i = self._ids.pop(node, None)
+        if i is None:
+            raise NetworkXError(f"The node {node} is not in the digraph.")
+        succ, pred = self._succ[i], self._pred[i]
+        for entry in succ or ():
+            j = entry >> _TYPE_BITS
+            if j != i:
+                self._pred[j].remove(i << _TYPE_BITS | entry & _TYPE_MASK)  # type: ignore
+                _index(self._pred_index, j, i, None)
+        for entry in pred or ():
+            j = entry >> _TYPE_BITS
+            if j != i:
+                self._succ[j].remove(i << _TYPE_BITS | entry & _TYPE_MASK)  # type: ignore
+                _index(self._succ_index, j, i, None)
+        self._nodes[i] = None
+        self._tags[i] = 0
+        self._succ[i] = self._pred[i] = None
+        self._succ_index.pop(i, None)
+        self._pred_index.pop(i, None)
+
+    def successors(self, node: Any) -> Iterator[Any]:
+        return self._neighbors(self._succ, node)
+
+    def predecessors(self, node: Any) -> Iterator[Any]:
+        return self._neighbors(self._pred, node)
+
+    def selfloop_edges(self) -> List[Tuple[Any, Any]]:
+        return [
+            (node, node) for i, node in self._items() if self._succ_entry(i, i) >= 0
+        ]
+
+    def relabel_nodes(self, mapping: Dict[Any, Any]) -> "CompactDiGraph":
+        """
+        relabel nodes in place, with the same result as networkx.relabel_nodes(graph, mapping) making a copy: when
+        the new node exists already, edges of both are merged into the one coming first in node order, while tags
+        are those of the one coming last. Nodes in mapping but not in graph are ignored.
+        """
+        for old, new in mapping.items():
+            if old not in self._ids or old == new:
+                continue
+            i = self._ids.pop(old)
+            j = self._ids.get(new)
+            if j is None:
+                self._nodes[i] = new
+                self._ids[new] = i
+                continue
+            keep, drop = min(i, j), max(i, j)
+            tags = self._tags[drop]
+            out_edges = [
+                (e >> _TYPE_BITS, e & _TYPE_MASK) for e in self._succ[drop] or ()
+            ]
+            in_edges = [
+                (e >> _TYPE_BITS, e & _TYPE_MASK) for e in self._pred[drop] or ()
+            ]
+            self._ids[self._nodes[drop]] = drop
+            self.remove_node(self._nodes[drop])
+            self._nodes[keep] = new
+            self._ids[new] = keep
+            self._tags[keep] = tags
+            for k, value in out_edges:
+                self._add_edge(keep, keep if k == drop else k, value)
+            for k, value in in_edges:
+                self._add_edge(keep if k == drop else k, keep, value)
+        return self
+
+    def update(self, graph: Union[DiGraph, "CompactDiGraph"]) -> None:
+        """
+        add nodes and edges of another graph, either networkx.DiGraph or CompactDiGraph, with their attributes.
+        """
+        for node, attr in graph.nodes(data=True):
+            self.add_node(node, **attr)
+        for src, tgt, attr in graph.edges(data=True):
+            self.add_edge(src, tgt, **attr)
+
+    def copy(self) -> "CompactDiGraph":
+        graph = CompactDiGraph()
+        graph._ids = dict(self._ids)
+        graph._nodes = list(self._nodes)
+        graph._tags = bytearray(self._tags)
+        graph._succ = [None if adj is None else array("I", adj) for adj in self._succ]
+        graph._pred = [None if adj is None else array("I", adj) for adj in self._pred]
+        return graph
+
+    def subgraph(self, nodes: Iterable[Any]) -> DiGraph:
+        """
+        the subgraph induced on nodes, exported to networkx.DiGraph
+        """
+        ids = {self._ids[node] for node in nodes if node in self._ids}
+        graph = DiGraph()
+        for i in sorted(ids):
+            graph.add_node(self._nodes[i], **_tag_dict(self._tags[i]))
+        for i in sorted(ids):
+            for entry in self._succ[i] or ():
+                if entry >> _TYPE_BITS in ids:
+                    graph.add_edge(*self._edge(i, entry)[:2], **_edge_attr(entry))
+        return graph
+
+    def to_networkx(self) -> DiGraph:
+        """
+        export the whole graph to networkx.DiGraph
+        """
+        return self.subgraph(self._ids)
+
+    def _items(self) -> List[Tuple[int, Any]]:
+        """
+        id and node of all the nodes, in the order they're added
+        """
+        return [(i, node) for i, node in enumerate(self._nodes) if node is not None]
+
+    def _neighbors(
+        self, adjacency: List[Optional["array[int]"]], node: Any
+    ) -> Iterator[Any]:
+        i = self._ids.get(node)
+        if i is None:
+            raise NetworkXError(f"The node {node} is not in the digraph.")
+        return iter([self._nodes[entry >> _TYPE_BITS] for entry in adjacency[i] or ()])
+
+    def _edge(
+        self, i: int, entry: int, reverse: bool = False
+    ) -> Tuple[Any, Any, Optional[EdgeType]]:
+        node, neighbor = self._nodes[i], self._nodes[entry >> _TYPE_BITS]
+        value = entry & _TYPE_MASK
+        edge_type = EdgeType(value) if value else None
+        return (neighbor, node, edge_type) if reverse else (node, neighbor, edge_type)
+
+
+class _NodeView:
+    def __init__(self, graph: CompactDiGraph):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        if not data:
+            return iter(self._graph)
+        tags = self._graph._tags
+        return iter([(node, _tag_dict(tags[i])) for i, node in self._graph._items()])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph)
+
+    def __len__(self) -> int:
+        return len(self._graph._ids)
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._graph._ids
+
+    def __getitem__(self, node: Any) -> "_TagMap":
+        if node not in self._graph._ids:
+            raise KeyError(node)
+        return _TagMap(self._graph._tags, self._graph._ids[node])
+
+
+class _TagMap(MutableMapping[str, bool]):
+    """
+    node attributes backed by tag bitmask, as a mutable mapping from tag to True
+    """
+
+    def __init__(self, tags: bytearray, i: int):
+        self._tags = tags
+        self._i = i
+
+    def __getitem__(self, tag: str) -> bool:
+        if self._tags[self._i] & _TAG_BITS.get(tag, 0):
+            return True
+        raise KeyError(tag)
+
+    def __setitem__(self, tag: str, value: Any) -> None:
+        _set_tag(self._tags, self._i, tag, value)
+
+    def __delitem__(self, tag: str) -> None:
+        if tag not in self:
+            raise KeyError(tag)
+        self._tags[self._i] &= ~_TAG_BITS[tag]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_tag_dict(self._tags[self._i]))
+
+    def __len__(self) -> int:
+        return len(_tag_dict(self._tags[self._i]))
+
+
+class _EdgeView:
+    def __init__(self, graph: CompactDiGraph):
+        self._graph = graph
+
+    def __call__(self, data: Union[bool, str] = False) -> Iterator[Tuple[Any, ...]]:
+        graph = self._graph
+        edges: List[Tuple[Any, ...]] = []
+        for i, succ in enumerate(graph._succ):
+            for entry in succ or ():
+                src, tgt, edge_type = graph._edge(i, entry)
+                if data is True:
+                    edges.append((src, tgt, _edge_attr(entry)))
+                elif data == "type":
+                    edges.append((src, tgt, edge_type))
+                elif data:
+                    edges.append((src, tgt, None))
+                else:
+                    edges.append((src, tgt))
+        return iter(edges)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return self()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+
+class _DegreeView:
+    def __init__(self, graph: CompactDiGraph, pred: bool, succ: bool):
+        self._graph = graph
+        self._pred = pred
+        self._succ = succ
+
+    def __getitem__(self, node: Any) -> int:
+        return self._degree(self._graph._ids[node])
+
+    def __iter__(self) -> Iterator[Tuple[Any, int]]:
+        return iter([(node, self._degree(i)) for i, node in self._graph._items()])
+
+    def _degree(self, i: int) -> int:
+        degree = 0
+        if self._pred:
+            degree += len(self._graph._pred[i] or ())
+        if self._succ:
+            degree += len(self._graph._succ[i] or ())
+        return degree
+
+
+def _find(
+    adjacency: Optional["array[int]"],
+    indexes: Dict[int, Dict[int, int]],
+    i: int,
+    j: int,
+) -> int:
+    """
+    entry of node id j in adjacency array of node id i, -1 if not found
+    """
+    if adjacency is None:
+        return -1
+    if i in indexes or len(adjacency) >= _INDEX_MIN_DEGREE:
+        index = indexes.get(i)
+        if index is None:
+            index = indexes[i] = {
+                entry >> _TYPE_BITS: entry & _TYPE_MASK for entry in adjacency
+            }
+        value = index.get(j)
+        return -1 if value is None else j << _TYPE_BITS | value
+    for value in _TYPE_VALUES:
+        entry = j << _TYPE_BITS | value
+        if entry in adjacency:
+            return entry
+    return -1
+
+
+def _index(
+    indexes: Dict[int, Dict[int, int]], i: int, j: int, value: Optional[int]
+) -> None:
+    """
+    update edge type value of node id j in the index of node id i if there's one, None for removed edge
+    """
+    index = indexes.get(i)
+    if index is not None:
+        if value is None:
+            del index[j]
+        else:
+            index[j] = value
+
+
+def _set_tag(tags: bytearray, i: int, tag: str, value: Any) -> None:
+    if tag not in _TAG_BITS:
+        raise SQLLineageException("Unsupported node attribute: %s" % tag)
+    if value is True:
+        tags[i] |= _TAG_BITS[tag]
+    else:
+        tags[i] &= ~_TAG_BITS[tag]
+
+
+def _tag_dict(bits: int) -> Dict[str, bool]:
+    return {tag: True for tag, bit in _TAG_BITS.items() if bits & bit}
+
+
+def _edge_attr(entry: int) -> Dict[str, EdgeType]:
+    value = entry & _TYPE_MASK
+    return {"type": EdgeType(value)} if value else {}
+
+
+def new_graph(backend: str = GraphBackend.NETWORKX) -> Union[DiGraph, CompactDiGraph]:
+    """
+    create an empty graph with the backend, see :class:`sqllineage.utils.constant.GraphBackend`
+    """
+    if backend == GraphBackend.NETWORKX:
+        return DiGraph()
+    elif backend == GraphBackend.COMPACT:
+        return CompactDiGraph()
+    else:
+        raise SQLLineageException("Unsupported graph backend: %s" % backend)
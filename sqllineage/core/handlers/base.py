@@ -1,6 +1,10 @@
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Type
+
 from sqlparse.sql import Token
 
 from sqllineage.core.holders import SubQueryLineageHolder
+from sqllineage.exceptions import SQLLineageException
 
 
 class NextTokenBaseHandler:
@@ -8,8 +12,15 @@ class NextTokenBaseHandler:
     This is to address an extract pattern when a specified token indicates we should extract something from next token.
     """
 
-    def __init__(self) -> None:
+    # normalized keywords, with whitespaces collapsed, that _indicate should be called with
+    KEYWORDS: Tuple[str, ...] = ()
+
+    def __init__(self, deadline: Optional[float] = None) -> None:
+        """
+        :param deadline: the time, by time.monotonic(), analysis of the statement should be done by
+        """
         self.indicator = False
+        self.deadline = deadline
 
     def _indicate(self, token: Token) -> bool:
         """
@@ -51,5 +62,95 @@ class CurrentTokenBaseHandler:
     This is to address an extract pattern when we should extract something from current token
     """
 
+    # types of tokens that handle should be called with
+    TOKEN_TYPES: Tuple[type, ...] = ()
+
     def handle(self, token: Token, holder: SubQueryLineageHolder) -> None:
         raise NotImplementedError
+
+
+class HandlerDispatcher:
+    """
+    Precompiled dispatch table from keyword or token type to the handlers interested in it, so that in the analyzer
+    token loop each token is only routed to those handlers, instead of every one of them.
+    """
+
+    def __init__(self, disabled: Iterable[str] = ()) -> None:
+        """
+        :param disabled: class names of the handlers to turn off
+        """
+        disabled = set(disabled)
+        current_handler_classes = CurrentTokenBaseHandler.__subclasses__()
+        next_handler_classes = NextTokenBaseHandler.__subclasses__()
+        unknown = disabled - {
+            handler_cls.__name__
+            for handler_cls in current_handler_classes + next_handler_classes
+        }
+        if unknown:
+            raise SQLLineageException(
+                "Unknown handler to disable: %s" % ", ".join(sorted(unknown))
+            )
+        self.current_handler_classes: List[Type[CurrentTokenBaseHandler]] = [
+            handler_cls
+            for handler_cls in current_handler_classes
+            if handler_cls.__name__ not in disabled
+        ]
+        self.next_handler_classes: List[Type[NextTokenBaseHandler]] = [
+            handler_cls
+            for handler_cls in next_handler_classes
+            if handler_cls.__name__ not in disabled
+        ]
+        keyword_table: Dict[str, List[int]] = {}
+        for i, handler_cls in enumerate(self.next_handler_classes):
+            for keyword in handler_cls.KEYWORDS:
+                keyword_table.setdefault(keyword, []).append(i)
+        self._keyword_table = {k: tuple(v) for k, v in keyword_table.items()}
+        # normalized keyword might contain arbitrary whitespaces like "LEFT  JOIN", memorized as seen
+        self._keyword_cache: Dict[str, Tuple[int, ...]] = {}
+        self._type_cache: Dict[type, Tuple[int, ...]] = {}
+
+    def create_handlers(
+        self, deadline: Optional[float] = None
+    ) -> Tuple[List[CurrentTokenBaseHandler], List[NextTokenBaseHandler]]:
+        """
+        create a fresh set of enabled handlers for one query, as they hold states during the token loop
+
+        :param deadline: the time, by time.monotonic(), analysis of the statement should be done by
+        """
+        return (
+            [handler_cls() for handler_cls in self.current_handler_classes],
+            [handler_cls(deadline) for handler_cls in self.next_handler_classes],
+        )
+
+    def route_current(self, token: Token) -> Tuple[int, ...]:
+        """
+        indices of current token handlers interested in the token
+        """
+        token_type = type(token)
+        indices = self._type_cache.get(token_type)
+        if indices is None:
+            indices = self._type_cache[token_type] = tuple(
+                i
+                for i, handler_cls in enumerate(self.current_handler_classes)
+                if issubclass(token_type, handler_cls.TOKEN_TYPES)
+            )
+        return indices
+
+    def route_keyword(self, token: Token) -> Tuple[int, ...]:
+        """
+        indices of next token handlers interested in the keyword token
+        """
+        indices = self._keyword_cache.get(token.normalized)
+        if indices is None:
+            indices = self._keyword_cache[token.normalized] = self._keyword_table.get(
+                " ".join(token.normalized.split()), ()
+            )
+        return indices
+
+
+@lru_cache(maxsize=None)
+def get_handler_dispatcher(disabled: FrozenSet[str] = frozenset()) -> HandlerDispatcher:
+    """
+    the dispatch table is built only once for each set of disabled handlers
+    """
+    return HandlerDispatcher(disabled)
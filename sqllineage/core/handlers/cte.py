@@ -10,6 +10,7 @@ class CTEHandler(NextTokenBaseHandler):
     """Common Table Expression (With Queries) Handler."""
 
     CTE_TOKENS = ("WITH",)
+    KEYWORDS = CTE_TOKENS
 
     def _indicate(self, token: Token) -> bool:
         return token.normalized in self.CTE_TOKENS
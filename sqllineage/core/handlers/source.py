@@ -16,34 +16,38 @@ from sqllineage.core.handlers.base import NextTokenBaseHandler
 from sqllineage.core.holders import SubQueryLineageHolder
 from sqllineage.core.models import Column, Path, SubQuery, Table
 from sqllineage.exceptions import SQLLineageException
-from sqllineage.utils.constant import EdgeType
 from sqllineage.utils.sqlparse import get_subquery_parentheses, is_subquery
 
 
 class SourceHandler(NextTokenBaseHandler):
     """Source Table & Column Handler."""
 
-    SOURCE_TABLE_TOKENS = (
-        r"FROM",
-        # inspired by https://github.com/andialbrecht/sqlparse/blob/master/sqlparse/keywords.py
-        r"((LEFT\s+|RIGHT\s+|FULL\s+)?(INNER\s+|OUTER\s+|STRAIGHT\s+)?|(CROSS\s+|NATURAL\s+)?)?JOIN",
+    # all the JOIN keywords sqlparse lexer could produce, referring
+    # https://github.com/andialbrecht/sqlparse/blob/master/sqlparse/keywords.py
+    SOURCE_TABLE_TOKENS = ("FROM", "CROSS JOIN", "NATURAL JOIN") + tuple(
+        " ".join(kw for kw in (side, kind, "JOIN") if kw)
+        for side in ("", "LEFT", "RIGHT", "FULL")
+        for kind in ("", "INNER", "OUTER", "STRAIGHT")
     )
+    UNION_TOKENS = ("UNION", "UNION ALL")
+    KEYWORDS = SOURCE_TABLE_TOKENS + UNION_TOKENS + ("SELECT",)
 
-    def __init__(self):
+    def __init__(self, deadline=None):
         self.column_flag = False
         self.columns = []
         self.tables = []
         self.union_barriers = []
-        super().__init__()
+        super().__init__(deadline)
 
     def _indicate(self, token: Token) -> bool:
-        if token.normalized in ("UNION", "UNION ALL"):
+        normalized = " ".join(token.normalized.split())
+        if normalized in self.UNION_TOKENS:
             self.union_barriers.append((len(self.columns), len(self.tables)))
 
-        if any(re.match(regex, token.normalized) for regex in self.SOURCE_TABLE_TOKENS):
+        if normalized in self.SOURCE_TABLE_TOKENS:
             self.column_flag = False
             return True
-        elif bool(token.normalized == "SELECT"):
+        elif bool(normalized == "SELECT"):
             self.column_flag = True
             return True
         else:
@@ -94,7 +98,8 @@ class SourceHandler(NextTokenBaseHandler):
             # SELECT constant value will end up here
             column_tokens = []
         for token in column_tokens:
-            self.columns.append(Column.of(token))
+            # scalar subquery in column is analyzed within the deadline of the statement
+            self.columns.append(Column.of(token, self.deadline))
 
     def end_of_query_cleanup(self, holder: SubQueryLineageHolder) -> None:
         for i, tbl in enumerate(self.tables):
@@ -112,11 +117,12 @@ class SourceHandler(NextTokenBaseHandler):
                     raise SQLLineageException
                 tgt_tbl = list(holder.write)[0]
             if tgt_tbl:
+                alias_mapping = self._get_alias_mapping_from_table_group(
+                    tbl_grp, holder
+                )
                 for tgt_col in col_grp:
                     tgt_col.parent = tgt_tbl
-                    for src_col in tgt_col.to_source_columns(
-                        self._get_alias_mapping_from_table_group(tbl_grp, holder)
-                    ):
+                    for src_col in tgt_col.to_source_columns(alias_mapping):
                         holder.add_column_lineage(src_col, tgt_col)
 
     @classmethod
@@ -159,11 +165,7 @@ class SourceHandler(NextTokenBaseHandler):
         For SubQuery, it's only alias then.
         """
         return {
-            **{
-                tgt: src
-                for src, tgt, attr in holder.graph.edges(data=True)
-                if attr.get("type") == EdgeType.HAS_ALIAS and src in table_group
-            },
+            **holder.get_alias_mapping(table_group),
             **{
                 table.raw_name: table
                 for table in table_group
@@ -11,6 +11,8 @@ class SwapPartitionHandler(CurrentTokenBaseHandler):
     a special handling for swap_partitions_between_tables function of Vertica SQL dialect.
     """
 
+    TOKEN_TYPES = (Function,)
+
     def handle(self, token: Token, holder: SubQueryLineageHolder) -> None:
         if (
             isinstance(token, Function)
@@ -11,6 +11,7 @@ class TargetHandler(NextTokenBaseHandler):
     """Target Table Handler."""
 
     TARGET_TABLE_TOKENS = ("INTO", "OVERWRITE", "TABLE", "VIEW", "UPDATE", "COPY")
+    KEYWORDS = TARGET_TABLE_TOKENS
 
     def _indicate(self, token: Token) -> bool:
         return token.normalized in self.TARGET_TABLE_TOKENS
@@ -1,9 +1,10 @@
 import itertools
-from typing import Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import networkx as nx
 from networkx import DiGraph
 
+from sqllineage.core.graph import CompactDiGraph
 from sqllineage.core.models import Column, Path, SubQuery, Table
 from sqllineage.utils.constant import EdgeType, NodeTag
 
@@ -15,7 +16,8 @@ class ColumnLineageMixin:
         self.graph: DiGraph  # For mypy attribute checking
         # filter all the column node in the graph
         column_nodes = [n for n in self.graph.nodes if isinstance(n, Column)]
-        column_graph = self.graph.subgraph(column_nodes)
+        # a subgraph view computes degree by filtering adjacency on the fly, a copy is much faster to traverse
+        column_graph = self.graph.subgraph(column_nodes).copy()
         source_columns = {column for column, deg in column_graph.in_degree if deg == 0}
         # if a column lineage path ends at SubQuery, then it should be pruned
         target_columns = {
@@ -27,12 +29,42 @@ class ColumnLineageMixin:
             target_columns = {
                 node for node in target_columns if isinstance(node.parent, Table)
             }
-        columns = set()
-        for (source, target) in itertools.product(source_columns, target_columns):
-            simple_paths = list(nx.all_simple_paths(self.graph, source, target))
-            for path in simple_paths:
-                columns.add(tuple(path))
-        return columns
+        # self loop, e.g. INSERT OVERWRITE TABLE tab1 SELECT col1 FROM tab1, is never part of a simple path
+        column_graph.remove_edges_from(list(nx.selfloop_edges(column_graph)))
+        if nx.is_directed_acyclic_graph(column_graph):
+            return self._get_column_paths(column_graph, source_columns, target_columns)
+        else:
+            # in case of cycle, search simple paths for each pair of connected source and target column
+            columns = set()
+            for source in source_columns:
+                for target in nx.descendants(column_graph, source) & target_columns:
+                    for path in nx.all_simple_paths(column_graph, source, target):
+                        columns.add(tuple(path))
+            return columns
+
+    @staticmethod
+    def _get_column_paths(
+        graph: DiGraph, source_columns: Set[Column], target_columns: Set[Column]
+    ) -> Set[Tuple[Column, ...]]:
+        """
+        Enumerate all the paths from source to target columns in one traversal of the DAG. Columns are visited in
+        reverse topological order, so that paths from each column are built upon the memoized paths from its
+        successors. Columns that can't reach any target column end up with no path and are pruned along the way.
+        """
+        paths: Dict[Column, List[Tuple[Column, ...]]] = {}
+        for node in reversed(list(nx.topological_sort(graph))):
+            if node in target_columns:
+                paths[node] = [(node,)]
+            else:
+                paths[node] = [
+                    (node,) + path
+                    for successor in graph.successors(node)
+                    for path in paths[successor]
+                ]
+        # a column being both source and target, without any lineage, is not a path
+        return {
+            path for source in source_columns for path in paths[source] if len(path) > 1
+        }
 
 
 class SubQueryLineageHolder(ColumnLineageMixin):
@@ -49,15 +81,49 @@ class SubQueryLineageHolder(ColumnLineageMixin):
     def __init__(self) -> None:
         self.graph = nx.DiGraph()
 
+    @property
+    def graph(self) -> DiGraph:
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: DiGraph) -> None:
+        self._graph = graph
+        # nodes of each tag, kept up to date as nodes are tagged so that read, write, etc. don't scan the graph
+        self._tags: Dict[str, Set[Any]] = {}
+        # tagged nodes mapped to the object kept in graph, the first one added. An equal Table or SubQuery can come
+        # with a different alias, e.g. INSERT INTO tab1 SELECT * FROM tab1 t
+        self._nodes: Dict[Any, Any] = {}
+        # alias of each dataset read, in the order added, see get_alias_mapping
+        self._aliases: Dict[Any, Dict[str, None]] = {}
+        for node, attr in graph.nodes(data=True):
+            for prop, value in attr.items():
+                if value is True:
+                    self._tags.setdefault(prop, set()).add(node)
+                    self._nodes[node] = node
+        for src, tgt, edge_type in graph.edges(data="type"):
+            if edge_type == EdgeType.HAS_ALIAS:
+                self._aliases.setdefault(src, {})[tgt] = None
+
     def __or__(self, other):
-        self.graph = nx.compose(self.graph, other.graph)
+        # merge in place, nodes and edges from other take precedence the same way as nx.compose
+        self._graph.update(other.graph)
+        for node in other._nodes:
+            self._nodes.setdefault(node, node)
+        for prop, nodes in other._tags.items():
+            self._tags.setdefault(prop, set()).update(
+                self._nodes[node] for node in nodes
+            )
+        for node, aliases in other._aliases.items():
+            self._aliases.setdefault(self._nodes.get(node, node), {}).update(aliases)
         return self
 
     def _property_getter(self, prop) -> Set[Union[SubQuery, Table]]:
-        return {t for t, attr in self.graph.nodes(data=True) if attr.get(prop) is True}
+        return set(self._tags.get(prop, ()))
 
     def _property_setter(self, value, prop) -> None:
-        self.graph.add_node(value, **{prop: True})
+        value = self._nodes.setdefault(value, value)
+        self._graph.add_node(value, **{prop: True})
+        self._tags.setdefault(prop, set()).add(value)
 
     @property
     def read(self) -> Set[Union[SubQuery, Table]]:
@@ -68,6 +134,19 @@ class SubQueryLineageHolder(ColumnLineageMixin):
         # the same table can be added (in SQL: joined) multiple times with different alias
         if hasattr(value, "alias"):
             self.graph.add_edge(value, value.alias, type=EdgeType.HAS_ALIAS)
+            self._aliases.setdefault(self._nodes[value], {})[value.alias] = None
+
+    def get_alias_mapping(
+        self, datasets: Iterable[Union[Path, Table, SubQuery]]
+    ) -> Dict[str, Union[Path, Table, SubQuery]]:
+        """
+        Map each alias of the given datasets, as they're read with :meth:`add_read`, to the dataset.
+        """
+        return {
+            alias: node
+            for node in dict.fromkeys(self._nodes.get(d, d) for d in datasets)
+            for alias in self._aliases.get(node, ())
+        }
 
     @property
     def write(self) -> Set[Union[SubQuery, Table]]:
@@ -101,13 +180,24 @@ class StatementLineageHolder(SubQueryLineageHolder, ColumnLineageMixin):
 
     For rename, it a Set[Tuple[:class:`sqllineage.models.Table`, :class:`sqllineage.models.Table`]], with the first
     table being original table before renaming and the latter after renaming.
+
+    When the statement is beyond its budget, degraded tells the reason. It holds table lineage only, or nothing at all
+    if skipped, see :class:`sqllineage.core.budget.StatementBudget`.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.degraded: Optional[str] = None
+        self.skipped = False
+
     def __str__(self):
-        return "\n".join(
+        result = "\n".join(
             f"table {attr}: {sorted(getattr(self, attr), key=lambda x: str(x)) if getattr(self, attr) else '[]'}"
             for attr in ["read", "write", "cte", "drop", "rename"]
         )
+        if self.degraded is not None:
+            result += f"\n{'skipped' if self.skipped else 'degraded'}: {self.degraded}"
+        return result
 
     def __repr__(self):
         return str(self)
@@ -139,87 +229,298 @@ class StatementLineageHolder(SubQueryLineageHolder, ColumnLineageMixin):
         self.graph.add_edge(src, tgt, type=EdgeType.RENAME)
 
     @staticmethod
-    def of(holder: SubQueryLineageHolder):
+    def of(holder: SubQueryLineageHolder) -> "StatementLineageHolder":
         stmt_holder = StatementLineageHolder()
-        stmt_holder.graph = holder.graph
+        stmt_holder._graph, stmt_holder._tags = holder.graph, holder._tags
+        stmt_holder._nodes, stmt_holder._aliases = holder._nodes, holder._aliases
         return stmt_holder
 
 
 class SQLLineageHolder(ColumnLineageMixin):
-    def __init__(self, graph: DiGraph):
+    def __init__(self, graph: Union[DiGraph, CompactDiGraph, None] = None):
         """
         The combined lineage result in representation of Directed Acyclic Graph.
 
-        :param graph: the Directed Acyclic Graph holding all the combined lineage result.
+        :param graph: the Directed Acyclic Graph holding all the combined lineage result. Start with an empty graph
+            if not given, and statements can be added one by one with :meth:`add_statement`. Pass in an empty
+            :class:`sqllineage.core.graph.CompactDiGraph` to hold large lineage in less memory.
+        """
+        # computed on first access, and invalidated when more statements are added
+        self._finalized_graph: Union[DiGraph, CompactDiGraph, None] = None
+        self._table_lineage_graph: Optional[DiGraph] = None
+        self._column_lineage_graph: Optional[DiGraph] = None
+        self._table_classification: Optional[
+            Tuple[Set[Table], Set[Table], Set[Table]]
+        ] = None
+        self.graph = graph if graph is not None else DiGraph()
+
+    @property
+    def graph(self) -> Union[DiGraph, CompactDiGraph]:
+        """
+        The combined DiGraph, with self-loop tables tagged and ambiguous columns resolved against all the statements
+        added so far. It's computed on first access after statements are added. It's of the same type as the graph
+        passed in, :attr:`table_lineage_graph` and :attr:`column_lineage_graph` are always networkx.DiGraph.
+
+        This and all the views below are cached until more statements are added, they're shared by all the callers and
+        should be treated as read-only. Assigning a graph replaces the combined result, the same as passing it in on
+        initialization.
         """
-        self.graph = graph
-        self._selfloop_tables = self.__retrieve_tag_tables(NodeTag.SELFLOOP)
-        self._sourceonly_tables = self.__retrieve_tag_tables(NodeTag.SOURCE_ONLY)
-        self._targetonly_tables = self.__retrieve_tag_tables(NodeTag.TARGET_ONLY)
+        if self._finalized_graph is None:
+            self._finalized_graph = self._finalize(
+                self._restore_node_order(),
+                self._ambiguous_columns,
+                self._column_names,
+            )
+        return self._finalized_graph
+
+    @graph.setter
+    def graph(self, graph: Union[DiGraph, CompactDiGraph]) -> None:
+        self._graph = graph
+        # node order of networkx.DiGraph, tracked only after nodes are relabeled in place, see _relabel_node
+        self._node_rank: Optional[Dict[Any, int]] = None
+        self._next_rank = 0
+        # columns with multiple parent candidates, in the order they're added to the graph. They're identified by
+        # column name alone, so the same node is shared by all the statements selecting an ambiguous column by name
+        self._ambiguous_columns: Dict[Column, None] = {}
+        # string representation of the columns each parent, i.e. Table, SubQuery or Path, has an edge to
+        self._column_names: Dict[Any, Set[str]] = {}
+        self._index_columns(graph, graph)
+        self._invalidate()
 
     @property
     def table_lineage_graph(self) -> DiGraph:
         """
         The table level DiGraph held by SQLLineageHolder
         """
-        table_nodes = [n for n in self.graph.nodes if isinstance(n, DATASET_CLASSES)]
-        return self.graph.subgraph(table_nodes)
+        if self._table_lineage_graph is None:
+            table_nodes = [
+                n for n in self.graph.nodes if isinstance(n, DATASET_CLASSES)
+            ]
+            self._table_lineage_graph = self.graph.subgraph(table_nodes)
+        return self._table_lineage_graph
 
     @property
     def column_lineage_graph(self) -> DiGraph:
         """
         The column level DiGraph held by SQLLineageHolder
         """
-        column_nodes = [n for n in self.graph.nodes if isinstance(n, Column)]
-        return self.graph.subgraph(column_nodes)
+        if self._column_lineage_graph is None:
+            column_nodes = [n for n in self.graph.nodes if isinstance(n, Column)]
+            self._column_lineage_graph = self.graph.subgraph(column_nodes)
+        return self._column_lineage_graph
 
     @property
     def source_tables(self) -> Set[Table]:
         """
         a list of source :class:`sqllineage.models.Table`
         """
-        source_tables = {
-            table for table, deg in self.table_lineage_graph.in_degree if deg == 0
-        }.intersection(
-            {table for table, deg in self.table_lineage_graph.out_degree if deg > 0}
-        )
-        source_tables |= self._selfloop_tables
-        source_tables |= self._sourceonly_tables
-        return source_tables
+        return self._classify_tables()[0]
 
     @property
     def target_tables(self) -> Set[Table]:
         """
         a list of target :class:`sqllineage.models.Table`
         """
-        target_tables = {
-            table for table, deg in self.table_lineage_graph.out_degree if deg == 0
-        }.intersection(
-            {table for table, deg in self.table_lineage_graph.in_degree if deg > 0}
-        )
-        target_tables |= self._selfloop_tables
-        target_tables |= self._targetonly_tables
-        return target_tables
+        return self._classify_tables()[1]
 
     @property
     def intermediate_tables(self) -> Set[Table]:
         """
         a list of intermediate :class:`sqllineage.models.Table`
         """
-        intermediate_tables = {
-            table for table, deg in self.table_lineage_graph.in_degree if deg > 0
-        }.intersection(
-            {table for table, deg in self.table_lineage_graph.out_degree if deg > 0}
-        )
-        intermediate_tables -= self.__retrieve_tag_tables(NodeTag.SELFLOOP)
-        return intermediate_tables
+        return self._classify_tables()[2]
 
-    def __retrieve_tag_tables(self, tag) -> Set[Union[Path, Table]]:
-        return {
-            table
-            for table, attr in self.graph.nodes(data=True)
-            if attr.get(tag) is True and isinstance(table, DATASET_CLASSES)
-        }
+    def _classify_tables(self) -> Tuple[Set[Table], Set[Table], Set[Table]]:
+        """
+        source, target and intermediate tables, classified together in one pass of table lineage graph.
+        """
+        if self._table_classification is not None:
+            return self._table_classification
+        g = self.table_lineage_graph
+        source_tables, target_tables, intermediate_tables = set(), set(), set()
+        for table, attr in g.nodes(data=True):
+            in_degree, out_degree = g.in_degree[table], g.out_degree[table]
+            if attr.get(NodeTag.SELFLOOP) is True:
+                source_tables.add(table)
+                target_tables.add(table)
+                continue
+            if (in_degree == 0 and out_degree > 0) or attr.get(NodeTag.SOURCE_ONLY):
+                source_tables.add(table)
+            if (in_degree > 0 and out_degree == 0) or attr.get(NodeTag.TARGET_ONLY):
+                target_tables.add(table)
+            if in_degree > 0 and out_degree > 0:
+                intermediate_tables.add(table)
+        classification = source_tables, target_tables, intermediate_tables
+        self._table_classification = classification
+        return classification
+
+    def add_statement(self, holder: StatementLineageHolder) -> None:
+        """
+        To add one more :class:`sqllineage.holders.StatementLineageHolder` in place. The accumulated graph is updated
+        without being copied, so that adding N statements one by one costs linear time.
+        """
+        g = self._graph
+        self._index_columns(holder.graph, [n for n in holder.graph if n not in g])
+        g.update(holder.graph)
+        if self._node_rank is not None:
+            for node in holder.graph:
+                if node not in self._node_rank:
+                    self._node_rank[node] = self._next_rank
+                    self._next_rank += 1
+        if holder.drop:
+            for table in holder.drop:
+                if g.has_node(table) and g.degree[table] == 0:
+                    self._remove_node(table)
+        elif holder.rename:
+            for (table_old, table_new) in holder.rename:
+                if isinstance(g, CompactDiGraph):
+                    g.relabel_nodes({table_old: table_new})
+                else:
+                    self._relabel_node(g, table_old, table_new)
+                if table_old in self._column_names:
+                    self._column_names.setdefault(table_new, set()).update(
+                        self._column_names.pop(table_old)
+                    )
+                g.remove_edge(table_new, table_new)
+                if g.degree[table_new] == 0:
+                    self._remove_node(table_new)
+        else:
+            read, write = holder.read, holder.write
+            if len(read) > 0 and len(write) == 0:
+                # source only table comes from SELECT statement
+                g.add_nodes_from(read, **{NodeTag.SOURCE_ONLY: True})
+            elif len(read) == 0 and len(write) > 0:
+                # target only table comes from case like: 1) INSERT/UPDATE constant values; 2) CREATE TABLE
+                g.add_nodes_from(write, **{NodeTag.TARGET_ONLY: True})
+            else:
+                g.add_nodes_from(read)
+                g.add_nodes_from(write)
+                for source, target in itertools.product(read, write):
+                    g.add_edge(source, target, type=EdgeType.LINEAGE)
+        self._invalidate()
+
+    def _relabel_node(self, g: DiGraph, old: Any, new: Any) -> None:
+        """
+        Relabel a node of networkx.DiGraph in place, with the same result as networkx.relabel_nodes(g, {old: new})
+        making a copy, in time proportional to the degree of the two nodes instead of the size of the whole graph.
+
+        A copy places the new node where the first of the two comes in node order, with attributes of the last one,
+        while a node relabeled in place goes to the end. So node order is tracked by rank from the first rename on,
+        and restored before the graph is read.
+        """
+        if old == new or old not in g:
+            return
+        if self._node_rank is None:
+            self._node_rank = {node: i for i, node in enumerate(g)}
+            self._next_rank = len(self._node_rank)
+        rank = self._node_rank
+        old_rank = rank.pop(old)
+        # when both exist, node attributes and conflicting edge attributes of the last one win
+        old_wins = new not in g or old_rank > rank[new]
+        attr = dict(g.nodes[old] if old_wins else g.nodes[new])
+        rank[new] = old_rank if new not in g else min(old_rank, rank[new])
+        edges = [
+            (new, new if tgt == old else tgt, data)
+            for _, tgt, data in g.out_edges(old, data=True)
+        ] + [
+            (src, new, data)
+            for src, _, data in g.in_edges(old, data=True)
+            if src != old
+        ]
+        g.remove_node(old)
+        g.add_node(new)
+        g.nodes[new].clear()
+        g.nodes[new].update(attr)
+        for src, tgt, data in edges:
+            if old_wins or not g.has_edge(src, tgt):
+                g.add_edge(src, tgt, **data)
+
+    def _index_columns(
+        self, graph: Union[DiGraph, CompactDiGraph], new_nodes: Iterable[Any]
+    ) -> None:
+        """
+        Index the columns of graph under their parent, and the ambiguous ones among new_nodes, i.e. nodes that are to
+        be added to the accumulated graph.
+        """
+        for node in new_nodes:
+            if isinstance(node, Column) and len(node.parent_candidates) > 1:
+                self._ambiguous_columns[node] = None
+        for parent, column in graph.edges:
+            if isinstance(column, Column) and not isinstance(parent, Column):
+                self._column_names.setdefault(parent, set()).add(str(column))
+
+    def _restore_node_order(self) -> Union[DiGraph, CompactDiGraph]:
+        """
+        The accumulated graph, rebuilt in the node order tracked by rank if nodes have been relabeled in place.
+        """
+        graph = self._graph
+        if self._node_rank is not None and not isinstance(graph, CompactDiGraph):
+            g = DiGraph()
+            nodes = sorted(graph.nodes, key=self._node_rank.__getitem__)
+            g.add_nodes_from((node, graph.nodes[node]) for node in nodes)
+            g.add_edges_from(
+                (src, tgt, data)
+                for src in nodes
+                for tgt, data in graph.succ[src].items()
+            )
+            self._graph, self._node_rank = g, None
+        return self._graph
+
+    def _remove_node(self, node: Any) -> None:
+        self._graph.remove_node(node)
+        if self._node_rank is not None:
+            del self._node_rank[node]
+
+    def _invalidate(self) -> None:
+        """
+        drop the finalized graph and all the views computed from it, so that they're computed again on next access.
+        """
+        self._finalized_graph = None
+        self._table_lineage_graph = None
+        self._column_lineage_graph = None
+        self._table_classification = None
+
+    @staticmethod
+    def _finalize(
+        graph: Union[DiGraph, CompactDiGraph],
+        ambiguous_columns: Iterable[Column],
+        column_names: Dict[Any, Set[str]],
+    ) -> Union[DiGraph, CompactDiGraph]:
+        """
+        Tag self-loop tables and resolve ambiguous columns on a copy, as the result depends on all the statements.
+        The accumulated graph is kept intact for more statements to come.
+        """
+        g = graph.copy()
+        selfloop_edges = (
+            g.selfloop_edges()
+            if isinstance(g, CompactDiGraph)
+            else nx.selfloop_edges(g)
+        )
+        for table in {e[0] for e in selfloop_edges}:
+            g.nodes[table][NodeTag.SELFLOOP] = True
+        unresolved_cols = [col for col in ambiguous_columns if col in g]
+        for unresolved_col in unresolved_cols:
+            # check if there's only one parent candidate contains the column with same name. It's the same for all
+            # the lineage from this column, as parent candidates are fixed when the column node is added
+            src_col = Column(unresolved_col.raw_name)
+            name = src_col.raw_name.lower()
+            parents = [
+                parent
+                for parent in unresolved_col.parent_candidates
+                # the same as str(src_col) with parent set, see Column.__str__
+                if (name if isinstance(parent, Path) else f"{parent}.{name}")
+                in column_names.get(parent, ())
+            ]
+            if len(parents) == 1:
+                src_col.parent = parents[0]
+                for tgt_col in list(g.successors(unresolved_col)):
+                    g.add_edge(src_col, tgt_col, type=EdgeType.LINEAGE)
+                    g.remove_edge(unresolved_col, tgt_col)
+        # when unresolved column got resolved, it will be orphan node, and we can remove it
+        for node in unresolved_cols:
+            if g.degree[node] == 0:
+                g.remove_node(node)
+        return g
 
     @staticmethod
     def of(*args: StatementLineageHolder):
@@ -227,53 +528,7 @@ class SQLLineageHolder(ColumnLineageMixin):
         To assemble multiple :class:`sqllineage.holders.StatementLineageHolder` into
         :class:`sqllineage.holders.SQLLineageHolder`
         """
-        g = DiGraph()
+        sql_holder = SQLLineageHolder()
         for holder in args:
-            g = nx.compose(g, holder.graph)
-            if holder.drop:
-                for table in holder.drop:
-                    if g.has_node(table) and g.degree[table] == 0:
-                        g.remove_node(table)
-            elif holder.rename:
-                for (table_old, table_new) in holder.rename:
-                    g = nx.relabel_nodes(g, {table_old: table_new})
-                    g.remove_edge(table_new, table_new)
-                    if g.degree[table_new] == 0:
-                        g.remove_node(table_new)
-            else:
-                read, write = holder.read, holder.write
-                if len(read) > 0 and len(write) == 0:
-                    # source only table comes from SELECT statement
-                    g.add_nodes_from(read, **{NodeTag.SOURCE_ONLY: True})
-                elif len(read) == 0 and len(write) > 0:
-                    # target only table comes from case like: 1) INSERT/UPDATE constant values; 2) CREATE TABLE
-                    g.add_nodes_from(write, **{NodeTag.TARGET_ONLY: True})
-                else:
-                    g.add_nodes_from(read)
-                    g.add_nodes_from(write)
-                    for source, target in itertools.product(read, write):
-                        g.add_edge(source, target, type=EdgeType.LINEAGE)
-        for table in {e[0] for e in nx.selfloop_edges(g)}:
-            g.nodes[table][NodeTag.SELFLOOP] = True
-        # find all the columns that we can't assign accurately to a parent table (with multiple parent candidates)
-        unresolved_cols = [
-            (s, t)
-            for s, t in g.edges
-            if isinstance(s, Column) and len(s.parent_candidates) > 1
-        ]
-        for unresolved_col, tgt_col in unresolved_cols:
-            # check if there's only one parent candidate contains the column with same name
-            src_cols = []
-            for parent in unresolved_col.parent_candidates:
-                src_col = Column(unresolved_col.raw_name)
-                src_col.parent = parent
-                if g.has_edge(parent, src_col):
-                    src_cols.append(src_col)
-            if len(src_cols) == 1:
-                g.add_edge(src_cols[0], tgt_col, type=EdgeType.LINEAGE)
-                g.remove_edge(unresolved_col, tgt_col)
-        # when unresolved column got resolved, it will be orphan node, and we can remove it
-        for node in [n for n, deg in g.degree if deg == 0]:
-            if isinstance(node, Column) and len(node.parent_candidates) > 1:
-                g.remove_node(node)
-        return SQLLineageHolder(g)
+            sql_holder.add_statement(holder)
+        return sql_holder
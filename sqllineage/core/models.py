@@ -1,5 +1,7 @@
+import hashlib
 import warnings
-from typing import Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from weakref import WeakValueDictionary
 
 from sqlparse import tokens as T
 from sqlparse.engine import grouping
@@ -24,6 +26,7 @@ from sqllineage.utils.sqlparse import get_parameters, is_subquery
 
 
 class Schema:
+    __slots__ = ("raw_name", "_key", "_hash")
     unknown = "<default>"
 
     def __init__(self, name: str = unknown):
@@ -33,24 +36,41 @@ class Schema:
         :param name: schema name
         """
         self.raw_name = escape_identifier_name(name)
+        self._key = self.raw_name.lower()
+        self._hash = hash(self._key)
 
     def __str__(self):
-        return self.raw_name.lower()
+        return self._key
 
     def __repr__(self):
         return "Schema: " + str(self)
 
     def __eq__(self, other):
-        return type(self) is type(other) and str(self) == str(other)
+        return self is other or (type(self) is type(other) and self._key == other._key)
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __bool__(self):
-        return str(self) != self.unknown
+        return self._key != self.unknown
+
+    def __getstate__(self):
+        # hash of str is randomized per process, recompute it when unpickled, e.g. in another process
+        return self.raw_name
+
+    def __setstate__(self, state: str) -> None:
+        self.raw_name = state
+        self._key = self.raw_name.lower()
+        self._hash = hash(self._key)
 
 
 class Table:
+    __slots__ = ("schema", "raw_name", "alias", "_key", "_hash", "__weakref__")
+    # tables parsed from SQL are interned, so that the same table referred to everywhere shares one instance
+    _interned: "WeakValueDictionary[Tuple[str, str, str], Table]" = (
+        WeakValueDictionary()
+    )
+
     def __init__(self, name: str, schema: Schema = Schema(), **kwargs):
         """
         Data Class for Table
@@ -71,18 +91,38 @@ class Table:
             if schema:
                 warnings.warn("Name is in schema.table format, schema param is ignored")
         self.alias = kwargs.pop("alias", self.raw_name)
+        self._key = f"{self.schema}.{self.raw_name.lower()}"
+        self._hash = hash(self._key)
 
     def __str__(self):
-        return f"{self.schema}.{self.raw_name.lower()}"
+        return self._key
 
     def __repr__(self):
         return "Table: " + str(self)
 
     def __eq__(self, other):
-        return type(self) is type(other) and str(self) == str(other)
+        return self is other or (type(self) is type(other) and self._key == other._key)
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
+
+    @classmethod
+    def intern(cls, table: "Table") -> "Table":
+        """
+        return the interned instance with exactly the same names and alias as table, or intern table itself if there's
+        none yet.
+        """
+        key = (table.schema.raw_name, table.raw_name, table.alias)
+        return cls._interned.setdefault(key, table)
+
+    def __getstate__(self):
+        # hash of str is randomized per process, recompute it when unpickled, e.g. in another process
+        return self.schema, self.raw_name, self.alias
+
+    def __setstate__(self, state: Tuple[Schema, str, str]) -> None:
+        self.schema, self.raw_name, self.alias = state
+        self._key = f"{self.schema}.{self.raw_name.lower()}"
+        self._hash = hash(self._key)
 
     @staticmethod
     def of(identifier: Identifier) -> "Table":
@@ -108,7 +148,7 @@ class Table:
         schema = Schema(parent_name) if parent_name is not None else Schema()
         alias = identifier.get_alias()
         kwargs = {"alias": alias} if alias else {}
-        return Table(real_name, schema, **kwargs)
+        return Table.intern(Table(real_name, schema, **kwargs))
 
 
 class Path:
@@ -141,7 +181,10 @@ class SubQuery:
         :param alias: subquery name
         """
         self.token = token
-        self._query = token.value
+        # subquery is identified by its text, which is kept as a fixed size digest instead of the text itself
+        self._digest = hashlib.blake2b(
+            token.value.encode("utf-8"), digest_size=16
+        ).hexdigest()
         self.alias = alias if alias is not None else f"subquery_{hash(self)}"
 
     def __str__(self):
@@ -151,10 +194,16 @@ class SubQuery:
         return "SubQuery: " + str(self)
 
     def __eq__(self, other):
-        return type(self) is type(other) and self._query == other._query
+        return type(self) is type(other) and self._digest == other._digest
 
     def __hash__(self):
-        return hash(self._query)
+        return hash(self._digest)
+
+    def __getstate__(self):
+        # the parse tree is only needed during analysis, leave it behind when pickled, e.g. sent across processes
+        state = self.__dict__.copy()
+        state["token"] = None
+        return state
 
     @staticmethod
     def of(parenthesis: Parenthesis, alias: Optional[str]) -> "SubQuery":
@@ -162,6 +211,15 @@ class SubQuery:
 
 
 class Column:
+    __slots__ = (
+        "_parent",
+        "_parent_candidates",
+        "raw_name",
+        "source_columns",
+        "_key",
+        "_hash",
+    )
+
     def __init__(self, name: str, **kwargs):
         """
         Data Class for Column
@@ -170,40 +228,71 @@ class Column:
         :param parent: :class:`Table` or :class:`SubQuery`
         :param kwargs:
         """
-        self._parent: Set[Union[Table, SubQuery]] = set()
+        # the resolved parent, only when there's exactly one candidate
+        self._parent: Optional[Union[Table, SubQuery]] = None
+        # all the possible parents, kept sorted by string representation
+        self._parent_candidates: Tuple[Union[Table, SubQuery], ...] = ()
         self.raw_name = escape_identifier_name(name)
         self.source_columns = kwargs.pop("source_columns", ((self.raw_name, None),))
+        self._key: Optional[str] = None
+        self._hash: Optional[int] = None
 
     def __str__(self):
-        return (
-            f"{self.parent}.{self.raw_name.lower()}"
-            if self.parent is not None and not isinstance(self.parent, Path)
-            else f"{self.raw_name.lower()}"
-        )
+        if self._key is None:
+            self._key = (
+                f"{self._parent}.{self.raw_name.lower()}"
+                if self._parent is not None and not isinstance(self._parent, Path)
+                else f"{self.raw_name.lower()}"
+            )
+        return self._key
 
     def __repr__(self):
         return "Column: " + str(self)
 
     def __eq__(self, other):
-        return type(self) is type(other) and str(self) == str(other)
+        return self is other or (type(self) is type(other) and str(self) == str(other))
 
     def __hash__(self):
-        return hash(str(self))
+        if self._hash is None:
+            self._hash = hash(str(self))
+        return self._hash
 
     @property
     def parent(self) -> Optional[Union[Table, SubQuery]]:
-        return list(self._parent)[0] if len(self._parent) == 1 else None
+        return self._parent
 
     @parent.setter
     def parent(self, value: Union[Table, SubQuery]):
-        self._parent.add(value)
+        if value in self._parent_candidates:
+            return
+        self._parent_candidates = tuple(
+            sorted(self._parent_candidates + (value,), key=lambda p: str(p))
+        )
+        self._parent = value if len(self._parent_candidates) == 1 else None
+        # string representation depends on parent, invalidate the cached one
+        self._key = None
+        self._hash = None
+
+    def __getstate__(self):
+        # hash of str is randomized per process, recompute it when unpickled, e.g. in another process
+        return self._parent_candidates, self.raw_name, self.source_columns
+
+    def __setstate__(
+        self, state: Tuple[Tuple[Union[Table, SubQuery], ...], str, Any]
+    ) -> None:
+        self._parent_candidates, self.raw_name, self.source_columns = state
+        self._parent = (
+            self._parent_candidates[0] if len(self._parent_candidates) == 1 else None
+        )
+        self._key = None
+        self._hash = None
 
     @property
-    def parent_candidates(self) -> List[Union[Table, SubQuery]]:
-        return sorted(self._parent, key=lambda p: str(p))
+    def parent_candidates(self) -> Tuple[Union[Table, SubQuery], ...]:
+        return self._parent_candidates
 
     @staticmethod
-    def of(token: Token):
+    def of(token: Token, deadline: Optional[float] = None):
         if isinstance(token, Identifier):
             alias = token.get_alias()
             if alias:
@@ -217,8 +306,12 @@ class Column:
                     return Column(alias)
                 else:
                     idx, _ = token.token_prev(kw_idx, skip_cm=True)
-                    expr = grouping.group(TokenList(token.tokens[: idx + 1]))[0]
-                    source_columns = Column._extract_source_columns(expr)
+                    if idx == 0 and isinstance(token.tokens[0], TokenList):
+                        # Case, Function, Parenthesis and so on, which is already grouped
+                        expr = token.tokens[0]
+                    else:
+                        expr = grouping.group(TokenList(token.tokens[: idx + 1]))[0]
+                    source_columns = Column._extract_source_columns(expr, deadline)
                     return Column(alias, source_columns=source_columns)
             else:
                 # select column name directly without alias
@@ -228,27 +321,31 @@ class Column:
                 )
         else:
             # Wildcard, Case, Function without alias (thus not recognized as an Identifier)
-            source_columns = Column._extract_source_columns(token)
+            source_columns = Column._extract_source_columns(token, deadline)
             return Column(token.value, source_columns=source_columns)
 
     @staticmethod
-    def _extract_source_columns(token: Token) -> List[ColumnQualifierTuple]:
+    def _extract_source_columns(
+        token: Token, deadline: Optional[float] = None
+    ) -> List[ColumnQualifierTuple]:
         if isinstance(token, Function):
             # max(col1) AS col2
             source_columns = [
                 cqt
                 for tk in get_parameters(token)
-                for cqt in Column._extract_source_columns(tk)
+                for cqt in Column._extract_source_columns(tk, deadline)
             ]
         elif isinstance(token, Parenthesis):
             if is_subquery(token):
                 # This is to avoid circular import
-                from sqllineage.runner import LineageRunner
+                from sqllineage.core.analyzer import LineageAnalyzer
+                from sqllineage.core.holders import SQLLineageHolder
 
                 # (SELECT avg(col1) AS col1 FROM tab3), used after WHEN or THEN in CASE clause
+                holder = LineageAnalyzer().analyze_subquery(token, deadline)
                 src_cols = [
                     lineage[0]
-                    for lineage in LineageRunner(token.value).get_column_lineage(
+                    for lineage in SQLLineageHolder.of(holder).get_column_lineage(
                         exclude_subquery=False
                     )
                 ]
@@ -261,31 +358,31 @@ class Column:
                 source_columns = [
                     cqt
                     for tk in token.tokens[1:-1]
-                    for cqt in Column._extract_source_columns(tk)
+                    for cqt in Column._extract_source_columns(tk, deadline)
                 ]
         elif isinstance(token, Operation):
             # col1 + col2 AS col3
             source_columns = [
                 cqt
                 for tk in token.get_sublists()
-                for cqt in Column._extract_source_columns(tk)
+                for cqt in Column._extract_source_columns(tk, deadline)
             ]
         elif isinstance(token, Case):
             # CASE WHEN col1 = 2 THEN "V1" WHEN col1 = "2" THEN "V2" END AS col2
             source_columns = [
                 cqt
                 for tk in token.get_sublists()
-                for cqt in Column._extract_source_columns(tk)
+                for cqt in Column._extract_source_columns(tk, deadline)
             ]
         elif isinstance(token, Comparison):
             source_columns = Column._extract_source_columns(
-                token.left
-            ) + Column._extract_source_columns(token.right)
+                token.left, deadline
+            ) + Column._extract_source_columns(token.right, deadline)
         elif isinstance(token, IdentifierList):
             source_columns = [
                 cqt
                 for tk in token.get_sublists()
-                for cqt in Column._extract_source_columns(tk)
+                for cqt in Column._extract_source_columns(tk, deadline)
             ]
         elif isinstance(token, Identifier):
             real_name = token.get_real_name()
@@ -306,7 +403,7 @@ class Column:
                 source_columns = [
                     cqt
                     for tk in token.get_sublists()
-                    for cqt in Column._extract_source_columns(tk)
+                    for cqt in Column._extract_source_columns(tk, deadline)
                 ]
             else:
                 # col1 AS col2
@@ -1,2 +1,6 @@
 class SQLLineageException(Exception):
     """Base Exception for SQLLineage"""
+
+
+class BudgetExceeded(SQLLineageException):
+    """Raised when analyzing a statement takes longer than its time budget"""
@@ -1,7 +1,26 @@
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, List, Tuple, Union
 
 from networkx import DiGraph
 
+from sqllineage.core.holders import SQLLineageHolder, StatementLineageHolder
+from sqllineage.core.models import Column, Path, Schema, SubQuery, Table
+from sqllineage.exceptions import SQLLineageException
+from sqllineage.utils.constant import EdgeType, NodeTag
+
+WIRE_FORMAT_VERSION = 1
+# bit position of each node tag in tag bitmask, only to be appended to keep the format compatible
+WIRE_NODE_TAGS = (
+    NodeTag.READ,
+    NodeTag.WRITE,
+    NodeTag.CTE,
+    NodeTag.DROP,
+    NodeTag.SOURCE_ONLY,
+    NodeTag.TARGET_ONLY,
+    NodeTag.SELFLOOP,
+)
+_TABLE, _PATH, _SUBQUERY, _COLUMN = range(4)
+
 
 def to_cytoscape(graph: DiGraph, compound=False) -> List[Dict[str, Dict[str, Any]]]:
     """
@@ -43,3 +62,156 @@ def to_cytoscape(graph: DiGraph, compound=False) -> List[Dict[str, Dict[str, Any
         for i, edge in enumerate(graph.edges)
     ]
     return nodes + edges
+
+
+def dumps(holder: Union[StatementLineageHolder, SQLLineageHolder]) -> bytes:
+    """
+    serialize lineage holder into a compact wire format, which is JSON made up of:
+
+    - nodes: a table of all the nodes, and the parent candidates of column nodes, each written out once. Table,
+      Path, SubQuery and Column are lists starting with a kind number, while alias nodes are plain strings.
+    - size: the number of leading entries in node table that are nodes of the graph
+    - tags: bitmask of node tags for each graph node, with bit position defined by WIRE_NODE_TAGS
+    - edges: a flat list of integers, every three of which are source node index, target node index and edge type
+
+    StatementLineageHolder degraded by budget has degraded reason, and skipped flag if so, in addition.
+
+    Neither parse tree nor SQL text is included, and there's nothing referring to sqlparse. SQLLineageHolder is
+    serialized with statements combined, ambiguous columns are resolved again after it's loaded back.
+    """
+    if isinstance(holder, SQLLineageHolder):
+        holder_type, graph = "sql", holder._restore_node_order()
+    else:
+        holder_type, graph = "statement", holder.graph
+    index = {node: i for i, node in enumerate(graph.nodes)}
+    entries: List[Any] = [
+        None if isinstance(node, Column) else _encode_node(node) for node in graph.nodes
+    ]
+    # parent candidates are interned by what's written out instead of equality, as SubQuery with the same text but
+    # different alias are equal, while column names differ by the alias
+    interned = {
+        _entry_key(entry): i for i, entry in enumerate(entries) if entry is not None
+    }
+    for i, node in enumerate(graph.nodes):
+        if isinstance(node, Column):
+            parents = []
+            for parent in node.parent_candidates:
+                entry = _encode_node(parent)
+                key = _entry_key(entry)
+                if key not in interned:
+                    interned[key] = len(entries)
+                    entries.append(entry)
+                parents.append(interned[key])
+            entries[i] = [_COLUMN, node.raw_name] + parents
+    tag_bits = {tag: 1 << i for i, tag in enumerate(WIRE_NODE_TAGS)}
+    edges: List[int] = []
+    for src, tgt, edge_type in graph.edges(data="type"):
+        edges += (index[src], index[tgt], edge_type.value)
+    wire = {
+        "version": WIRE_FORMAT_VERSION,
+        "holder": holder_type,
+        "nodes": entries,
+        "size": len(index),
+        "tags": [
+            sum(tag_bits[tag] for tag, value in attr.items() if value is True)
+            for _, attr in graph.nodes(data=True)
+        ],
+        "edges": edges,
+    }
+    if isinstance(holder, StatementLineageHolder) and holder.degraded is not None:
+        wire["degraded"] = holder.degraded
+        if holder.skipped:
+            wire["skipped"] = True
+    return json.dumps(wire, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Union[StatementLineageHolder, SQLLineageHolder]:
+    """
+    deserialize lineage holder from the wire format written by :func:`dumps`.
+    """
+    wire = json.loads(data)
+    if wire.get("version") != WIRE_FORMAT_VERSION:
+        raise SQLLineageException(
+            "Unsupported wire format version: %s" % wire.get("version")
+        )
+    entries = wire["nodes"]
+    nodes: List[Any] = [None] * len(entries)
+    # columns refer to parents by index, decode them after all the others
+    for i, entry in enumerate(entries):
+        if isinstance(entry, str):
+            nodes[i] = entry
+        elif entry[0] != _COLUMN:
+            nodes[i] = _decode_node(entry, nodes)
+    for i, entry in enumerate(entries):
+        if nodes[i] is None:
+            nodes[i] = _decode_node(entry, nodes)
+    graph = DiGraph()
+    for node, tags in zip(nodes[: wire["size"]], wire["tags"]):
+        graph.add_node(
+            node,
+            **{tag: True for i, tag in enumerate(WIRE_NODE_TAGS) if tags & (1 << i)},
+        )
+    edges = wire["edges"]
+    for i in range(0, len(edges), 3):
+        graph.add_edge(
+            nodes[edges[i]], nodes[edges[i + 1]], type=EdgeType(edges[i + 2])
+        )
+    if wire["holder"] == "sql":
+        return SQLLineageHolder(graph)
+    else:
+        holder = StatementLineageHolder()
+        holder.graph = graph
+        holder.degraded = wire.get("degraded")
+        holder.skipped = wire.get("skipped", False)
+        return holder
+
+
+def _entry_key(entry: Union[str, List[Any]]) -> Union[str, Tuple[Any, ...]]:
+    return entry if isinstance(entry, str) else tuple(entry)
+
+
+def _encode_node(node: Any) -> Union[str, List[Any]]:
+    """
+    encode all kinds of nodes except Column, whose parent candidates are encoded as index of node table.
+    """
+    if isinstance(node, Table):
+        entry = [_TABLE, node.schema.raw_name, node.raw_name]
+        if node.alias != node.raw_name:
+            entry.append(node.alias)
+        return entry
+    elif isinstance(node, Path):
+        return [_PATH, node.uri]
+    elif isinstance(node, SubQuery):
+        return [_SUBQUERY, node.alias, node._digest]
+    elif isinstance(node, str):
+        # alias of table or subquery
+        return node
+    else:
+        raise SQLLineageException("Unsupported node type: %s" % type(node).__name__)
+
+
+def _decode_node(entry: List[Any], nodes: List[Any]) -> Any:
+    # objects are restored the same way as pickle does, instead of calling __init__ which parses the names again
+    kind = entry[0]
+    if kind == _TABLE:
+        schema = Schema.__new__(Schema)
+        schema.__setstate__(entry[1])
+        table = Table.__new__(Table)
+        table.__setstate__((schema, entry[2], entry[3] if len(entry) > 3 else entry[2]))
+        return Table.intern(table)
+    elif kind == _PATH:
+        path = Path.__new__(Path)
+        path.uri = entry[1]
+        return path
+    elif kind == _SUBQUERY:
+        subquery = SubQuery.__new__(SubQuery)
+        subquery.token = None
+        subquery.alias, subquery._digest = entry[1], entry[2]
+        return subquery
+    elif kind == _COLUMN:
+        column = Column.__new__(Column)
+        parents = tuple(nodes[i] for i in entry[2:])
+        column.__setstate__((parents, entry[1], ((entry[1], None),)))
+        return column
+    else:
+        raise SQLLineageException("Unsupported node kind: %s" % kind)
@@ -1,19 +1,56 @@
 import logging
-from typing import Dict, List, Tuple
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import (
+    Any,
+    Counter as CounterType,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import sqlparse
+from networkx import DiGraph
 from sqlparse.sql import Statement
 
+from sqllineage.cache import (
+    DiskLineageCache,
+    LineageCache,
+    get_default_cache,
+    normalize_statement,
+)
 from sqllineage.core import LineageAnalyzer
-from sqllineage.core.holders import SQLLineageHolder
+from sqllineage.core.budget import DegradedStatement, StatementBudget
+from sqllineage.core.fast_analyzer import FastLineageAnalyzer
+from sqllineage.core.graph import new_graph
+from sqllineage.core.holders import SQLLineageHolder, StatementLineageHolder
 from sqllineage.core.models import Column, Table
 from sqllineage.drawing import draw_lineage_graph
-from sqllineage.io import to_cytoscape
-from sqllineage.utils.constant import LineageLevel
+from sqllineage.exceptions import BudgetExceeded, SQLLineageException
+from sqllineage.io import dumps, loads, to_cytoscape
+from sqllineage.utils.constant import GraphBackend, LineageEngine, LineageLevel
+from sqllineage.utils.sqlparse import (
+    SQLStream,
+    group_statement,
+    is_lineage_free,
+    parse_statements,
+    split_statements,
+    split_stream,
+    strip_comments,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# errors reading or analyzing a file, e.g. one removed or saved with invalid SQL while being watched
+_FILE_ERRORS = (SQLLineageException, OSError, UnicodeDecodeError)
+
 
 def lazy_method(func):
     def wrapper(*args, **kwargs):
@@ -36,6 +73,11 @@ class LineageRunner(object):
         encoding: str = None,
         verbose: bool = False,
         draw_options: Dict[str, str] = None,
+        cache: Union[bool, LineageCache, None] = False,
+        workers: int = 1,
+        engine: str = LineageEngine.DEFAULT,
+        budget: Optional[StatementBudget] = None,
+        graph_backend: str = GraphBackend.NETWORKX,
     ):
         """
         The entry point of SQLLineage after command line options are parsed.
@@ -43,23 +85,140 @@ class LineageRunner(object):
         :param sql: a string representation of SQL statements.
         :param encoding: the encoding for sql string
         :param verbose: verbose flag indicate whether statement-wise lineage result will be shown
+        :param cache: statement level cache of lineage result. True to use the process-wide default cache, or pass in
+            a :class:`sqllineage.cache.LineageCache` instance, e.g. :class:`sqllineage.cache.DiskLineageCache` to
+            persist result across runs. Disabled by default.
+        :param workers: the number of worker processes to parse and analyze statements in parallel
+        :param engine: "default" for both table and column lineage, or "fast" for table lineage only, analyzed from
+            lexer tokens without grouping them into a parse tree, see
+            :class:`sqllineage.core.fast_analyzer.FastLineageAnalyzer`. Cache is not supported by fast engine.
+        :param budget: per-statement budget of analysis, statements beyond that are degraded to table lineage only,
+            or skipped, and reported by :attr:`degraded_statements`. Degraded result is never cached.
+        :param graph_backend: "networkx", or "compact" to hold combined lineage result in
+            :class:`sqllineage.core.graph.CompactDiGraph`, which takes much less memory for large lineage
         """
+        if engine not in (LineageEngine.DEFAULT, LineageEngine.FAST):
+            raise SQLLineageException("Unsupported lineage engine: %s" % engine)
+        if engine == LineageEngine.FAST and cache:
+            raise SQLLineageException("Cache is not supported by fast engine")
+        if graph_backend not in (GraphBackend.NETWORKX, GraphBackend.COMPACT):
+            raise SQLLineageException("Unsupported graph backend: %s" % graph_backend)
         self._encoding = encoding
         self._sql = sql
         self._verbose = verbose
         self._draw_options = draw_options if draw_options else {}
+        if cache is True:
+            cache = get_default_cache()
+        self._cache = cache if isinstance(cache, LineageCache) else None
+        self._engine = engine
+        self._budget = budget
+        self._graph_backend = graph_backend
         self._evaluated = False
-        self._stmt: List[Statement] = []
+        self._stmt: Optional[List[Statement]] = []
+        self._stmt_holders: List[StatementLineageHolder] = []
+        self._skipped = 0
+        self._files: Optional[List[str]] = None
+        self._file_holders: Dict[str, List[StatementLineageHolder]] = {}
+        self._file_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._file_skipped: Dict[str, int] = {}
+        self._ordered_files: Set[str] = set()
+        self._union: Optional[_LineageUnion] = None
+        self._jobs = 1
+        self._workers = workers
+        self._stream: Optional[SQLStream] = None
+        self._stream_stmt: Optional[List[str]] = None
+
+    @classmethod
+    def from_files(
+        cls,
+        files: List[str],
+        jobs: int = 1,
+        encoding: Optional[str] = None,
+        verbose: bool = False,
+        draw_options: Optional[Dict[str, str]] = None,
+        cache: Union[bool, LineageCache, None] = False,
+        engine: str = LineageEngine.DEFAULT,
+        budget: Optional[StatementBudget] = None,
+        graph_backend: str = GraphBackend.NETWORKX,
+    ) -> "LineageRunner":
+        """
+        Create a runner for multiple SQL files. Each file is parsed and analyzed separately, then lineage result of
+        all the statements are combined in file order.
+
+        :param files: a list of SQL file names
+        :param jobs: the number of worker processes to parse and analyze files in parallel
+        :param encoding: the encoding for SQL files
+        :param verbose: verbose flag indicate whether statement-wise lineage result will be shown
+        :param cache: statement level cache of lineage result, same as in :class:`LineageRunner`. Worker processes
+            share the cache only when it's a :class:`sqllineage.cache.DiskLineageCache`
+        :param engine: lineage engine, same as in :class:`LineageRunner`
+        :param budget: per-statement budget of analysis, same as in :class:`LineageRunner`
+        :param graph_backend: graph backend of combined lineage result, same as in :class:`LineageRunner`
+        """
+        runner = cls(
+            "",
+            encoding,
+            verbose,
+            draw_options,
+            cache,
+            engine=engine,
+            budget=budget,
+            graph_backend=graph_backend,
+        )
+        runner._files = files
+        runner._jobs = jobs
+        return runner
+
+    @classmethod
+    def from_stream(
+        cls,
+        stream: SQLStream,
+        encoding: Optional[str] = None,
+        verbose: bool = False,
+        draw_options: Optional[Dict[str, str]] = None,
+        cache: Union[bool, LineageCache, None] = False,
+        engine: str = LineageEngine.DEFAULT,
+        budget: Optional[StatementBudget] = None,
+        graph_backend: str = GraphBackend.NETWORKX,
+    ) -> "LineageRunner":
+        """
+        Create a runner reading SQL incrementally from a file object or an iterable of strings, e.g. sys.stdin.
+        Each statement is analyzed as soon as it's split, and its parse tree is discarded right after, so that
+        arbitrarily large SQL script can be analyzed in bounded memory. The stream is consumed only once, thus
+        statements are not available afterwards, except for the statement text kept in verbose mode.
+
+        :param stream: a file object, in text or binary mode, or an iterable of str or bytes
+        :param encoding: the encoding for bytes read from stream, default to utf-8
+        :param verbose: verbose flag indicate whether statement-wise lineage result will be shown
+        :param cache: statement level cache of lineage result, same as in :class:`LineageRunner`
+        :param engine: lineage engine, same as in :class:`LineageRunner`
+        :param budget: per-statement budget of analysis, same as in :class:`LineageRunner`
+        :param graph_backend: graph backend of combined lineage result, same as in :class:`LineageRunner`
+        """
+        runner = cls(
+            "",
+            encoding,
+            verbose,
+            draw_options,
+            cache,
+            engine=engine,
+            budget=budget,
+            graph_backend=graph_backend,
+        )
+        runner._stream = stream
+        return runner
 
     @lazy_method
     def __str__(self):
         """
         print out the Lineage Summary.
         """
-        statements = self.statements(strip_comments=True)
         source_tables = "\n    ".join(str(t) for t in self.source_tables)
         target_tables = "\n    ".join(str(t) for t in self.target_tables)
-        combined = f"""Statements(#): {len(statements)}
+        degraded = ""
+        if self.degraded_statements:
+            degraded = f"\nDegraded Statements(#): {len(self.degraded_statements)}"
+        combined = f"""Statements(#): {len(self._stmt_holders)}{degraded}
 Source Tables:
     {source_tables}
 Target Tables:
@@ -72,6 +231,7 @@ Target Tables:
             combined += f"""Intermediate Tables:
     {intermediate_tables}"""
         if self._verbose:
+            statements = self.statements(strip_comments=True)
             result = ""
             for i, holder in enumerate(self._stmt_holders):
                 stmt_short = statements[i].replace("\n", "")
@@ -90,6 +250,7 @@ Target Tables:
         to turn the DAG into cytoscape format.
         """
         if level == LineageLevel.COLUMN:
+            self._check_column_lineage()
             return to_cytoscape(self._sql_holder.column_lineage_graph, compound=True)
         else:
             return to_cytoscape(self._sql_holder.table_lineage_graph)
@@ -99,9 +260,17 @@ Target Tables:
         to draw the lineage directed graph
         """
         draw_options = self._draw_options
+        if self._stream is not None:
+            raise SQLLineageException(
+                "Graph visualization is not supported for streaming input"
+            )
         if draw_options.get("f") is None:
             draw_options.pop("f", None)
-            draw_options["e"] = self._sql
+            draw_options["e"] = (
+                ";\n".join(_read_file(f, self._encoding) for f in self._files)
+                if self._files is not None
+                else self._sql
+            )
         return draw_lineage_graph(**draw_options)
 
     @lazy_method
@@ -111,6 +280,12 @@ Target Tables:
 
         :param kwargs: the key arguments that will be passed to `sqlparse.format`
         """
+        if self._stream is not None:
+            if self._stream_stmt is None:
+                raise SQLLineageException(
+                    "Statements of streaming input are only kept in verbose mode"
+                )
+            return [sqlparse.format(s, **kwargs) for s in self._stream_stmt]
         return [sqlparse.format(s.value, **kwargs) for s in self.statements_parsed]
 
     @lazy_property
@@ -118,6 +293,20 @@ Target Tables:
         """
         a list of :class:`sqlparse.sql.Statement`
         """
+        if self._stream is not None:
+            raise SQLLineageException(
+                "Parse trees of streaming input are discarded after analysis"
+            )
+        if self._stmt is None:
+            # statements are not necessarily parsed in current process during evaluation
+            if self._files is not None:
+                self._stmt = [
+                    s
+                    for f in self._files
+                    for s in self._parse(_read_file(f, self._encoding))
+                ]
+            else:
+                self._stmt = self._parse(self._sql)
         return self._stmt
 
     @lazy_property
@@ -141,11 +330,32 @@ Target Tables:
         """
         return sorted(self._sql_holder.intermediate_tables, key=lambda x: str(x))
 
+    @lazy_property
+    def degraded_statements(self) -> List[DegradedStatement]:
+        """
+        a list of :class:`sqllineage.core.budget.DegradedStatement` for statements beyond budget, with position of the
+        statement, the reason, and whether it's skipped or analyzed at table level
+        """
+        return [
+            DegradedStatement(i, holder.degraded, holder.skipped)
+            for i, holder in enumerate(self._stmt_holders)
+            if holder.degraded is not None
+        ]
+
+    @lazy_property
+    def skipped_statements(self) -> int:
+        """
+        the number of statements skipped before grouping as they never produce lineage, like SHOW, SET or USE.
+        Statements served from cache are not counted.
+        """
+        return self._skipped
+
     @lazy_method
     def get_column_lineage(self, exclude_subquery=True) -> List[Tuple[Column, Column]]:
         """
         a list of column tuple :class:`sqllineage.models.Column`
         """
+        self._check_column_lineage()
         # sort by target column, and then source column
         return sorted(
             self._sql_holder.get_column_lineage(exclude_subquery),
@@ -166,16 +376,433 @@ Target Tables:
         print(str(self))
 
     def _eval(self):
-        self._stmt = [
-            s
-            for s in sqlparse.parse(
-                # first apply sqlparser formatting just to get rid of comments, which cause
-                # inconsistencies in parsing output
-                sqlparse.format(self._sql.strip(), self._encoding, strip_comments=True),
-                self._encoding,
+        self._sql_holder = SQLLineageHolder(new_graph(self._graph_backend))
+        if self._stream is not None:
+            # each statement is added as soon as it's analyzed
+            self._eval_stream()
+        else:
+            if self._files is not None:
+                self._stmt = None
+                # files are stamped before being read, so that a change during analysis is picked up by refresh
+                self._file_stamps = {f: _stat_file(f) for f in self._files}
+                results = self._analyze_files(self._files)
+                self._file_holders = {f: holders for f, (holders, _) in results.items()}
+                self._file_skipped = {f: skipped for f, (_, skipped) in results.items()}
+                self._ordered_files = {
+                    f
+                    for f, holders in self._file_holders.items()
+                    if _is_ordered(holders)
+                }
+                self._stmt_holders = [
+                    holder for f in self._files for holder in self._file_holders[f]
+                ]
+                self._skipped = sum(self._file_skipped[f] for f in self._files)
+            else:
+                self._eval_statements()
+            for holder in self._stmt_holders:
+                self._sql_holder.add_statement(holder)
+        self._evaluated = True
+
+    def _eval_statements(self) -> None:
+        if self._cache is not None:
+            holders = self._cache.get_script(self._sql)
+            if holders is not None:
+                self._stmt = None
+                self._stmt_holders = holders
+                return
+        if self._workers > 1:
+            self._stmt = None
+            self._stmt_holders = self._analyze_statements_in_parallel()
+        elif self._cache is not None:
+            self._stmt = None
+            stmts = [
+                stmt
+                for stmt in split_statements(self._sql.strip(), self._encoding)
+                if stmt.token_first(skip_cm=True)
+            ]
+            self._stmt_holders = [
+                self._analyze_with_cache(stmt, self._cache) for stmt in stmts
+            ]
+            self._cache.put_script(
+                self._sql, [normalize_statement(stmt) for stmt in stmts]
             )
-            if s.token_first(skip_cm=True)
+        elif self._engine == LineageEngine.FAST or self._budget is not None:
+            # statements are analyzed right after split by lexer, grouped only when needed
+            self._stmt = None
+            stmts = [
+                stmt
+                for stmt in split_statements(self._sql.strip(), self._encoding)
+                if stmt.token_first(skip_cm=True)
+            ]
+            self._skipped = sum(1 for stmt in stmts if is_lineage_free(stmt))
+            self._stmt_holders = [
+                _analyze(stmt, self._engine, self._budget) for stmt in stmts
+            ]
+        else:
+            self._stmt = self._parse(self._sql)
+            self._skipped = sum(1 for stmt in self._stmt if is_lineage_free(stmt))
+            self._stmt_holders = [
+                LineageAnalyzer().analyze(stmt) for stmt in self._stmt
+            ]
+
+    def _analyze_statements_in_parallel(self) -> List[StatementLineageHolder]:
+        """
+        statements are split by lexer only in current process, then parsed and analyzed in worker processes. Holders
+        are returned in original statement order.
+        """
+        stmts = [
+            stmt
+            for stmt in split_statements(self._sql.strip(), self._encoding)
+            if stmt.token_first(skip_cm=True)
         ]
-        self._stmt_holders = [LineageAnalyzer().analyze(stmt) for stmt in self._stmt]
-        self._sql_holder = SQLLineageHolder.of(*self._stmt_holders)
-        self._evaluated = True
+        holders: List[Optional[StatementLineageHolder]] = [None] * len(stmts)
+        if self._cache is not None:
+            keys = [normalize_statement(stmt) for stmt in stmts]
+            holders = [self._cache.get(key) for key in keys]
+        missed = [i for i, holder in enumerate(holders) if holder is None]
+        # statements that never produce lineage are not worth sending to worker processes
+        pending = [i for i in missed if not is_lineage_free(stmts[i])]
+        self._skipped = len(missed) - len(pending)
+        sqls = [str(stmts[i]) for i in pending]
+        if len(sqls) > 1:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                results = [
+                    _load_statement_holder(data)
+                    for data in executor.map(
+                        _analyze_statement,
+                        sqls,
+                        repeat(self._engine),
+                        repeat(self._budget),
+                        chunksize=max(1, len(sqls) // (self._workers * 4)),
+                    )
+                ]
+        else:
+            results = [
+                _load_statement_holder(
+                    _analyze_statement(sql, self._engine, self._budget)
+                )
+                for sql in sqls
+            ]
+        for i, holder in zip(pending, results):
+            holders[i] = holder
+        for i in missed:
+            holder = holders[i] or StatementLineageHolder()
+            holders[i] = holder
+            if self._cache is not None and holder.degraded is None:
+                self._cache.put(keys[i], holder)
+        if self._cache is not None:
+            self._cache.put_script(self._sql, keys)
+        return [holder for holder in holders if holder is not None]
+
+    def _eval_stream(self) -> None:
+        self._stmt = None
+        self._stream_stmt = [] if self._verbose else None
+        stream = self._stream if self._stream is not None else []
+        for stmt in split_stream(stream, self._encoding):
+            if not stmt.token_first(skip_cm=True):
+                continue
+            if self._cache is None:
+                holder = _analyze(stmt, self._engine, self._budget)
+                self._skipped += is_lineage_free(stmt)
+            else:
+                holder = self._analyze_with_cache(stmt, self._cache)
+            self._stmt_holders.append(holder)
+            self._sql_holder.add_statement(holder)
+            if self._stream_stmt is not None:
+                self._stream_stmt.append(str(strip_comments(stmt)))
+
+    def refresh(self, files: Optional[List[str]] = None) -> List[str]:
+        """
+        Check the files of a runner created with :meth:`from_files` for changes, by modification time and size, and
+        re-analyze only the files added or changed. Their contribution to the combined lineage result is patched in
+        place, so that the cost is proportional to the size of the change rather than all the files.
+
+        Combined result depends on statement order when there's DROP or RENAME. If any file contains such statement,
+        the combined result is assembled again from statement level result kept in memory, still without
+        re-analyzing unchanged files.
+
+        A file failing to analyze, e.g. saved with half-edited SQL, is logged and keeps its previous result, or none
+        if it's newly added, until it changes again.
+
+        :param files: the new list of SQL files, to pick up files added or removed, e.g. when watching a directory.
+            Default to the current list of files.
+        :return: the files added, changed or removed, empty list if nothing changed. Files failing to analyze are not
+            included.
+        """
+        if self._files is None:
+            raise SQLLineageException(
+                "Only runner created by from_files can be refreshed"
+            )
+        if not self._evaluated:
+            self._eval()  # type: ignore
+        stamps = {f: _stat_file(f) for f in (self._files if files is None else files)}
+        # files removed in between are skipped
+        files = [f for f in (self._files if files is None else files) if stamps[f]]
+        changed = [
+            f for f in stamps if stamps[f] and stamps[f] != self._file_stamps.get(f)
+        ]
+        removed = [f for f in self._file_holders if not stamps.get(f)]
+        if not changed and not removed and files == self._files:
+            return []
+        analyzed = self._analyze_files(changed, skip_errors=True)
+        for f in changed:
+            if f not in analyzed:
+                self._file_stamps[f] = stamps[f]
+                self._file_holders.setdefault(f, [])
+                self._file_skipped.setdefault(f, 0)
+        changed = [f for f in changed if f in analyzed]
+        for f in removed + [f for f in changed if f in self._file_holders]:
+            holders = self._file_holders.pop(f)
+            self._file_stamps.pop(f)
+            self._file_skipped.pop(f)
+            self._ordered_files.discard(f)
+            if self._union is not None:
+                self._union.remove(SQLLineageHolder.of(*holders)._graph)
+        for f, (holders, skipped) in analyzed.items():
+            self._file_holders[f] = holders
+            self._file_skipped[f] = skipped
+            self._file_stamps[f] = stamps[f]
+            if _is_ordered(holders):
+                self._ordered_files.add(f)
+            if self._union is not None:
+                self._union.add(SQLLineageHolder.of(*holders)._graph)
+        self._files = files
+        self._stmt = None
+        self._stmt_holders = [holder for f in files for holder in self._file_holders[f]]
+        self._skipped = sum(self._file_skipped[f] for f in files)
+        if self._ordered_files:
+            self._union = None
+            self._sql_holder = SQLLineageHolder(new_graph(self._graph_backend))
+            for holder in self._stmt_holders:
+                self._sql_holder.add_statement(holder)
+        else:
+            if self._union is None:
+                # built on first refresh, or when the last file with DROP or RENAME is gone
+                self._union = _LineageUnion()
+                for holders in self._file_holders.values():
+                    self._union.add(SQLLineageHolder.of(*holders)._graph)
+            self._sql_holder = SQLLineageHolder(self._union.graph)
+        return removed + changed
+
+    def _analyze_files(
+        self, files: List[str], skip_errors: bool = False
+    ) -> Dict[str, Tuple[List[StatementLineageHolder], int]]:
+        """
+        statement level lineage result of each file, in the same order, and the number of statements skipped. With
+        skip_errors, a file failing to analyze is logged and left out, instead of raising the error.
+        """
+        results: Dict[str, Tuple[List[StatementLineageHolder], int]] = {}
+        if self._jobs > 1 and len(files) > 1:
+            # in-memory cache is not shared by worker processes, while disk cache is opened in each of them
+            cache = self._cache if isinstance(self._cache, DiskLineageCache) else None
+            with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+                for f, result in zip(
+                    files,
+                    executor.map(
+                        _analyze_file_in_worker,
+                        files,
+                        repeat(self._encoding),
+                        repeat(cache),
+                        repeat(self._engine),
+                        repeat(self._budget),
+                        repeat(skip_errors),
+                        chunksize=max(1, len(files) // (self._jobs * 4)),
+                    ),
+                ):
+                    if isinstance(result, str):
+                        logger.error("Failed to analyze %s: %s", f, result)
+                    else:
+                        holders, skipped = result
+                        results[f] = (
+                            [_load_statement_holder(d) for d in holders],
+                            skipped,
+                        )
+        else:
+            for f in files:
+                try:
+                    results[f] = _analyze_file(
+                        f, self._encoding, self._cache, self._engine, self._budget
+                    )
+                except _FILE_ERRORS:
+                    if not skip_errors:
+                        raise
+                    logger.exception("Failed to analyze %s", f)
+        return results
+
+    def _check_column_lineage(self) -> None:
+        if self._engine == LineageEngine.FAST:
+            raise SQLLineageException("Column lineage is not supported by fast engine")
+
+    def _parse(self, sql: str) -> List[Statement]:
+        # comments are stripped before grouping, as they cause inconsistencies in parsing output
+        return list(parse_statements(sql.strip(), self._encoding))
+
+    def _analyze_with_cache(
+        self, stmt: Statement, cache: LineageCache
+    ) -> StatementLineageHolder:
+        """
+        stmt here is split by lexer without grouping. Only when cache missed, it will be fully parsed and analyzed.
+        """
+        sql = normalize_statement(stmt)
+        holder = cache.get(sql)
+        if holder is None:
+            holder = _analyze(stmt, self._engine, self._budget)
+            self._skipped += is_lineage_free(stmt)
+            if holder.degraded is None:
+                cache.put(sql, holder)
+        return holder
+
+
+class _LineageUnion:
+    def __init__(self) -> None:
+        """
+        Union of lineage graphs with nodes, edges and node tags reference counted, so that a graph added before can be
+        removed again. This holds only when the graphs can be combined in any order, i.e. without DROP or RENAME.
+        """
+        self.graph = DiGraph()
+        self._nodes: CounterType[Any] = Counter()
+        self._edges: CounterType[Tuple[Any, Any]] = Counter()
+        self._tags: CounterType[Tuple[Any, str]] = Counter()
+
+    def add(self, graph: DiGraph) -> None:
+        for node, attr in graph.nodes(data=True):
+            self._nodes[node] += 1
+            self.graph.add_node(node)
+            for tag, value in attr.items():
+                if value is True:
+                    self._tags[node, tag] += 1
+                    self.graph.nodes[node][tag] = True
+        for src, tgt, attr in graph.edges(data=True):
+            self._edges[src, tgt] += 1
+            self.graph.add_edge(src, tgt, **attr)
+
+    def remove(self, graph: DiGraph) -> None:
+        for src, tgt in graph.edges:
+            self._edges[src, tgt] -= 1
+            if self._edges[src, tgt] == 0:
+                del self._edges[src, tgt]
+                self.graph.remove_edge(src, tgt)
+        for node, attr in graph.nodes(data=True):
+            for tag, value in attr.items():
+                if value is True:
+                    self._tags[node, tag] -= 1
+                    if self._tags[node, tag] == 0:
+                        del self._tags[node, tag]
+                        del self.graph.nodes[node][tag]
+            self._nodes[node] -= 1
+            if self._nodes[node] == 0:
+                del self._nodes[node]
+                self.graph.remove_node(node)
+
+
+def _stat_file(path: str) -> Optional[Tuple[int, int]]:
+    """
+    modification time in nanoseconds and size of a file, None if it doesn't exist any more.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_ordered(holders: List[StatementLineageHolder]) -> bool:
+    """
+    whether combining the statements with others depends on the order they're added.
+    """
+    return any(holder.drop or holder.rename for holder in holders)
+
+
+def _read_file(path: str, encoding: Optional[str] = None) -> str:
+    with open(path, encoding=encoding) as f:
+        return f.read()
+
+
+def _load_statement_holder(data: bytes) -> StatementLineageHolder:
+    return cast(StatementLineageHolder, loads(data))
+
+
+def _analyze(
+    stmt: Statement, engine: str, budget: Optional[StatementBudget] = None
+) -> StatementLineageHolder:
+    """
+    analyze one statement split by lexer with the lineage engine. Statement beyond budget is degraded to table
+    lineage from the state machine of fast engine, or skipped if the state machine can't handle it.
+    """
+    if budget is None:
+        reason, deadline = None, None
+    else:
+        deadline = budget.deadline()
+        reason = budget.check(stmt)
+    if reason is None:
+        try:
+            if engine == LineageEngine.FAST:
+                return FastLineageAnalyzer().analyze(stmt, deadline)
+            else:
+                return LineageAnalyzer().analyze(group_statement(stmt), deadline)
+        except BudgetExceeded:
+            timeout = cast(StatementBudget, budget).timeout
+            reason = f"analysis exceeding timeout {timeout}s"
+    holder = FastLineageAnalyzer.scan(strip_comments(stmt))
+    if holder is None:
+        holder = StatementLineageHolder()
+        holder.skipped = True
+    holder.degraded = reason
+    logger.warning("Statement degraded for %s: %.50s", reason, str(stmt).strip())
+    return holder
+
+
+def _analyze_statement(
+    sql: str,
+    engine: str = LineageEngine.DEFAULT,
+    budget: Optional[StatementBudget] = None,
+) -> bytes:
+    """
+    parse and analyze one statement split by lexer, this is executed in worker process for parallel analysis. The
+    result is sent back in compact wire format.
+    """
+    (stmt,) = split_statements(sql)
+    return dumps(_analyze(stmt, engine, budget))
+
+
+def _analyze_file(
+    path: str,
+    encoding: Optional[str] = None,
+    cache: Optional[LineageCache] = None,
+    engine: str = LineageEngine.DEFAULT,
+    budget: Optional[StatementBudget] = None,
+) -> Tuple[List[StatementLineageHolder], int]:
+    """
+    parse and analyze one SQL file, this is executed in worker process for multi-file analysis. The number of
+    statements skipped is returned along with the statement level result.
+    """
+    runner = LineageRunner(
+        _read_file(path, encoding),
+        encoding,
+        cache=cache,
+        engine=engine,
+        budget=budget,
+    )
+    runner._eval_statements()
+    return runner._stmt_holders, runner._skipped
+
+
+def _analyze_file_in_worker(
+    path: str,
+    encoding: Optional[str] = None,
+    cache: Optional[LineageCache] = None,
+    engine: str = LineageEngine.DEFAULT,
+    budget: Optional[StatementBudget] = None,
+    skip_errors: bool = False,
+) -> Union[Tuple[List[bytes], int], str]:
+    """
+    the same as _analyze_file, executed in worker process with result sent back in compact wire format. With
+    skip_errors, the error message is sent back instead when the file fails to analyze.
+    """
+    try:
+        holders, skipped = _analyze_file(path, encoding, cache, engine, budget)
+    except _FILE_ERRORS as e:
+        if not skip_errors:
+            raise
+        return str(e)
+    return [dumps(holder) for holder in holders], skipped
@@ -22,3 +22,13 @@ class EdgeType(Enum):
 class LineageLevel:
     TABLE = "table"
     COLUMN = "column"
+
+
+class LineageEngine:
+    DEFAULT = "default"
+    FAST = "fast"
+
+
+class GraphBackend:
+    NETWORKX = "networkx"
+    COMPACT = "compact"
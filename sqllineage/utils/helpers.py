@@ -1,5 +1,8 @@
+import glob
 import logging
+import os
 from argparse import Namespace
+from typing import List
 
 logger = logging.getLogger(__name__)
 
@@ -26,3 +29,45 @@ def extract_sql_from_args(args: Namespace) -> str:
     elif getattr(args, "e", None):
         sql = args.e
     return sql
+
+
+def expand_file_paths(patterns: List[str], strict: bool = True) -> List[str]:
+    """
+    expand file names, glob patterns and directories into a list of file names, in the order they're specified.
+    Glob patterns and directories are expanded in alphabetical order, and only .sql files are collected from
+    directory recursively.
+
+    When strict, exit if a file doesn't exist or a pattern matches nothing. Otherwise, e.g. when watching the files
+    for changes, it's only a warning.
+    """
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matched = sorted(
+                p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p)
+            )
+            if not matched:
+                _missing(strict, "No file matches pattern: %s", pattern)
+            paths.extend(matched)
+        elif os.path.isdir(pattern):
+            matched = sorted(
+                os.path.join(root, filename)
+                for root, _, filenames in os.walk(pattern)
+                for filename in filenames
+                if filename.lower().endswith(".sql")
+            )
+            if not matched:
+                _missing(strict, "No .sql file found in directory: %s", pattern)
+            paths.extend(matched)
+        elif os.path.isfile(pattern):
+            paths.append(pattern)
+        else:
+            _missing(strict, "No such file: %s", pattern)
+    return paths
+
+
+def _missing(strict: bool, msg: str, pattern: str) -> None:
+    if strict:
+        logger.error(msg, pattern)
+        exit(1)
+    logger.warning(msg, pattern)
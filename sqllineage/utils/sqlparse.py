@@ -1,6 +1,11 @@
+import codecs
 import itertools
-from typing import Iterator, List, Union
+import re
+from typing import Any, IO, Iterable, Iterator, List, Optional, Union
 
+from sqlparse import lexer
+from sqlparse import tokens as T
+from sqlparse.engine import StatementSplitter, grouping
 from sqlparse.engine.grouping import _group, group_functions
 from sqlparse.sql import (
     Case,
@@ -9,6 +14,8 @@ from sqlparse.sql import (
     Function,
     Identifier,
     Parenthesis,
+    Statement,
+    Token,
     TokenList,
     Where,
 )
@@ -18,11 +25,229 @@ from sqlparse.utils import recurse
 from sqllineage.utils.entities import SubQueryTuple
 
 
+# first keyword of statements that never produce lineage, e.g. session settings, metadata queries and transactions
+LINEAGE_FREE_KEYWORDS = frozenset(
+    {
+        "ADD",
+        "CACHE",
+        "COMMIT",
+        "DELETE",
+        "GRANT",
+        "KILL",
+        "LIST",
+        "REFRESH",
+        "RELEASE",
+        "RESET",
+        "ROLLBACK",
+        "SAVEPOINT",
+        "SET",
+        "SHOW",
+        "TRUNCATE",
+        "UNCACHE",
+        "UNSET",
+        "USE",
+    }
+)
+
+
 def is_token_negligible(token: TokenList) -> bool:
     # utility to skip tokens like whitespace or comment
     return token.is_whitespace or isinstance(token, Comment)
 
 
+def split_statements(sql: str, encoding: Optional[str] = None) -> Iterator[Statement]:
+    """
+    split SQL script into statements using lexer only. Unlike sqlparse.parse, tokens in the returned statements are
+    not grouped, which is much cheaper when we don't need the parse tree.
+    """
+    yield from StatementSplitter().process(lexer.tokenize(sql, encoding))
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SQLStream = Union[IO[str], IO[bytes], Iterable[str], Iterable[bytes]]
+
+
+def split_stream(
+    stream: SQLStream, encoding: Optional[str] = None
+) -> Iterator[Statement]:
+    """
+    split SQL statements incrementally from a file object, or an iterable of string chunks like lines of a file. Only
+    the statement being split is buffered, each statement is yielded once the line where the next one starts is read.
+
+    When the buffered text ends in the middle of a quoted string or a block comment, everything after the opening
+    quote is held back until more text comes in, since semicolon inside might be mistaken as end of statement.
+
+    Only the lines read since the last split are lexed to look for semicolon, outside quoted strings and comments, so
+    that a long statement is not lexed over and over again until it can actually be complete.
+    """
+    chunks: Iterable[Union[str, bytes]] = (
+        _read_chunks(stream) if hasattr(stream, "read") else stream
+    )
+    decoder = None
+    buffer = ""
+    # the buffered text before this offset is complete lines lexed already, with no semicolon outside quotes
+    checked = 0
+    # the statement held back has semicolon already, so it's split again right away once more lines come in
+    pending = False
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding or "utf-8")()
+            chunk = decoder.decode(chunk)
+        buffer += chunk
+        # only complete lines are split, so that no token is cut in the middle, except quoted string or block comment
+        end = max(buffer.rfind("\n"), buffer.rfind("\r")) + 1
+        if end <= checked:
+            continue
+        if not pending:
+            tokens = [
+                Token(ttype, value)
+                for ttype, value in lexer.tokenize(buffer[checked:end], encoding)
+            ]
+            if not any(token.match(T.Punctuation, ";") for token in tokens):
+                # a statement can only be complete after a semicolon, lines after an opening quote are lexed again
+                if not _is_unterminated(tokens):
+                    checked = end
+                continue
+        statements = list(split_statements(buffer[:end]))
+        # the last statement might not be complete yet, nor the ones after an unterminated string or comment
+        complete = next(
+            (i for i, s in enumerate(statements) if _is_unterminated(s.tokens)),
+            len(statements) - 1,
+        )
+        offset = 0
+        for stmt in statements[:complete]:
+            offset += len(stmt.value)
+            yield stmt
+        buffer = buffer[offset:]
+        rest = [token for stmt in statements[complete:] for token in stmt.tokens]
+        pending = any(token.match(T.Punctuation, ";") for token in rest)
+        checked = 0 if pending or _is_unterminated(rest) else end - offset
+    if decoder is not None:
+        buffer += decoder.decode(b"", final=True)
+    yield from split_statements(buffer)
+
+
+def _read_chunks(stream: Any) -> Iterator[Union[str, bytes]]:
+    while True:
+        chunk = stream.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _is_unterminated(tokens: List[Token]) -> bool:
+    # lexer falls back to Error token for unpaired quote, and to "/" followed by "*" for unclosed block comment. Other
+    # characters it doesn't know, like "$", "{" and "}" of templated SQL, are Error token as well, and never paired
+    brackets = 0
+    for i, token in enumerate(tokens):
+        if token.ttype in T.Error:
+            if token.value in ("'", '"', "`"):
+                return True
+        elif token.match(T.Operator, "/"):
+            if i + 1 < len(tokens) and tokens[i + 1].ttype in T.Wildcard:
+                return True
+        elif token.match(T.Punctuation, "["):
+            brackets += 1
+        elif token.match(T.Punctuation, "]"):
+            brackets -= 1
+    return brackets > 0
+
+
+def parse_statements(sql: str, encoding: Optional[str] = None) -> Iterator[Statement]:
+    """
+    A replacement for sqlparse.parse(sqlparse.format(sql, strip_comments=True)). Comments are stripped from the lexer
+    token stream before grouping, so that the SQL script is only lexed and grouped once. Statements with nothing but
+    comments are skipped.
+    """
+    for stmt in split_statements(sql, encoding):
+        if stmt.token_first(skip_cm=True):
+            yield group_statement(stmt)
+
+
+def group_statement(stmt: Statement) -> Statement:
+    """
+    strip comments and group tokens for a statement split by lexer. Statements that never produce lineage are left
+    ungrouped, see :func:`is_lineage_free`.
+    """
+    stmt = strip_comments(stmt)
+    return stmt if is_lineage_free(stmt) else grouping.group(stmt)
+
+
+def is_lineage_free(stmt: Statement) -> bool:
+    """
+    sniff the first keyword to tell whether a statement never produces lineage, like SHOW, SET or USE. This works on
+    statement split by lexer as well as grouped one, so that such statements can be skipped before grouping.
+    """
+    token = stmt.token_first(skip_cm=True)
+    return (
+        token is not None
+        and next(token.flatten()).normalized.upper() in LINEAGE_FREE_KEYWORDS
+    )
+
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def _comment_replacement(value: str) -> Token:
+    # either line breaks or a whitespace, same as sqlparse.filters.StripCommentsFilter
+    m = re.search(r"((\r|\n)+) *$", value)
+    if m is not None:
+        return Token(T.Newline, m.groups()[0])
+    else:
+        return Token(T.Whitespace, " ")
+
+
+def strip_comments(stmt: Statement) -> Statement:
+    """
+    strip comments from statement split by lexer, whose tokens are not grouped yet.
+
+    This works on the token stream the same way as sqlparse.format(sql, strip_comments=True): consecutive comments
+    (and the whitespaces in between) are replaced by the line breaks they end with or a whitespace, unless they come
+    first or right after an opening parenthesis, in which case they're removed. Then trailing whitespaces of each line
+    are removed, and line breaks normalized, like sqlparse.filters.SerializerUnicode does.
+    """
+    tokens = stmt.tokens
+    stripped: List[Token] = []
+    i, n = 0, len(tokens)
+    while i < n:
+        token = tokens[i]
+        if token.ttype not in T.Comment:
+            stripped.append(token)
+            i += 1
+            continue
+        j = i + 1
+        while j < n and (tokens[j].ttype in T.Comment or tokens[j].is_whitespace):
+            j += 1
+        # comments at the end of statement are replaced one by one, otherwise as a whole with whitespaces in between
+        run = [token] if j == n else tokens[i:j]
+        i = i + 1 if j == n else j
+        prev = stripped[-1] if stripped else None
+        if prev is not None and not prev.match(T.Punctuation, "("):
+            stripped.append(_comment_replacement("".join(t.value for t in run)))
+    serialized: List[Token] = []
+    for token in stripped:
+        if token.ttype in T.Newline:
+            _rstrip(serialized)
+            token = Token(T.Newline, "\n" * len(_LINE_BREAK.findall(token.value)))
+        elif token.ttype not in T.String:
+            lines = _LINE_BREAK.split(token.value)
+            if len(lines) > 1:
+                if not lines[0].rstrip():
+                    _rstrip(serialized)
+                value = "\n".join([line.rstrip() for line in lines[:-1]] + [lines[-1]])
+                token = Token(token.ttype, value)
+        serialized.append(token)
+    _rstrip(serialized)
+    return Statement(serialized)
+
+
+def _rstrip(tokens: List[Token]) -> None:
+    while tokens and tokens[-1].is_whitespace and tokens[-1].ttype not in T.Newline:
+        tokens.pop()
+
+
 def remove_parenthesis_between_union(token: Parenthesis) -> Parenthesis:
     """
     remove parenthesis around subqueries between union
@@ -1,23 +1,25 @@
 from sqllineage.core.models import Column, Table
 from sqllineage.runner import LineageRunner
+from sqllineage.utils.constant import LineageEngine
 
 
 def assert_table_lineage_equal(sql, source_tables=None, target_tables=None):
-    lr = LineageRunner(sql)
-    for (_type, actual, expected) in zip(
-        ["Source", "Target"],
-        [lr.source_tables, lr.target_tables],
-        [source_tables, target_tables],
-    ):
-        actual = set(actual)
-        expected = (
-            set()
-            if expected is None
-            else {Table(t) if isinstance(t, str) else t for t in expected}
-        )
-        assert (
-            actual == expected
-        ), f"\n\tExpected {_type} Table: {expected}\n\tActual {_type} Table: {actual}"
+    for engine in (LineageEngine.DEFAULT, LineageEngine.FAST):
+        lr = LineageRunner(sql, engine=engine)
+        for (_type, actual, expected) in zip(
+            ["Source", "Target"],
+            [lr.source_tables, lr.target_tables],
+            [source_tables, target_tables],
+        ):
+            actual = set(actual)
+            expected = (
+                set()
+                if expected is None
+                else {Table(t) if isinstance(t, str) else t for t in expected}
+            )
+            assert (
+                actual == expected
+            ), f"\n\t{engine} engine\n\tExpected {_type} Table: {expected}\n\tActual {_type} Table: {actual}"
 
 
 def assert_column_lineage_equal(sql, column_lineages=None):
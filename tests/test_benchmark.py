@@ -0,0 +1,52 @@
+import json
+
+from sqllineage.benchmark import PHASES, TPCDS_FOLDER, load_corpus, run_benchmark
+from sqllineage.cli import main
+from sqllineage.core.holders import SQLLineageHolder
+from sqllineage.utils import sqlparse as sqlparse_utils
+
+
+def test_load_tpcds_corpus():
+    corpus = load_corpus(TPCDS_FOLDER)
+    assert len(corpus) == 99
+    assert corpus[0][0] == "query01.sql"
+
+
+def test_run_benchmark(tmp_path):
+    (tmp_path / "foo.sql").write_text(
+        "set hive.exec.parallel=true; insert into tab2 select col1 from tab1; "
+        "insert into tab3 select col1 from tab2; show tables"
+    )
+    (tmp_path / "bar.txt").write_text("not a sql file")
+    result = run_benchmark(str(tmp_path), rounds=2, cache=True)
+    assert result["cold"]["files"] == 1
+    assert result["cold"]["statements"] == 4
+    assert result["cold"]["skipped_statements"] == 2
+    assert result["warm"]["rounds"] == 2
+    assert set(result["warm"]["phases"]) == {name for name, _, _ in PHASES} | {"other"}
+    assert result["cold"]["phases"]["LineageAnalyzer.analyze"] > 0
+    assert result["cold"]["phases"]["split_statements"] > 0
+    # instrumented callables are restored after benchmark
+    assert "get_column_lineage" not in vars(SQLLineageHolder)
+    assert not hasattr(sqlparse_utils.split_statements, "__wrapped__")
+
+
+def test_cli_bench(tmp_path, capsys):
+    (tmp_path / "foo.sql").write_text("insert into tab2 select * from tab1")
+    output = tmp_path / "result.json"
+    main(["bench", "-d", str(tmp_path), "-r", "1", "-l", "table", "-o", str(output)])
+    assert "Cold:" in capsys.readouterr().out
+    result = json.loads(output.read_text())
+    assert result["level"] == "table"
+    assert result["cold"]["phases"]["get_column_lineage"] == 0
+
+
+def test_cli_bench_scaling(tmp_path, capsys):
+    output = tmp_path / "result.json"
+    main(["bench", "--scaling", "10", "20", "-o", str(output)])
+    assert "per statement" in capsys.readouterr().out
+    result = json.loads(output.read_text())
+    assert [run["statements"] for run in result["scaling"]] == [10, 20]
+    assert [run["statements"] for run in result["rename_scaling"]] == [10, 20]
+    assert [run["columns"] for run in result["column_scaling"]] == [10, 20]
+    assert [run["edges"] for run in result["degree_scaling"]] == [10, 20]
@@ -0,0 +1,130 @@
+import pickle
+
+from sqllineage.cache import (
+    DiskLineageCache,
+    LineageCache,
+    get_default_cache,
+    normalize_statement,
+)
+from sqllineage.core.holders import StatementLineageHolder
+from sqllineage.runner import LineageRunner
+from sqllineage.utils.sqlparse import split_statements
+
+
+def test_normalize_statement():
+    sql = """-- leading comment
+insert into tab1 /* inline comment */ select * from tab2;  -- trailing comment
+"""
+    (stmt,) = split_statements(sql)
+    assert (
+        normalize_statement(stmt)
+        == "insert into tab1 /* inline comment */ select * from tab2;"
+    )
+
+
+def test_lru_eviction():
+    cache = LineageCache(maxsize=2)
+    holders = [StatementLineageHolder() for _ in range(3)]
+    cache.put("a", holders[0])
+    cache.put("b", holders[1])
+    assert cache.get("a") is holders[0]
+    cache.put("c", holders[2])
+    # b is least recently used
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.info() == (1, 1, 1, 2, 2)
+    cache.maxsize = 1
+    assert "a" not in cache and "c" in cache
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 1, 0)
+
+
+def test_runner_with_cache():
+    sql = """insert into tab2 select col1 from tab1;
+-- same statement with different comment
+insert into tab2 select col1 from tab1;
+insert into tab3 select col1 from tab2"""
+    cache = LineageCache()
+    runner = LineageRunner(sql, verbose=True, cache=cache)
+    expected = LineageRunner(sql, verbose=True)
+    assert str(runner) == str(expected)
+    assert runner.get_column_lineage() == expected.get_column_lineage()
+    assert [str(s) for s in runner.statements_parsed] == [
+        str(s) for s in expected.statements_parsed
+    ]
+    assert (cache.hits, cache.misses) == (1, 2)
+    LineageRunner(sql, cache=cache).target_tables
+    assert (cache.hits, cache.misses) == (4, 2)
+
+
+def test_runner_with_default_cache():
+    cache = get_default_cache()
+    cache.clear()
+    sql = "insert into tab2 select * from tab1"
+    for _ in range(2):
+        assert LineageRunner(sql, cache=True).source_tables
+    assert (cache.hits, cache.misses) == (1, 1)
+    # cache is opt-in
+    LineageRunner(sql).source_tables
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+
+
+def test_disk_cache(tmp_path):
+    sql = "insert into tab2 select col1 from tab1"
+    expected = LineageRunner(sql, verbose=True)
+    cache = DiskLineageCache(str(tmp_path))
+    assert cache.path == str(tmp_path / "lineage.db")
+    assert str(LineageRunner(sql, verbose=True, cache=cache)) == str(expected)
+    # one statement, and one script made up of the statement
+    assert sql in cache and len(cache) == 2
+    assert cache.info() == (0, 1, 0, cache.maxsize, 2)
+    cache.close()
+    # persisted across instances, and processes
+    for cache in (DiskLineageCache(str(tmp_path)), pickle.loads(pickle.dumps(cache))):
+        assert str(cache.get(sql)) == str(expected._stmt_holders[0])
+        assert str(LineageRunner(sql, verbose=True, cache=cache)) == str(expected)
+        assert cache.info() == (2, 0, 0, cache.maxsize, 2)
+        cache.close()
+    cache = DiskLineageCache(str(tmp_path))
+    # result of a different version never hits
+    cache._namespace += "-dev"
+    assert cache.get(sql) is None and cache.get_script(sql) is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskLineageCache(str(tmp_path / "cache.db"), maxsize=None)
+    for i in range(10):
+        cache.put(f"sql{i}", StatementLineageHolder())
+    cache.put_script("sql", [f"sql{i}" for i in range(10)])
+    assert len(cache.get_script("sql")) == 10
+    # least recently used statements are evicted first
+    cache.maxsize = 1000
+    assert "sql0" not in cache and "sql9" in cache
+    cache.close()
+    cache = DiskLineageCache(str(tmp_path / "cache.db"))
+    assert 0 < len(cache) < 11
+    # script is gone along with its statements
+    assert cache.get_script("sql") is None
+
+
+def test_runner_from_files_with_disk_cache(tmp_path):
+    files = []
+    for i in range(4):
+        path = tmp_path / f"{i}.sql"
+        path.write_text(
+            f"insert into tab{i + 1} select col1 from tab{i};\n"
+            "insert into tab9 select col1 from tab8"
+        )
+        files.append(str(path))
+    expected = LineageRunner.from_files(files)
+    for jobs in (2, 1):
+        cache = DiskLineageCache(str(tmp_path / "cache.db"))
+        runner = LineageRunner.from_files(files, jobs=jobs, cache=cache)
+        assert str(runner) == str(expected)
+        assert runner.get_column_lineage() == expected.get_column_lineage()
+        cache.close()
+    # 5 distinct statements and 4 scripts, all of which hit in the second run
+    assert len(cache) == 9 and cache.info().hits == 8
@@ -1,9 +1,11 @@
-import pathlib
+import io
+import os
 from unittest.mock import patch
 
 import pytest
 
 from sqllineage.cli import main
+from sqllineage.runner import LineageRunner
 
 
 @patch("flask.Flask.run")
@@ -24,15 +26,148 @@ def test_cli_dummy(_):
     )
 
 
-def test_file_exception():
-    for args in (["-f", str(pathlib.Path().absolute())], ["-f", "nonexist_file"]):
+def test_file_exception(tmp_path):
+    for args in (
+        ["-f", str(tmp_path)],
+        ["-f", "nonexist_file"],
+        ["-f", str(tmp_path / "*.sql")],
+    ):
         with pytest.raises(SystemExit) as e:
             main(args)
         assert e.value.code == 1
 
 
+def test_multiple_files(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text("insert into tab2 select col1 from tab1;")
+    (tmp_path / "b.sql").write_text("insert into tab3 select col1 from tab2")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.sql").write_text("insert into tab4 select col1 from tab3")
+    (tmp_path / "sub" / "d.txt").write_text("insert into tab5 select col1 from tab4")
+    main(["-f", str(tmp_path), "-j", "2"])
+    out = capsys.readouterr().out
+    assert "Statements(#): 3" in out
+    assert "<default>.tab1" in out and "<default>.tab4" in out
+    assert "<default>.tab5" not in out
+    main(["-f", str(tmp_path / "a.sql"), str(tmp_path / "*.sql"), "-l", "column"])
+    out = capsys.readouterr().out
+    assert "<default>.tab3.col1 <- <default>.tab2.col1 <- <default>.tab1.col1" in out
+
+
+def test_fast_engine(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text("insert into tab2 select col1 from tab1;")
+    (tmp_path / "b.sql").write_text("insert into tab3 select col1 from tab2")
+    main(["-f", str(tmp_path), "--engine", "fast"])
+    fast = capsys.readouterr().out
+    main(["-f", str(tmp_path)])
+    assert fast == capsys.readouterr().out
+    for args in (["-l", "column"], ["--cache-dir", str(tmp_path / "cache")]):
+        with pytest.raises(SystemExit) as e:
+            main(["-f", str(tmp_path), "--engine", "fast"] + args)
+        assert e.value.code == 1
+
+
+def test_timeout(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text("insert into tab2 select col1 from tab1;")
+    main(["-f", str(tmp_path / "a.sql"), "--timeout", "60"])
+    assert "<default>.tab1" in capsys.readouterr().out
+
+
+def test_max_tokens_and_depth(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text(
+        "insert into tab2 select col1 from (select col1 from tab1 where col2 in (1, 2, 3)) t"
+    )
+    main(["-f", str(tmp_path / "a.sql"), "-l", "column"])
+    assert (
+        "<default>.tab2.col1 <- t.col1 <- <default>.tab1.col1"
+        in capsys.readouterr().out
+    )
+    # degraded to table lineage only
+    for args in (["--max-tokens", "10"], ["--max-depth", "1"]):
+        main(["-f", str(tmp_path / "a.sql")] + args)
+        out = capsys.readouterr().out
+        assert "<default>.tab1" in out and "Degraded Statements(#): 1" in out
+        main(["-f", str(tmp_path / "a.sql"), "-l", "column"] + args)
+        assert capsys.readouterr().out == ""
+
+
+def test_cache_dir(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text("insert into tab2 select col1 from tab1;")
+    (tmp_path / "b.sql").write_text("insert into tab3 select col1 from tab2")
+    cache_dir = tmp_path / "cache"
+    outputs = []
+    for _ in range(2):
+        main(["-f", str(tmp_path / "*.sql"), "--cache-dir", str(cache_dir)])
+        outputs.append(capsys.readouterr().out)
+    assert (cache_dir / "lineage.db").exists()
+    assert outputs[0] == outputs[1] and "<default>.tab3" in outputs[0]
+
+
+def test_watch(tmp_path, capsys):
+    (tmp_path / "a.sql").write_text("insert into tab2 select col1 from tab1;")
+
+    def edit(_):
+        if not (tmp_path / "b.sql").exists():
+            (tmp_path / "b.sql").write_text("insert into tab3 select col1 from tab2")
+        else:
+            raise KeyboardInterrupt
+
+    with patch("time.sleep", side_effect=edit):
+        main(["-f", str(tmp_path), "--watch", "-l", "column"])
+    out = capsys.readouterr().out
+    assert out.startswith("<default>.tab2.col1 <- <default>.tab1.col1\n")
+    assert f"Changed files: {tmp_path / 'b.sql'}" in out
+    assert "<default>.tab3.col1 <- <default>.tab2.col1 <- <default>.tab1.col1" in out
+    for args in (["-e", "select * from dual"], ["-f", "-"], ["-f", __file__, "-g"]):
+        with pytest.raises(SystemExit) as e:
+            main(args + ["--watch"])
+        assert e.value.code == 1
+
+
+def test_watch_keep_going(tmp_path, capsys):
+    a, b = tmp_path / "a.sql", tmp_path / "b.sql"
+
+    def write(path, sql):
+        path.write_text(sql)
+        # make sure modification time changes even on file system with coarse timestamp
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    for patterns in ([str(a), str(b)], [str(tmp_path)], [str(tmp_path / "*.sql")]):
+        write(a, "insert into tab2 select col1 from tab1")
+        write(b, "insert into tab3 select col1 from tab2")
+        edits = [
+            # half-edited file with invalid SQL
+            lambda: write(b, "insert into select * from where"),
+            # file removed, until no .sql file is left
+            lambda: os.remove(b),
+            lambda: os.remove(a),
+            lambda: write(b, "insert into tab4 select col1 from tab3"),
+        ]
+
+        def edit(_):
+            if not edits:
+                raise KeyboardInterrupt
+            edits.pop(0)()
+
+        with patch("time.sleep", side_effect=edit):
+            main(["-f", *patterns, "--watch"])
+        out = capsys.readouterr().out
+        assert out.count("Changed files: ") == 3
+        assert out.endswith(str(LineageRunner.from_files([str(b)])) + "\n")
+
+
 @patch("builtins.open", side_effect=PermissionError())
 def test_file_permission_error(_):
     with pytest.raises(SystemExit) as e:
         main(["-f", __file__])
     assert e.value.code == 1
+
+
+def test_stdin(capsys):
+    sql = "insert into tab2 select col1 from tab1;\ninsert into tab3 select col1 from tab2"
+    with patch("sys.stdin", io.StringIO(sql)):
+        main(["-f", "-", "-l", "column"])
+    out = capsys.readouterr().out
+    assert "<default>.tab3.col1 <- <default>.tab2.col1 <- <default>.tab1.col1" in out
+    with patch("sys.stdin", io.StringIO(sql)), patch("flask.Flask.run"):
+        main(["-f", "-", "-g"])
@@ -317,6 +317,30 @@ FROM tab4"""
     )
 
 
+def test_select_column_using_case_when_with_nested_subquery():
+    sql = """INSERT OVERWRITE TABLE tab1
+SELECT CASE WHEN col2 = 1 THEN (SELECT max(sq.col1) FROM (SELECT col1 FROM tab3) sq) ELSE 0 END AS col1,
+       CASE WHEN (SELECT count(col3) FROM tab5) > 0 THEN 1 ELSE 0 END AS col3
+FROM tab4"""
+    assert_column_lineage_equal(
+        sql,
+        [
+            (
+                ColumnQualifierTuple("col2", "tab4"),
+                ColumnQualifierTuple("col1", "tab1"),
+            ),
+            (
+                ColumnQualifierTuple("col1", "tab3"),
+                ColumnQualifierTuple("col1", "tab1"),
+            ),
+            (
+                ColumnQualifierTuple("col3", "tab5"),
+                ColumnQualifierTuple("col3", "tab1"),
+            ),
+        ],
+    )
+
+
 def test_select_column_with_table_qualifier():
     sql = """INSERT OVERWRITE TABLE tab1
 SELECT tab2.col1
@@ -1,5 +1,321 @@
-from sqllineage.core.holders import StatementLineageHolder
+import itertools
+import random
+import time
+
+import networkx as nx
+import pytest
+from sqlparse.sql import Parenthesis
+
+from sqllineage.benchmark import TPCDS_FOLDER, load_corpus
+from sqllineage.core import LineageAnalyzer
+from sqllineage.core.holders import SQLLineageHolder, StatementLineageHolder
+from sqllineage.core.models import Column, SubQuery, Table
+from sqllineage.exceptions import BudgetExceeded, SQLLineageException
+from sqllineage.io import dumps, loads
+from sqllineage.utils.constant import NodeTag
+from sqllineage.utils.sqlparse import parse_statements
+
+
+def _get_column_lineage_pairwise(holder, exclude_subquery=True):
+    # the straightforward implementation searching simple paths for each pair of source and target column
+    column_graph = holder.graph.subgraph(
+        [n for n in holder.graph.nodes if isinstance(n, Column)]
+    ).copy()
+    source_columns = {column for column, deg in column_graph.in_degree if deg == 0}
+    target_columns = {column for column, deg in column_graph.out_degree if deg == 0}
+    if exclude_subquery:
+        target_columns = {c for c in target_columns if isinstance(c.parent, Table)}
+    return {
+        tuple(path)
+        for source, target in itertools.product(source_columns, target_columns)
+        for path in nx.all_simple_paths(column_graph, source, target)
+    }
+
+
+def _column(name, parent):
+    column = Column(name)
+    column.parent = parent
+    return column
 
 
 def test_dummy():
     assert str(StatementLineageHolder()) == repr(StatementLineageHolder())
+
+
+def test_disabled_handlers():
+    swap_stmt, join_stmt = parse_statements(
+        "select swap_partitions_between_tables('tab1', 'a', 'b', 'tab2');"
+        "insert into tab3 select * from tab4 left  outer\n join tab5 on tab4.id = tab5.id"
+    )
+    holder = LineageAnalyzer().analyze(swap_stmt)
+    assert holder.read == {Table("tab1")} and holder.write == {Table("tab2")}
+    holder = LineageAnalyzer().analyze(join_stmt)
+    assert holder.read == {Table("tab4"), Table("tab5")}
+    assert holder.write == {Table("tab3")}
+    holder = LineageAnalyzer(["SwapPartitionHandler"]).analyze(swap_stmt)
+    assert holder.read == set() and holder.write == set()
+    holder = LineageAnalyzer(["TargetHandler"]).analyze(join_stmt)
+    assert holder.read == {Table("tab4"), Table("tab5")} and holder.write == set()
+    with pytest.raises(SQLLineageException):
+        LineageAnalyzer(["UnknownHandler"])
+
+
+def test_analyze_subquery():
+    sql = """insert into tab1
+select case when col1 = 1 then (select avg(col2) from tab2 t where t.id = s.id) else 0 end as col3
+from tab3 s"""
+    (stmt,) = parse_statements(sql)
+    case = next(t for t in stmt.flatten() if t.normalized == "CASE").parent
+    paren = next(t for t in case.get_sublists() if isinstance(t, Parenthesis))
+    holder = LineageAnalyzer().analyze_subquery(paren)
+    assert holder.read == {Table("tab2")} and holder.write == set()
+    assert "<default>.tab2.col2" in {str(node) for node in holder.graph}
+    # the deadline of the statement applies to the scalar subquery as well
+    deadline = time.monotonic() - 1
+    with pytest.raises(BudgetExceeded):
+        LineageAnalyzer().analyze_subquery(paren, deadline)
+    with pytest.raises(BudgetExceeded):
+        Column.of(case, deadline)
+    assert (
+        Column.of(case).source_columns
+        == Column.of(case, time.monotonic() + 60).source_columns
+    )
+
+
+def test_holder_tagged_nodes():
+    sql = """with cte1 as (select col1 from tab1)
+insert into tab2 select t.col1 from cte1 join tab2 t join (select col1 from tab3) sq on cte1.col1 = t.col1"""
+    holder = LineageAnalyzer().analyze(next(parse_statements(sql)))
+    for prop in ("read", "write", "cte"):
+        # same as tagged nodes in graph, down to the object kept as graph node, i.e. with the same alias
+        expected = {
+            (node, node.alias)
+            for node, attr in holder.graph.nodes(data=True)
+            if attr.get(getattr(NodeTag, prop.upper())) is True
+            and (prop == "cte" or isinstance(node, Table))
+        }
+        actual = getattr(holder, prop)
+        assert {(node, node.alias) for node in actual} == expected
+        # the result is a new set every time
+        actual.clear()
+        assert getattr(holder, prop) != set()
+    assert {(t, t.alias) for t in holder.read} == {
+        (Table("tab1"), "tab1"),
+        (Table("tab2"), "tab2"),
+        (Table("tab3"), "tab3"),
+    }
+    assert loads(dumps(holder)).cte == holder.cte
+
+
+def test_holder_alias_mapping():
+    holder = StatementLineageHolder()
+    tab1, tab2 = Table("tab1", alias="a"), Table("tab2", alias="a")
+    for table in (tab1, Table("tab1", alias="b"), tab2, Table("tab3")):
+        holder.add_read(table)
+    assert holder.get_alias_mapping([Table("tab1")]) == {"a": tab1, "b": tab1}
+    assert holder.get_alias_mapping([tab2, tab2]) == {"a": tab2}
+    assert holder.get_alias_mapping([Table("tab4")]) == {}
+    for loaded in (loads(dumps(holder)), StatementLineageHolder() | holder):
+        mapping = loaded.get_alias_mapping([Table("tab1"), Table("tab3")])
+        assert mapping == {"a": tab1, "b": tab1, "tab3": Table("tab3")}
+        assert mapping["b"].alias == "a"
+
+
+def test_sql_holder_add_statement():
+    sqls = [
+        "insert into tab2 select col1 from tab1",
+        "insert overwrite table tab2 select col1 from tab2",
+        "select col1 from tab3",
+        "insert into tab4 values (1)",
+        "insert into tab5 select t.col1 from tab2 t join tab3 s on t.id = s.id",
+        "drop table tab0",
+        "alter table tab5 rename to tab6",
+    ]
+    holders = [
+        LineageAnalyzer().analyze(stmt) for stmt in parse_statements(";".join(sqls))
+    ]
+    sql_holder = SQLLineageHolder()
+    for holder in holders:
+        sql_holder.add_statement(holder)
+        # reading the result in between doesn't affect the final result
+        assert sql_holder.graph is not None
+    assert sql_holder.source_tables == {Table("tab1"), Table("tab2"), Table("tab3")}
+    assert sql_holder.target_tables == {Table("tab2"), Table("tab4"), Table("tab6")}
+    assert sql_holder.intermediate_tables == set()
+    for result in (sql_holder, SQLLineageHolder.of(*holders)):
+        assert {
+            tuple(str(col) for col in path) for path in result.get_column_lineage()
+        } == {
+            (
+                "<default>.tab1.col1",
+                "<default>.tab2.col1",
+                "<default>.tab5.col1",
+            )
+        }
+
+
+def test_sql_holder_cached_views():
+    sqls = [
+        "insert into tab2 select col1 from tab1",
+        "insert into tab3 select col1 from tab2",
+        "alter table tab3 rename to tab4",
+    ]
+    holders = [
+        LineageAnalyzer().analyze(stmt) for stmt in parse_statements(";".join(sqls))
+    ]
+    sql_holder = SQLLineageHolder.of(holders[0])
+    graph, table_graph = sql_holder.graph, sql_holder.table_lineage_graph
+    column_graph = sql_holder.column_lineage_graph
+    source_tables = sql_holder.source_tables
+    # views are computed once, and reused until more statements are added
+    assert sql_holder.graph is graph
+    assert sql_holder.table_lineage_graph is table_graph
+    assert sql_holder.column_lineage_graph is column_graph
+    assert sql_holder.source_tables is source_tables
+    assert sql_holder.target_tables == {Table("tab2")}
+    assert sql_holder.intermediate_tables == set()
+    sql_holder.add_statement(holders[1])
+    assert sql_holder.graph is not graph
+    assert sql_holder.table_lineage_graph is not table_graph
+    assert sql_holder.column_lineage_graph is not column_graph
+    assert sql_holder.source_tables == {Table("tab1")}
+    assert sql_holder.target_tables == {Table("tab3")}
+    assert sql_holder.intermediate_tables == {Table("tab2")}
+    sql_holder.add_statement(holders[2])
+    assert sql_holder.target_tables == {Table("tab4")}
+    assert Table("tab3") not in sql_holder.table_lineage_graph
+    # assigning a graph drops the views, the same as starting from it
+    sql_holder.graph = graph.copy()
+    assert sql_holder.target_tables == {Table("tab2")}
+    assert Table("tab3") not in sql_holder.graph
+    sql_holder.add_statement(holders[1])
+    assert sql_holder.intermediate_tables == {Table("tab2")}
+
+
+def test_sql_holder_rename():
+    def combine_by_copy(holders):
+        # relabel nodes by copying the whole graph for each rename
+        g = nx.DiGraph()
+        for holder in holders:
+            g.update(holder.graph)
+            for table in holder.drop:
+                if g.has_node(table) and g.degree[table] == 0:
+                    g.remove_node(table)
+            for table_old, table_new in holder.rename:
+                g = nx.relabel_nodes(g, {table_old: table_new})
+                g.remove_edge(table_new, table_new)
+                if g.degree[table_new] == 0:
+                    g.remove_node(table_new)
+            if not holder.drop and not holder.rename:
+                g = SQLLineageHolder(g)
+                g.add_statement(holder)
+                g = g._graph
+        return g
+
+    rnd = random.Random(0)
+    templates = [
+        "insert into tab{0} select col1 from tab{1}",
+        "alter table tab{0} rename to tab{1}",
+        "drop table tab{0}",
+        "select col1 from tab{0}",
+        "insert into tab{0} values (1)",
+        "insert overwrite table tab{0} select col1 from tab{0}",
+    ]
+    for _ in range(50):
+        sql = ";".join(
+            rnd.choice(templates).format(*rnd.sample(range(5), 2)) for _ in range(20)
+        )
+        holders = [LineageAnalyzer().analyze(stmt) for stmt in parse_statements(sql)]
+        expected = combine_by_copy(holders)
+        sql_holder = SQLLineageHolder()
+        for holder in holders:
+            sql_holder.add_statement(holder)
+            if rnd.random() < 0.2:
+                # reading the result in between doesn't affect the final result
+                assert sql_holder.graph is not None
+        actual = sql_holder._restore_node_order()
+        assert list(actual.nodes(data=True)) == list(expected.nodes(data=True))
+        assert set(actual.edges) == set(expected.edges)
+
+
+def test_sql_holder_ambiguous_column():
+    sqls = [
+        "insert into tab1 select col1, id from src1",
+        "insert into tab2 select col2, id from src2",
+        "insert into tab3 select col1, col2, col3 from tab1 join tab2 on tab1.id = tab2.id",
+    ]
+    holders = [
+        LineageAnalyzer().analyze(stmt) for stmt in parse_statements(";".join(sqls))
+    ]
+    sql_holder = SQLLineageHolder.of(*holders)
+    lineage = {
+        tuple(str(col) for col in path) for path in sql_holder.get_column_lineage()
+    }
+    assert {
+        ("<default>.src1.col1", "<default>.tab1.col1", "<default>.tab3.col1"),
+        ("<default>.src2.col2", "<default>.tab2.col2", "<default>.tab3.col2"),
+        # col3 is in neither of the tables, so it's left unresolved
+        ("col3", "<default>.tab3.col3"),
+    } <= lineage
+    assert "col1" not in {str(node) for node in sql_holder.graph}
+    # the same result when starting from the combined graph, e.g. one loaded back from wire format
+    assert (
+        SQLLineageHolder(sql_holder._graph.copy()).get_column_lineage()
+        == sql_holder.get_column_lineage()
+    )
+
+
+def test_deeply_nested_subquery():
+    depth = 30
+    sql = "select col1 from tab1"
+    for i in range(depth):
+        sql = f"select col1 from ({sql}) sq{i}"
+    holder = LineageAnalyzer().analyze(
+        list(parse_statements("insert into tab2 " + sql))[0]
+    )
+    assert holder.read == {Table("tab1")}
+    assert holder.write == {Table("tab2")}
+    (path,) = holder.get_column_lineage()
+    assert [str(col) for col in path] == (
+        ["<default>.tab1.col1"]
+        + [f"sq{i}.col1" for i in range(depth)]
+        + ["<default>.tab2.col1"]
+    )
+
+
+def test_column_lineage_tpcds():
+    for _, sql in load_corpus(TPCDS_FOLDER):
+        holder = SQLLineageHolder.of(
+            *[LineageAnalyzer().analyze(stmt) for stmt in parse_statements(sql)]
+        )
+        for exclude_subquery in (True, False):
+            assert holder.get_column_lineage(
+                exclude_subquery
+            ) == _get_column_lineage_pairwise(holder, exclude_subquery)
+
+
+def test_column_lineage_wide_graph():
+    rnd = random.Random(0)
+    layers, width = 5, 10
+    parents = [Table(f"tab{i}") for i in range(layers)]
+    # the middle layer is subquery, and some columns there lead to nowhere
+    parents[layers // 2] = SubQuery(Parenthesis(), "sq")
+    columns = [[_column(f"col{j}", p) for j in range(width)] for p in parents]
+    holder = StatementLineageHolder()
+    for upstream, downstream in zip(columns, columns[1:]):
+        for src_col in upstream:
+            for tgt_col in rnd.sample(downstream, 3):
+                holder.add_column_lineage(src_col, tgt_col)
+    for src_col in columns[layers // 2][:5]:
+        holder.add_column_lineage(columns[0][0], src_col)
+    # a column lineage cycle
+    holder.add_column_lineage(columns[-1][0], columns[-2][0])
+    holder.add_column_lineage(columns[-1][1], columns[-1][1])
+    for exclude_subquery in (True, False):
+        expected = _get_column_lineage_pairwise(holder, exclude_subquery)
+        assert holder.get_column_lineage(exclude_subquery) == expected
+        holder.graph.remove_edge(columns[-1][0], columns[-2][0])
+        expected = _get_column_lineage_pairwise(holder, exclude_subquery)
+        assert len(expected) > 500
+        assert holder.get_column_lineage(exclude_subquery) == expected
+        holder.add_column_lineage(columns[-1][0], columns[-2][0])
@@ -0,0 +1,50 @@
+import pytest
+
+from sqllineage.benchmark import TPCDS_FOLDER, load_corpus
+from sqllineage.core import LineageAnalyzer
+from sqllineage.core.fast_analyzer import FastLineageAnalyzer
+from sqllineage.utils.sqlparse import group_statement, split_statements
+
+
+def _table_lineage(holder):
+    return [
+        sorted(str(t) for t in tables)
+        for tables in (holder.read, holder.write, holder.cte, holder.drop)
+    ] + [sorted(str(t) for t in holder.rename)]
+
+
+def _assert_same_as_default(sql):
+    for stmt in split_statements(sql.strip()):
+        if stmt.token_first(skip_cm=True):
+            expected = LineageAnalyzer().analyze(group_statement(stmt))
+            actual = FastLineageAnalyzer().analyze(stmt)
+            assert _table_lineage(actual) == _table_lineage(expected), str(stmt)
+
+
+def test_fast_analyzer_tpcds():
+    for _, sql in load_corpus(TPCDS_FOLDER):
+        _assert_same_as_default(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "insert into tab1 select * from tab2 where col1 in (select col1 from tab3)",
+        "insert into tab1 select * from tab2 where exists (select 1 from tab3) and col2 > 0",
+        "insert into tab1 select (select max(col1) from tab3) max_col1 from tab2",
+        "insert into tab1 select * from tab2 where (col1 = 1 or exists (select 1 from tab3))",
+        "insert into tab1 select col1 from tab2 group by col1 having count(*) > (select count(*) from tab3)",
+        "insert into tab1 select * from tab2 where col1 > (select avg(col1) from tab3) * 2",
+        "insert into tab1 select col1 from tab2 intersect select col1 from tab3 where col2 = 1",
+        "insert into tab1 select case when col1 in (select col1 from tab3) then 1 end from tab2",
+        "with cte1 as (select col1 from tab2) insert into tab1 select * from cte1 join tab3 on cte1.id = tab3.id",
+        "create table tab1 like tab2",
+        "create table tab1 as select * from (select col1 from tab2 union all select col1 from tab3) t",
+        "insert overwrite directory 'hdfs://a/b' select * from parquet.`hdfs://c/d`",
+        "update tab1 set col1 = 1 from tab2 where tab1.id = tab2.id",
+        "drop table tab1",
+        "set hive.exec.parallel = true",
+    ],
+)
+def test_fast_analyzer_same_as_default(sql):
+    _assert_same_as_default(sql)
@@ -0,0 +1,177 @@
+import random
+from array import array
+
+import networkx as nx
+import pytest
+
+from sqllineage.core.graph import CompactDiGraph, _INDEX_MIN_DEGREE, _find, new_graph
+from sqllineage.core.holders import SQLLineageHolder
+from sqllineage.core.models import Table
+from sqllineage.exceptions import SQLLineageException
+from sqllineage.runner import LineageRunner
+from sqllineage.utils.constant import EdgeType, GraphBackend, LineageLevel, NodeTag
+
+
+def _assert_graph_equal(actual, expected):
+    assert list(actual.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(actual.edges(data="type")) == list(expected.edges(data="type"))
+
+
+def _cytoscape_elements(runner, level):
+    return sorted(
+        str(
+            {
+                k: v
+                for k, v in e["data"].items()
+                if k != "id" or "source" not in e["data"]
+            }
+        )
+        for e in runner.to_cytoscape(level)
+    )
+
+
+def test_compact_graph():
+    graph, expected = CompactDiGraph(), nx.DiGraph()
+    for g in (graph, expected):
+        g.add_node("tab1", **{NodeTag.READ: True})
+        g.add_nodes_from(["tab2", "tab3"], **{NodeTag.WRITE: True})
+        g.add_edge("tab1", "tab2", type=EdgeType.LINEAGE)
+        g.add_edge("tab2", "tab3", type=EdgeType.LINEAGE)
+        g.add_edge("tab3", "tab3", type=EdgeType.LINEAGE)
+        g.add_edge("tab1", "a", type=EdgeType.HAS_ALIAS)
+        g.add_edge("tab1", "a", type=EdgeType.LINEAGE)
+        g.nodes["tab3"][NodeTag.SELFLOOP] = True
+        del g.nodes["tab2"][NodeTag.WRITE]
+    _assert_graph_equal(graph, expected)
+    _assert_graph_equal(graph.to_networkx(), expected)
+    assert graph.has_edge("tab1", "a") and not graph.has_edge("a", "tab1")
+    assert dict(graph.degree) == dict(expected.degree)
+    assert dict(graph.in_degree) == dict(expected.in_degree)
+    assert dict(graph.out_degree) == dict(expected.out_degree)
+    assert list(graph.successors("tab1")) == list(expected.successors("tab1"))
+    assert list(graph.predecessors("tab3")) == list(expected.predecessors("tab3"))
+    assert graph.selfloop_edges() == list(nx.selfloop_edges(expected))
+    _assert_graph_equal(
+        graph.subgraph(["tab1", "tab2", "a"]),
+        expected.subgraph(["tab1", "tab2", "a"]),
+    )
+    copied = graph.copy()
+    for g in (graph, expected):
+        g.remove_edge("tab1", "tab2")
+        g.remove_node("tab3")
+    _assert_graph_equal(graph, expected)
+    assert copied.number_of_edges() == 4 and graph.number_of_edges() == 1
+    with pytest.raises(nx.NetworkXError):
+        graph.remove_edge("tab1", "tab2")
+    with pytest.raises(nx.NetworkXError):
+        graph.remove_node("tab3")
+    with pytest.raises(SQLLineageException):
+        graph.add_node("tab4", color="red")
+
+
+def test_compact_graph_relabel_nodes():
+    for mapping in ({"tab1": "tab4"}, {"tab1": "tab3"}, {"tab3": "tab1"}):
+        graph, expected = CompactDiGraph(), nx.DiGraph()
+        for g in (graph, expected):
+            g.add_node("tab1", **{NodeTag.TARGET_ONLY: True})
+            g.add_edge("tab1", "tab2", type=EdgeType.LINEAGE)
+            g.add_edge("tab2", "tab3", type=EdgeType.LINEAGE)
+            g.add_edge("tab1", "tab3", type=EdgeType.RENAME)
+        graph.relabel_nodes(mapping)
+        _assert_graph_equal(graph, nx.relabel_nodes(expected, mapping))
+
+
+def test_compact_graph_high_degree():
+    # hub nodes with hundreds of edges have their adjacency indexed by neighbor, which should be kept in sync
+    rnd = random.Random(0)
+    graph, expected = CompactDiGraph(), nx.DiGraph()
+    hubs, nodes = ["tab0", "tab1"], [f"col{i}" for i in range(300)]
+    for relabel in (False, True):
+        if relabel:
+            graph, expected = CompactDiGraph(), nx.DiGraph()
+        for _ in range(3000):
+            op = rnd.random()
+            src, tgt = rnd.choice(hubs + nodes), rnd.choice(hubs + nodes)
+            if rnd.random() < 0.8:
+                src = rnd.choice(hubs)
+            if op < 0.7:
+                # type of edges merged by relabeling depends on edge order, which is different from networkx
+                edge_type = EdgeType.LINEAGE if relabel else rnd.choice(list(EdgeType))
+                for g in (graph, expected):
+                    g.add_edge(src, tgt, type=edge_type)
+            elif op < 0.9:
+                if expected.has_edge(src, tgt):
+                    for g in (graph, expected):
+                        g.remove_edge(src, tgt)
+            elif op < 0.95 or not relabel:
+                if tgt in expected and tgt not in hubs:
+                    for g in (graph, expected):
+                        g.remove_node(tgt)
+            else:
+                graph.relabel_nodes({tgt: src})
+                expected = nx.relabel_nodes(expected, {tgt: src})
+            assert graph.has_edge(src, tgt) == expected.has_edge(src, tgt)
+        assert max(d for _, d in expected.degree) > 100
+        if not relabel:
+            _assert_graph_equal(graph, expected)
+            _assert_graph_equal(graph.copy(), expected)
+        # edges merged by relabeling come in different order from networkx, which makes a copy
+        assert list(graph.nodes(data=True)) == list(expected.nodes(data=True))
+        assert set(graph.edges(data="type")) == set(expected.edges(data="type"))
+        for node in expected:
+            assert set(graph.successors(node)) == set(expected.successors(node))
+            assert set(graph.predecessors(node)) == set(expected.predecessors(node))
+
+
+def test_compact_graph_high_degree_index():
+    class NoScan(array):
+        def __contains__(self, item):
+            raise AssertionError("adjacency array scanned")
+
+        def __iter__(self):
+            raise AssertionError("adjacency array scanned")
+
+    graph, table = CompactDiGraph(), Table("tab1")
+    for n in range(_INDEX_MIN_DEGREE):
+        graph.add_edge(table, f"col{n}", type=EdgeType.HAS_COLUMN)
+        assert graph.has_edge(table, f"col{n}")
+        assert (graph._ids[table] in graph._succ_index) == (n + 1 >= _INDEX_MIN_DEGREE)
+    # once degree reaches the threshold, edges are looked up in neighbor index without scanning adjacency array
+    i = graph._ids[table]
+    graph._succ[i] = NoScan("I", graph._succ[i])
+    for n in range(_INDEX_MIN_DEGREE):
+        j = graph._ids[f"col{n}"]
+        assert _find(graph._succ[i], graph._succ_index, i, j) >= 0
+        assert graph.has_edge(table, f"col{n}")
+    assert not graph.has_edge(table, "col")
+    assert not graph.has_edge(table, f"col{_INDEX_MIN_DEGREE}")
+    graph.add_edge(table, f"col{_INDEX_MIN_DEGREE}", type=EdgeType.HAS_COLUMN)
+    assert graph._succ_index[i][graph._ids[f"col{_INDEX_MIN_DEGREE}"]] == (
+        EdgeType.HAS_COLUMN.value
+    )
+
+
+def test_runner_with_compact_graph():
+    sql = """insert into tab2 select col1 from tab1;
+insert into tab3 select t.col1, col2 from tab2 t join tab4 s on t.id = s.id;
+insert overwrite table tab3 select * from tab3;
+create table tab5 as select col1 from tab3;
+alter table tab5 rename to tab6;
+drop table tab0"""
+    expected = LineageRunner(sql, verbose=True)
+    runner = LineageRunner(sql, verbose=True, graph_backend=GraphBackend.COMPACT)
+    assert str(runner) == str(expected)
+    assert runner.get_column_lineage() == expected.get_column_lineage()
+    # node order of networkx subgraph view depends on hash of nodes, and edge id on the order
+    for level in (LineageLevel.TABLE, LineageLevel.COLUMN):
+        assert _cytoscape_elements(runner, level) == _cytoscape_elements(
+            expected, level
+        )
+    assert isinstance(runner._sql_holder.graph, CompactDiGraph)
+    holder = SQLLineageHolder(new_graph(GraphBackend.COMPACT))
+    holder.add_statement(expected._stmt_holders[0])
+    assert holder.source_tables == {Table("tab1")}
+    with pytest.raises(SQLLineageException):
+        new_graph("igraph")
+    with pytest.raises(SQLLineageException):
+        LineageRunner(sql, graph_backend="igraph")
@@ -0,0 +1,77 @@
+import pickle
+
+import pytest
+
+from sqllineage.benchmark import TPCDS_FOLDER, load_corpus
+from sqllineage.core import LineageAnalyzer
+from sqllineage.core.holders import SQLLineageHolder, StatementLineageHolder
+from sqllineage.core.models import Column, Table
+from sqllineage.exceptions import SQLLineageException
+from sqllineage.io import dumps, loads
+from sqllineage.utils.sqlparse import parse_statements
+
+
+def _assert_graph_equal(actual, expected):
+    assert list(actual.nodes) == list(expected.nodes)
+    assert dict(actual.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert list(actual.edges(data="type")) == list(expected.edges(data="type"))
+    for node, expected_node in zip(actual.nodes, expected.nodes):
+        assert type(node) is type(expected_node)
+        assert str(node) == str(expected_node)
+        if isinstance(node, Table):
+            assert node.alias == expected_node.alias
+        elif isinstance(node, Column):
+            assert node.parent_candidates == expected_node.parent_candidates
+
+
+def test_dumps_loads():
+    sql = """insert into tab1 select t.col1, col2 from db.tab2 t join (select col2 from tab3) s on t.id = s.id;
+with cte1 as (select col1 from tab4) insert overwrite table tab5 select col1 from cte1;
+insert overwrite directory 'hdfs://a/b' select * from tab1;
+drop table tab0;
+alter table tab5 rename to tab6"""
+    holders = [LineageAnalyzer().analyze(stmt) for stmt in parse_statements(sql)]
+    for holder in holders:
+        data = dumps(holder)
+        assert b"select" not in data.lower()
+        loaded = loads(data)
+        assert isinstance(loaded, StatementLineageHolder)
+        assert str(loaded) == str(holder)
+        _assert_graph_equal(loaded.graph, holder.graph)
+    sql_holder = SQLLineageHolder.of(*holders)
+    loaded = loads(dumps(sql_holder))
+    assert isinstance(loaded, SQLLineageHolder)
+    _assert_graph_equal(loaded.graph, sql_holder.graph)
+    assert loaded.source_tables == sql_holder.source_tables
+    assert loaded.target_tables == sql_holder.target_tables
+    assert loaded.get_column_lineage() == sql_holder.get_column_lineage()
+    # holders loaded back can be combined with those analyzed in current process
+    combined = SQLLineageHolder.of(*[loads(dumps(h)) for h in holders[:2]])
+    combined.add_statement(holders[2])
+    expected = SQLLineageHolder.of(*holders[:3])
+    _assert_graph_equal(combined.graph, expected.graph)
+
+
+def test_dumps_loads_degraded():
+    holder = StatementLineageHolder()
+    holder.add_read(Table("tab1"))
+    holder.degraded = "analysis exceeding timeout 1.0s"
+    loaded = loads(dumps(holder))
+    assert loaded.degraded == holder.degraded and not loaded.skipped
+    holder.skipped = True
+    assert loads(dumps(holder)).skipped
+    assert loads(dumps(StatementLineageHolder())).degraded is None
+
+
+def test_dumps_loads_tpcds():
+    for _, sql in load_corpus(TPCDS_FOLDER):
+        for stmt in parse_statements(sql):
+            holder = LineageAnalyzer().analyze(stmt)
+            data = dumps(holder)
+            assert len(data) < len(pickle.dumps(holder))
+            _assert_graph_equal(loads(data).graph, holder.graph)
+
+
+def test_loads_unsupported_version():
+    with pytest.raises(SQLLineageException):
+        loads(b'{"version":0}')
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from sqlparse.sql import Parenthesis
 
@@ -23,3 +25,47 @@ def test_hash_eq():
     assert len({Schema("a"), Schema("a")}) == 1
     assert Table("a") == Table("a")
     assert len({Table("a"), Table("a")}) == 1
+
+
+def test_column_hash_eq_with_parent_change():
+    col1, col2 = Column("a"), Column("a")
+    assert col1 == col2 and hash(col1) == hash(col2)
+    col1.parent = Table("tab1")
+    assert col1 != col2 and str(col1) == "<default>.tab1.a"
+    col2.parent = Table("tab1")
+    assert col1 == col2 and hash(col1) == hash(col2)
+    col2.parent = Table("tab2")
+    # with multiple parent candidates, column is not qualified
+    assert col1 != col2 and col2 == Column("a")
+
+
+def test_table_intern():
+    tab = Table.intern(Table("a.b", alias="t"))
+    assert Table.intern(Table("a.b", alias="t")) is tab
+    assert Table.intern(Table("A.B", alias="t")) is not tab
+    assert Table.intern(Table("a.b")) is not tab
+    assert Table.intern(Table("a.b")) == tab
+
+
+def test_pickle():
+    tab = Table("a.b", alias="t")
+    col = Column("c")
+    col.parent = tab
+    for obj in (Schema("a"), tab, col):
+        unpickled = pickle.loads(pickle.dumps(obj))
+        assert unpickled == obj and hash(unpickled) == hash(obj)
+    assert pickle.loads(pickle.dumps(tab)).alias == "t"
+
+
+def test_column_parent_candidates():
+    col = Column("a")
+    assert col.parent is None and col.parent_candidates == ()
+    col.parent = Table("tab2")
+    assert col.parent == Table("tab2") and col.parent_candidates == (Table("tab2"),)
+    col.parent = Table("tab1")
+    col.parent = Table("tab2")
+    assert col.parent is None
+    assert col.parent_candidates == (Table("tab1"), Table("tab2"))
+    unpickled = pickle.loads(pickle.dumps(col))
+    assert unpickled.parent is None
+    assert unpickled.parent_candidates == col.parent_candidates
@@ -245,6 +245,23 @@ def test_show_create_table():
     assert_table_lineage_equal("show create table tab1", None, None)
 
 
+def test_set_statement():
+    assert_table_lineage_equal(
+        "set hive.exec.dynamic.partition.mode=nonstrict", None, None
+    )
+    assert_table_lineage_equal(
+        "set hivevar:query=insert into tab2 select * from tab1", None, None
+    )
+
+
+def test_use_statement():
+    assert_table_lineage_equal("use db1", None, None)
+
+
+def test_add_jar():
+    assert_table_lineage_equal("add jar hdfs://a/b.jar", None, None)
+
+
 def test_split_statements():
     sql = "SELECT * FROM tab1; SELECT * FROM tab2;"
     assert len(LineageRunner(sql).statements()) == 2
@@ -1,5 +1,13 @@
+import io
+import os
+
+import pytest
+
+from sqllineage.cache import LineageCache
+from sqllineage.core.budget import StatementBudget
+from sqllineage.exceptions import SQLLineageException
 from sqllineage.runner import LineageRunner
-from sqllineage.utils.constant import LineageLevel
+from sqllineage.utils.constant import LineageEngine, LineageLevel
 
 
 def test_runner_dummy():
@@ -11,3 +19,243 @@ insert overwrite table tab3 select * from tab2""",
     assert str(runner)
     assert runner.to_cytoscape() is not None
     assert runner.to_cytoscape(level=LineageLevel.COLUMN) is not None
+
+
+def test_runner_from_files(tmp_path):
+    sqls = [
+        "insert into tab2 select col1 from tab1;\ndrop table tab0",
+        "insert into tab3 select col1 from tab2",
+        "alter table tab3 rename to tab4",
+    ]
+    files = []
+    for i, sql in enumerate(sqls):
+        path = tmp_path / f"{i}.sql"
+        path.write_text(sql)
+        files.append(str(path))
+    expected = LineageRunner(";\n".join(sqls))
+    for jobs in (1, 2):
+        runner = LineageRunner.from_files(files, jobs=jobs)
+        assert str(runner) == str(expected)
+        assert runner.get_column_lineage() == expected.get_column_lineage()
+        assert len(runner.statements_parsed) == 4
+    assert str(LineageRunner.from_files(files, verbose=True)).startswith(
+        "Statement #1: insert into tab2 select col1 from tab1;"
+    )
+
+
+def test_runner_refresh(tmp_path):
+    def write(name, sql):
+        path = tmp_path / name
+        path.write_text(sql)
+        # make sure modification time changes even on file system with coarse timestamp
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return str(path)
+
+    def assert_refreshed(runner, files):
+        expected = LineageRunner.from_files(files)
+        assert str(runner) == str(expected)
+        assert runner.get_column_lineage() == expected.get_column_lineage()
+        assert runner.get_column_lineage(exclude_subquery=False) == (
+            expected.get_column_lineage(exclude_subquery=False)
+        )
+        assert len(runner.statements_parsed) == len(expected.statements_parsed)
+
+    a = write("a.sql", "insert into tab2 select col1, col2 from tab1")
+    b = write("b.sql", "insert into tab3 select col1 from tab2;\nselect col3 from tab4")
+    runner = LineageRunner.from_files([a, b])
+    assert runner.refresh() == []
+    write(
+        "b.sql", "insert into tab3 select t.col2 from tab2 t join tab5 s on t.id = s.id"
+    )
+    assert runner.refresh() == [b]
+    assert_refreshed(runner, [a, b])
+    c = write("c.sql", "insert into tab6 select col2 from tab3")
+    assert runner.refresh([a, b, c]) == [c]
+    assert_refreshed(runner, [a, b, c])
+    # ambiguous column is resolved against the other files
+    write(
+        "a.sql",
+        "insert into tab2 select col1, col2 from tab1 a join tab7 b on a.id = b.id",
+    )
+    assert runner.refresh() == [a]
+    assert_refreshed(runner, [a, b, c])
+    assert runner.refresh([b, c]) == [a]
+    assert_refreshed(runner, [b, c])
+    # combined result depends on statement order with DROP or RENAME
+    d = write("d.sql", "drop table tab6;\nalter table tab3 rename to tab8")
+    assert runner.refresh([b, c, d]) == [d]
+    assert_refreshed(runner, [b, c, d])
+    write("c.sql", "insert into tab6 select col2 from tab9")
+    assert runner.refresh() == [c]
+    assert_refreshed(runner, [b, c, d])
+    os.remove(d)
+    assert runner.refresh([b, c, d]) == [d]
+    assert_refreshed(runner, [b, c])
+    with pytest.raises(SQLLineageException):
+        LineageRunner("select * from tab1").refresh()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_runner_refresh_invalid_sql(tmp_path, jobs):
+    def write(name, sql):
+        path = tmp_path / name
+        path.write_text(sql)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return str(path)
+
+    a = write("a.sql", "insert into tab2 select col1 from tab1")
+    b = write("b.sql", "insert into tab3 select col1 from tab2")
+    runner = LineageRunner.from_files([a, b], jobs=jobs)
+    expected = str(runner)
+    # half-edited file keeps its previous result, and file added with invalid SQL has none until fixed
+    write("b.sql", "insert into select * from where")
+    c = write("c.sql", "insert into select * from where")
+    assert runner.refresh([a, b, c]) == []
+    assert str(runner) == expected
+    assert runner.refresh([a, b, c]) == []
+    write("b.sql", "insert into tab4 select col1 from tab2")
+    write("c.sql", "insert into tab5 select col1 from tab4")
+    assert runner.refresh([a, b, c]) == [b, c]
+    assert str(runner) == str(LineageRunner.from_files([a, b, c]))
+    with pytest.raises(SQLLineageException):
+        str(
+            LineageRunner.from_files(
+                [write("b.sql", "insert into select * from where")]
+            )
+        )
+
+
+def test_runner_with_workers():
+    sql = """insert into tab2 select col1 from tab1;
+/* comment */ insert into tab3 select t.col1 from (select col1 from tab2) t;
+-- comment only;
+drop table tab0;
+insert into tab4 select col1 from tab3;
+alter table tab4 rename to tab5"""
+    expected = LineageRunner(sql, verbose=True)
+    cache = LineageCache()
+    for _ in range(2):
+        runner = LineageRunner(sql, verbose=True, cache=cache, workers=2)
+        assert str(runner) == str(expected)
+        assert runner.get_column_lineage() == expected.get_column_lineage()
+        assert len(runner.statements_parsed) == 5
+    assert cache.info().hits == 5 and cache.info().misses == 5
+    runner = LineageRunner("insert into tab2 select col1 from tab1", workers=2)
+    assert [str(t) for t in runner.target_tables] == ["<default>.tab2"]
+
+
+def test_runner_skipped_statements(tmp_path):
+    sql = """set hive.exec.parallel=true;
+insert into tab2 select col1 from tab1;
+use db1;
+insert into tab3 select col1 from tab2;
+show tables"""
+    for kwargs in (
+        {},
+        {"workers": 2},
+        {"engine": LineageEngine.FAST},
+        {"budget": StatementBudget(max_tokens=100)},
+    ):
+        assert LineageRunner(sql, **kwargs).skipped_statements == 3
+    assert LineageRunner.from_stream(io.StringIO(sql)).skipped_statements == 3
+    # statements served from cache are not counted
+    cache = LineageCache()
+    assert LineageRunner(sql, cache=cache).skipped_statements == 3
+    assert LineageRunner(sql, cache=cache).skipped_statements == 0
+    assert LineageRunner("use db2;" + sql, cache=cache).skipped_statements == 1
+    paths = [tmp_path / "a.sql", tmp_path / "b.sql"]
+    paths[0].write_text(sql)
+    paths[1].write_text("insert into tab4 select col1 from tab3")
+    files = [str(path) for path in paths]
+    for jobs in (1, 2):
+        runner = LineageRunner.from_files(files, jobs=jobs)
+        assert runner.skipped_statements == 3
+        paths[1].write_text("use db2;\ninsert into tab4 select col1 from tab3")
+        runner.refresh()
+        assert runner.skipped_statements == 4
+        os.remove(paths[0])
+        runner.refresh()
+        assert runner.skipped_statements == 1
+        paths[0].write_text(sql)
+        paths[1].write_text("insert into tab4 select col1 from tab3")
+
+
+def test_runner_fast_engine(tmp_path):
+    sql = """insert into tab2 select col1 from tab1;
+/* comment */ insert into tab3 select t.col1 from (select col1 from tab2) t;
+set hive.exec.parallel = true;
+drop table tab0;
+insert into tab4 select col1 from tab3 where col2 in (select col2 from tab5);
+alter table tab4 rename to tab6"""
+    expected = str(LineageRunner(sql, verbose=True))
+    assert str(LineageRunner(sql, verbose=True, engine=LineageEngine.FAST)) == expected
+    runner = LineageRunner(sql, verbose=True, workers=2, engine=LineageEngine.FAST)
+    assert str(runner) == expected
+    path = tmp_path / "a.sql"
+    path.write_text(sql)
+    runner = LineageRunner.from_files([str(path)], engine=LineageEngine.FAST)
+    assert runner.source_tables == LineageRunner(sql).source_tables
+    runner = LineageRunner.from_stream(io.StringIO(sql), engine=LineageEngine.FAST)
+    assert runner.target_tables == LineageRunner(sql).target_tables
+    with pytest.raises(SQLLineageException):
+        runner.get_column_lineage()
+    with pytest.raises(SQLLineageException):
+        runner.to_cytoscape(level=LineageLevel.COLUMN)
+    with pytest.raises(SQLLineageException):
+        LineageRunner(sql, cache=True, engine=LineageEngine.FAST)
+    with pytest.raises(SQLLineageException):
+        LineageRunner(sql, engine="slow")
+
+
+def test_runner_budget():
+    sql = """insert into tab2 select col1 from tab1;
+insert into tab3 select col1 from (select col1 from (select col1 from tab2) t1) t2;
+update tab4 set col1 = 1 from (select col1 from (select col1 from tab3) t1) t2"""
+    cache = LineageCache()
+    for workers in (1, 2):
+        runner = LineageRunner(
+            sql, cache=cache, workers=workers, budget=StatementBudget(max_depth=1)
+        )
+        assert [t.raw_name for t in runner.source_tables] == ["tab1"]
+        assert [t.raw_name for t in runner.target_tables] == ["tab3"]
+        assert [(d.position, d.skipped) for d in runner.degraded_statements] == [
+            (1, False),
+            (2, True),
+        ]
+        assert "Degraded Statements(#): 2" in str(runner)
+        # degraded result is not cached
+        assert len(cache) == 1
+    runner = LineageRunner(sql, budget=StatementBudget(timeout=0, max_tokens=100))
+    assert len(runner.degraded_statements) == 3
+    assert runner.degraded_statements[0].reason.startswith("analysis exceeding")
+    assert runner.get_column_lineage() == []
+    runner = LineageRunner(sql, budget=StatementBudget(max_tokens=10))
+    assert [d.position for d in runner.degraded_statements] == [1, 2]
+    runner = LineageRunner(sql, budget=StatementBudget(timeout=60))
+    assert runner.degraded_statements == []
+    assert str(runner) == str(LineageRunner(sql))
+
+
+def test_runner_from_stream():
+    sql = """insert into tab2 select col1 from tab1 where col2 = 'a;b';
+/* comment; */ insert into tab3 select col1 from (select col1 from tab2) t;
+-- comment;
+alter table tab3 rename to tab4"""
+    expected = LineageRunner(sql)
+    for stream in (
+        io.StringIO(sql),
+        io.BytesIO(sql.encode("utf-8")),
+        [sql[i:][:5] for i in range(0, len(sql), 5)],
+    ):
+        runner = LineageRunner.from_stream(stream)
+        assert str(runner) == str(expected)
+        assert runner.get_column_lineage() == expected.get_column_lineage()
+        with pytest.raises(SQLLineageException):
+            runner.statements()
+    runner = LineageRunner.from_stream(io.StringIO(sql), verbose=True)
+    assert str(runner) == str(LineageRunner(sql, verbose=True))
+    assert len(runner.statements()) == 3
+    with pytest.raises(SQLLineageException):
+        runner.statements_parsed
@@ -0,0 +1,182 @@
+import io
+
+import pytest
+import sqlparse
+
+from sqllineage.benchmark import TPCDS_FOLDER, load_corpus
+from sqllineage.core import LineageAnalyzer
+from sqllineage.core.holders import SQLLineageHolder
+from sqllineage.core.models import SubQuery
+from sqllineage.utils.sqlparse import (
+    is_lineage_free,
+    parse_statements,
+    split_statements,
+    split_stream,
+)
+
+TPCDS_CORPUS = load_corpus(TPCDS_FOLDER)
+
+
+def _format_then_parse(sql):
+    return [
+        s
+        for s in sqlparse.parse(sqlparse.format(sql.strip(), strip_comments=True))
+        if s.token_first(skip_cm=True)
+    ]
+
+
+def _chunked(text, size):
+    return [text[i:][:size] for i in range(0, len(text), size)]
+
+
+def _flatten(stmt):
+    return [(token.ttype, token.value) for token in stmt.flatten()]
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "insert into tab1 select col1   \nfrom tab2  \r\n where col2 = 1 ;  ",
+        "insert into tab1\tselect 1  \t\n from tab2;\n\ninsert into tab3 select 2",
+        "insert into tab1 select 'foo  \n bar' as col1 from tab2",
+        "insert into tab1 select col1 from tab2 order   \nby col1",
+    ],
+)
+def test_parse_statements_without_comment(sql):
+    expected = _format_then_parse(sql)
+    actual = list(parse_statements(sql.strip()))
+    assert [str(s) for s in actual] == [str(s) for s in expected]
+    assert [_flatten(s) for s in actual] == [_flatten(s) for s in expected]
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "-- comment\ninsert into tab1 select * from tab2",
+        "insert into tab1 select col1, -- comment\n  col2 /* comment */ from tab2 -- comment",
+        "insert into tab1 select col1 /* comment */from tab2",
+        "insert into tab1 select col1 -- comment\n -- comment\n from tab2",
+        "insert into tab1 select (/* comment */ col1 -- comment\n) from tab2",
+        "insert into tab1 select * from tab2;\n\n/* comment */\ninsert into tab3 select * from tab1\n-- comment\n",
+        "/* comment only */",
+    ],
+)
+def test_parse_statements_with_comment(sql):
+    expected = _format_then_parse(sql)
+    actual = list(parse_statements(sql.strip()))
+    # whitespaces left by interior comments could differ, but never the real tokens
+    assert [s.value.split() for s in actual] == [s.value.split() for s in expected]
+
+
+@pytest.mark.parametrize(
+    "sql", [sql for _, sql in TPCDS_CORPUS], ids=[name for name, _ in TPCDS_CORPUS]
+)
+def test_parse_statements_tpcds(sql):
+    expected = SQLLineageHolder.of(
+        *[LineageAnalyzer().analyze(s) for s in _format_then_parse(sql)]
+    )
+    actual = SQLLineageHolder.of(
+        *[LineageAnalyzer().analyze(s) for s in parse_statements(sql.strip())]
+    )
+    assert actual.source_tables == expected.source_tables
+    assert actual.target_tables == expected.target_tables
+    assert set(actual.get_column_lineage()) == set(expected.get_column_lineage())
+
+
+def test_split_stream():
+    sql = """insert into tab1 select 'foo;bar' as col1, "a;b" from tab2;
+insert into tab3 /* comment; */ select [c;d], arr[1] from tab4;  -- comment;
+insert into tab5 select `e;f` from tab6;
+"""
+    expected = [s.value for s in split_statements(sql)]
+    for size in range(1, len(sql) + 1):
+        assert [s.value for s in split_stream(_chunked(sql, size))] == expected
+    assert [s.value for s in split_stream(io.StringIO(sql))] == expected
+    # multibyte characters could be cut in between when read as bytes
+    sql = "insert into tab1 select '中;文' from tab2;\ninsert into tab3 select 1"
+    data = sql.encode("utf-8")
+    assert [s.value for s in split_stream(_chunked(data, 3))] == [
+        s.value for s in split_statements(sql)
+    ]
+
+
+def test_split_stream_templated():
+    # "$", "{" and "}" are lexed as Error token, the same as unpaired quote, but they don't hold back the statements
+    lines = [
+        f"insert overwrite table ${{db}}.tab{i} select {{{{ col }}}} from tab{i + 1};\n"
+        for i in range(100)
+    ]
+    read = []
+
+    def read_lines():
+        for line in lines:
+            read.append(line)
+            yield line
+
+    actual = []
+    for stmt in split_stream(read_lines()):
+        actual.append(stmt.value)
+        assert len(read) <= len(actual) + 1
+    assert actual == [s.value for s in split_statements("".join(lines))]
+    # while unpaired quote holds back everything after it until it's closed
+    lines[50] = "insert into tab0 select '${db};\n"
+    lines[60] = "insert into tab0 select 1 ';\n"
+    read, actual = [], []
+    for stmt in split_stream(read_lines()):
+        actual.append(stmt.value)
+        assert len(actual) <= 50 or len(read) > 60
+    assert actual == [s.value for s in split_statements("".join(lines))]
+
+
+def test_split_stream_long_statement(monkeypatch):
+    # semicolon inside string doesn't make the statement lexed again for each line read
+    lines = ["insert into tab1 select 'a;b' as col0\n"]
+    lines += [f"  , 'a;b' as col{i}\n" for i in range(1, 1000)]
+    lines += ["from tab2;\n", "insert into tab3 select 'c;d' from tab4;\n"]
+    lexed = []
+    tokenize = sqlparse.lexer.tokenize
+
+    def counting_tokenize(sql, encoding=None):
+        lexed.append(len(sql))
+        return tokenize(sql, encoding)
+
+    monkeypatch.setattr(sqlparse.lexer, "tokenize", counting_tokenize)
+    actual = [s.value for s in split_stream(iter(lines))]
+    assert sum(lexed) < 4 * len("".join(lines))
+    monkeypatch.undo()
+    assert actual == [s.value for s in split_statements("".join(lines))]
+
+
+def test_parse_tree_released_after_analysis():
+    stmt = list(
+        parse_statements(
+            "insert into tab1 select t.col1 from (select col1 from tab2) t "
+            "join (select col1 from tab3) s on t.col1 = s.col1"
+        )
+    )[0]
+    holder = LineageAnalyzer().analyze(stmt)
+    subqueries = [n for n in holder.graph.nodes if isinstance(n, SubQuery)]
+    assert len(subqueries) == 2
+    assert all(sq.token is None for sq in subqueries)
+
+
+def test_lineage_free_statement_not_grouped():
+    sql = """-- comment
+SET hive.exec.parallel=true;
+use db1;
+show create table tab1;
+describe tab1;
+insert into tab2 select col1 from tab1"""
+    stmts = list(parse_statements(sql))
+    assert [is_lineage_free(s) for s in stmts] == [True, True, True, False, False]
+    assert [str(s) for s in stmts] == [str(s) for s in _format_then_parse(sql)]
+    # lineage free statement is left with lexer tokens only
+    assert all(not s.is_group for s in stmts[0].tokens)
+    assert any(s.is_group for s in stmts[4].tokens)
+    assert [is_lineage_free(s) for s in _format_then_parse(sql)] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]